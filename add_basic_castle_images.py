@@ -9,9 +9,9 @@ Script simple pour ajouter des images de châteaux:
 
 import os
 import re
-import glob
-import urllib.request
-from urllib.error import URLError, HTTPError
+
+from page_discovery import find_castle_files
+from image_downloader import download_many
 
 # Images génériques de châteaux (URLs qui fonctionnent)
 CASTLE_IMAGES = [
@@ -31,22 +31,21 @@ def download_generic_images(img_dir):
     """Télécharger les 3 images génériques"""
     print("Téléchargement des images génériques...")
     
-    for i, url in enumerate(CASTLE_IMAGES):
-        filename = f"castle-generic-{i+1}.jpg"
-        filepath = os.path.join(img_dir, filename)
-        
-        if os.path.exists(filepath):
-            print(f"✓ Image déjà présente: {filename}")
-            continue
-            
-        try:
-            urllib.request.urlretrieve(url, filepath)
-            print(f"✓ Téléchargé: {filename}")
-        except Exception as e:
-            print(f"✗ Erreur téléchargement {filename}: {e}")
-            return False
+    jobs = [
+        (url, os.path.join(img_dir, f"castle-generic-{i+1}.jpg"))
+        for i, url in enumerate(CASTLE_IMAGES)
+    ]
     
-    return True
+    all_ok = True
+    for (url, filepath), (success, message) in zip(jobs, download_many(jobs)):
+        filename = os.path.basename(filepath)
+        if success:
+            print(f"✓ {filename}: {message}")
+        else:
+            print(f"✗ Erreur téléchargement {filename}: {message}")
+            all_ok = False
+    
+    return all_ok
 
 def extract_castle_name(filename):
     """Extraire le nom du château depuis le nom de fichier"""
@@ -107,17 +106,7 @@ def main():
         return
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
+    castle_files = find_castle_files()
     
     # Enlever les doublons et trier
     castle_files = sorted(list(set(castle_files)))
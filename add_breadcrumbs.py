@@ -8,7 +8,11 @@ Structure: Home > Provinces > Province > Château
 
 import os
 import re
-import glob
+
+from province_matcher import build_place_automaton, match_place
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import get_section, insert_at
 
 # Mapping des provinces pour déterminer la province d'un château
 PROVINCES_MAPPING = {
@@ -18,7 +22,7 @@ PROVINCES_MAPPING = {
     },
     'oost-vlaanderen': {
         'name': 'Oost-Vlaanderen',
-        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem']
+        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem', 'meerbeke']
     },
     'west-vlaanderen': {
         'name': 'West-Vlaanderen',
@@ -26,7 +30,7 @@ PROVINCES_MAPPING = {
     },
     'limburg': {
         'name': 'Limburg',
-        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem']
+        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem', 'remersdaal']
     },
     'vlaams-brabant': {
         'name': 'Vlaams-Brabant',
@@ -38,7 +42,7 @@ PROVINCES_MAPPING = {
     },
     'luik': {
         'name': 'Luik',
-        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken', 'remersdaal']
+        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken']
     },
     'luxemburg': {
         'name': 'Luxemburg',
@@ -54,14 +58,15 @@ PROVINCES_MAPPING = {
     }
 }
 
+# Eén keer gecompileerde automaat over alle plaatsnamen
+PLACE_AUTOMATON = build_place_automaton(PROVINCES_MAPPING)
+
 def determine_province(filename):
     """Bepaal de provincie van een kasteel op basis van de bestandsnaam"""
-    filename_lower = filename.lower()
+    match = match_place(PLACE_AUTOMATON, filename)
     
-    for province_id, province_data in PROVINCES_MAPPING.items():
-        for place in province_data['places']:
-            if place in filename_lower:
-                return province_id, province_data['name']
+    if match:
+        return match['province'], match['name']
     
     # Default fallback
     return 'vlaams-brabant', 'Vlaams-Brabant'
@@ -113,30 +118,38 @@ def create_breadcrumb_html(level, castle_name=None, province_id=None, province_n
     
     return ''
 
+def add_breadcrumb_to_castle_content(content, filename):
+    """Voeg breadcrumb toe aan de HTML-inhoud van een kasteelpagina"""
+    # Controleer of breadcrumb al bestaat
+    if 'class="breadcrumb"' in content:
+        return content
+    
+    province_id, province_name = determine_province(filename)
+    castle_name = extract_castle_name(filename)
+    
+    # Genereer breadcrumb HTML
+    breadcrumb_html = create_breadcrumb_html('castle', castle_name, province_id, province_name)
+    
+    # Zoek de positie na de hero section opening
+    header = get_section(content, 'detail-header')
+    if not header:
+        return content
+    
+    container_match = re.compile(r'\s*<div class="container">\s*').match(content, header['inner_start'], header['inner_end'])
+    if not container_match:
+        return content
+    
+    return insert_at(content, container_match.end(), f'{breadcrumb_html}\n        ')
+
 def add_breadcrumb_to_castle_page(file_path):
     """Voeg breadcrumb toe aan een kasteelpagina"""
     try:
         filename = os.path.basename(file_path)
-        province_id, province_name = determine_province(filename)
-        castle_name = extract_castle_name(filename)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Controleer of breadcrumb al bestaat
-        if 'class="breadcrumb"' in content:
-            return False
-        
-        # Genereer breadcrumb HTML
-        breadcrumb_html = create_breadcrumb_html('castle', castle_name, province_id, province_name)
-        
-        # Zoek de positie na de hero section opening
-        pattern = r'(<section class="detail-header">\s*<div class="container">\s*)'
-        
-        def add_breadcrumb(match):
-            return f'{match.group(1)}{breadcrumb_html}\n        '
-        
-        new_content = re.sub(pattern, add_breadcrumb, content)
+        new_content = add_breadcrumb_to_castle_content(content, filename)
         
         if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -219,9 +232,8 @@ def add_breadcrumb_to_province_pages():
     
     return updated_count
 
-def add_breadcrumb_css():
-    """Voeg CSS toe voor breadcrumb styling"""
-    css_code = '''
+# CSS van de breadcrumbs (ook geregistreerd in css_bundle.py)
+BREADCRUMB_CSS = '''
 /* Breadcrumb Styles */
 .breadcrumb {
   margin-bottom: 1.5rem;
@@ -260,7 +272,9 @@ def add_breadcrumb_css():
     margin: 0 0.25rem;
   }
 }'''
-    
+
+def add_breadcrumb_css():
+    """Voeg CSS toe voor breadcrumb styling"""
     css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
     
     try:
@@ -269,7 +283,7 @@ def add_breadcrumb_css():
         
         if '/* Breadcrumb Styles */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(css_code)
+                f.write(BREADCRUMB_CSS)
             return True
         
         return False
@@ -303,19 +317,7 @@ def main():
     
     # Vind alle kasteelbestanden
     print("\nBreadcrumbs toevoegen aan kasteelpaginas...")
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Gevonden kasteelbestanden: {len(castle_files)}")
     
@@ -341,14 +343,11 @@ def main():
     # Ga door met alle bestanden
     print(f"\nDoorgaan met alle {len(castle_files)} bestanden...")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        
-        # Skip de al behandelde testbestanden
-        if file_path in test_files:
-            continue
-            
-        if add_breadcrumb_to_castle_page(file_path):
+    # Skip de al behandelde testbestanden
+    remaining_files = [f for f in castle_files if f not in test_files]
+    
+    for added in map_pages(add_breadcrumb_to_castle_page, remaining_files):
+        if added:
             updated_count += 1
             if updated_count % 50 == 0:
                 print(f"  Voortgang: {updated_count} breadcrumbs toegevoegd...")
@@ -8,102 +8,107 @@ depuis le dossier chateaux_images
 
 import os
 import re
-import glob
 from pathlib import Path
 
-def normalize_name(name):
-    """Normalise un nom pour la comparaison"""
-    # Enlève les extensions, tirets, underscores, espaces
-    name = name.lower()
-    name = re.sub(r'\.(jpg|jpeg|png|gif)$', '', name)
-    name = re.sub(r'[_\-\s]+', '', name)
-    return name
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from image_index import COMMON_WORDS, get_image_index, find_exact, find_best_match
+from image_derivatives import SIZES_DETAIL, SIZES_CARD, render_image_html, render_picture_html
+from html_sections import section_inner_html, replace_section
 
 def find_matching_image(castle_filename, images_dir):
     """Trouve l'image correspondante pour un château"""
-    # Normalise le nom du fichier château
     castle_base = os.path.splitext(castle_filename)[0]
-    castle_normalized = normalize_name(castle_base)
+    index = get_image_index(images_dir)
     
-    # Liste toutes les images disponibles
-    image_files = []
-    for ext in ['*.jpg', '*.jpeg', '*.png', '*.gif']:
-        image_files.extend(glob.glob(os.path.join(images_dir, ext)))
+    # Correspondance exacte
+    exact_match = find_exact(index, castle_base)
+    if exact_match:
+        return exact_match
     
-    # Essaie de trouver une correspondance exacte ou partielle
-    best_match = None
-    best_score = 0
+    # Correspondance partielle - score de Jaccard sur les mots communs
+    return find_best_match(index, castle_base, COMMON_WORDS, threshold=0.3)
+
+def create_media_html(image_name, filename):
+    """Bloc detail-media avec l'image du château (avec srcset si les versions responsives existent)"""
+    alt = filename.replace('.html', '').replace('-', ' ').title()
+    return f'''<div class="detail-media">
+            {render_image_html(image_name, alt, sizes=SIZES_DETAIL)}
+          </div>'''
+
+def add_castle_image_to_content(content, filename, images_dir):
+    """Remplace le placeholder d'image dans le contenu HTML d'une page de château"""
+    # Trouve l'image correspondante
+    matching_image = find_matching_image(filename, images_dir)
     
-    for image_path in image_files:
-        image_name = os.path.basename(image_path)
-        image_normalized = normalize_name(image_name)
-        
-        # Correspondance exacte
-        if castle_normalized == image_normalized:
-            return image_name
-        
-        # Correspondance partielle - compte les mots communs
-        castle_words = set(re.split(r'[_\-\s]+', castle_base.lower()))
-        image_words = set(re.split(r'[_\-\s]+', os.path.splitext(image_name)[0].lower()))
-        
-        # Enlève les mots très communs
-        common_words = {'kasteel', 'chateau', 'van', 'de', 'het', 'le', 'la', 'du', 'des', 'te', 'in', 'op', 'aan'}
-        castle_words -= common_words
-        image_words -= common_words
-        
-        if castle_words and image_words:
-            intersection = castle_words & image_words
-            union = castle_words | image_words
-            score = len(intersection) / len(union) if union else 0
-            
-            if score > best_score and score > 0.3:  # Seuil minimum
-                best_score = score
-                best_match = image_name
+    if not matching_image:
+        return content, "Aucune image correspondante trouvée"
+    
+    # Cherche le placeholder d'image actuel dans le bloc detail-media
+    media_inner = section_inner_html(content, 'detail-media')
+    placeholder_pattern = r'\s*<div class="image-placeholder"[^>]*>.*?</div>\s*'
     
-    return best_match
+    if media_inner is None or not re.fullmatch(placeholder_pattern, media_inner, re.DOTALL):
+        return content, "Placeholder d'image non trouvé"
+    
+    # Remplace le placeholder
+    new_content = replace_section(content, 'detail-media', create_media_html(matching_image, filename))
+    
+    if new_content != content:
+        return new_content, f"Image intégrée: {matching_image}"
+    
+    return content, "Aucun changement nécessaire"
+
+def render_castle_images(content, render):
+    """
+    Régénère les images des blocs detail-media et card-media (une <img> ou un
+    <picture> existant) avec la fonction render
+    """
+    image_pattern = (
+        r'(<div class="(detail-media|card-media)"[^>]*>\s*)'
+        r'(?:<picture>(?:<source[^>]*>)*)?<img src="\./chateaux_images/([^"/]+)" alt="([^"]*)" class="castle-image"[^>]*>(?:</picture>)?'
+    )
+    
+    def make_image(match):
+        sizes = SIZES_DETAIL if match.group(2) == 'detail-media' else SIZES_CARD
+        return match.group(1) + render(match.group(3), match.group(4), sizes=sizes)
+    
+    return re.sub(image_pattern, make_image, content)
+
+def add_responsive_images_to_content(content):
+    """
+    Remplace les images par leur version responsive (<picture>); uniquement pour le
+    site publié (publish_site.py), où les versions existent
+    """
+    return render_castle_images(content, render_picture_html)
+
+def remove_responsive_images_from_content(content):
+    """Remet une <img> simple dans les pages sources (un <picture> y pointerait vers des versions absentes)"""
+    return render_castle_images(content, render_image_html)
 
 def update_castle_page_image(file_path, images_dir):
     """Met à jour une page de château avec son image"""
     try:
         filename = os.path.basename(file_path)
         
-        # Trouve l'image correspondante
-        matching_image = find_matching_image(filename, images_dir)
-        
-        if not matching_image:
-            return False, "Aucune image correspondante trouvée"
-        
         # Lit le contenu du fichier
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Cherche le placeholder d'image actuel
-        placeholder_pattern = r'<div class="detail-media"[^>]*>\s*<div class="image-placeholder"[^>]*>.*?</div>\s*</div>'
-        
-        if not re.search(placeholder_pattern, content, re.DOTALL):
-            return False, "Placeholder d'image non trouvé"
-        
-        # Crée le nouveau HTML avec l'image
-        image_html = f'''<div class="detail-media">
-            <img src="./chateaux_images/{matching_image}" alt="{filename.replace('.html', '').replace('-', ' ').title()}" class="castle-image">
-          </div>'''
-        
-        # Remplace le placeholder
-        new_content = re.sub(placeholder_pattern, image_html, content, flags=re.DOTALL)
+        new_content, message = add_castle_image_to_content(content, filename, images_dir)
         
         if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
-            return True, f"Image intégrée: {matching_image}"
+            return True, message
         
-        return False, "Aucun changement nécessaire"
+        return False, message
         
     except Exception as e:
         return False, f"Erreur: {e}"
 
-def add_image_css():
-    """Ajoute le CSS pour les images de châteaux"""
-    css_code = '''
+# CSS des images de châteaux (aussi enregistré dans css_bundle.py)
+IMAGE_CSS = '''
 /* Castle Images */
 .castle-image {
   width: 100%;
@@ -112,12 +117,21 @@ def add_image_css():
   border-radius: 12px;
 }
 
+.detail-media picture,
+.card-media picture {
+  display: block;
+  width: 100%;
+  height: 100%;
+}
+
 .detail-media {
   border-radius: 12px;
   overflow: hidden;
   box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
 }'''
-    
+
+def add_image_css():
+    """Ajoute le CSS pour les images de châteaux"""
     css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
     
     try:
@@ -126,7 +140,7 @@ def add_image_css():
         
         if '/* Castle Images */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(css_code)
+                f.write(IMAGE_CSS)
             return True
         
         return False
@@ -155,19 +169,7 @@ def main():
     
     # Trouve tous les fichiers de châteaux
     print("\nRecherche des pages de châteaux...")
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     print(f"Trouvé {len(castle_files)} pages de châteaux")
     
     # Test avec quelques fichiers d'abord
@@ -193,13 +195,9 @@ def main():
     if success_count > 0:
         print(f"\nContinuation avec tous les {len(castle_files)} fichiers...")
         
-        for file_path in castle_files:
-            if file_path in test_files:
-                continue
-                
-            filename = os.path.basename(file_path)
-            success, message = update_castle_page_image(file_path, images_dir)
-            
+        remaining_files = [f for f in castle_files if f not in test_files]
+        
+        for success, message in map_pages(update_castle_page_image, remaining_files, images_dir):
             if success:
                 success_count += 1
                 if success_count % 25 == 0:
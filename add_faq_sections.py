@@ -7,7 +7,16 @@ Script pour ajouter une section FAQ unique pour chaque château
 
 import os
 import re
-import glob
+
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import get_section, insert_at
+from fragment_cache import get_fragment
+from script_bundle import BUNDLE_TAG_PATTERN, bundle_script_tag
+
+# Inline FAQ-script en onclick-handlers van oudere pagina's (vervangen door de bundel)
+INLINE_FAQ_SCRIPT_PATTERN = re.compile(r'\n?<script>\s*function toggleFaq\(.*?</script>', re.DOTALL)
+INLINE_FAQ_HANDLER_PATTERN = re.compile(r'onclick="toggleFaq\((\d+)\)"')
 
 # Base de données des FAQ uniques pour chaque château
 FAQ_DATABASE = {
@@ -151,6 +160,12 @@ def get_castle_type(filename):
     else:
         return 'default_renaissance'
 
+def get_faq_key(filename):
+    """Sleutel van de FAQ-vragen: de pagina zelf als ze eigen vragen heeft, anders het kasteeltype"""
+    if filename in FAQ_DATABASE:
+        return filename
+    return get_castle_type(filename)
+
 def get_faq_data(filename):
     """Haal FAQ-gegevens op voor een specifiek kasteel"""
     if filename in FAQ_DATABASE:
@@ -169,17 +184,13 @@ def get_faq_data(filename):
         'faqs': template['faqs']
     }
 
-def create_faq_html(faq_data):
-    """Genereer HTML voor de FAQ-sectie"""
-    html = f'''    <section class="section faq">
-      <div class="container">
-        <h2 class="section-title">{faq_data['title']}</h2>
-        <div class="faq-list">'''
-    
-    for i, faq in enumerate(faq_data['faqs']):
+def create_faq_items_html(faqs):
+    """Genereer de HTML van de vragen in de FAQ-lijst"""
+    html = ''
+    for i, faq in enumerate(faqs):
         html += f'''
           <div class="faq-item">
-            <button class="faq-question" onclick="toggleFaq({i})" aria-expanded="false">
+            <button class="faq-question" aria-controls="faq-{i}" aria-expanded="false">
               <span>{faq['question']}</span>
               <span class="faq-icon">+</span>
             </button>
@@ -187,6 +198,22 @@ def create_faq_html(faq_data):
               <p>{faq['answer']}</p>
             </div>
           </div>'''
+    return html
+
+def create_faq_html(faq_data, faq_key=None):
+    """
+    Genereer HTML voor de FAQ-sectie. Met faq_key (zie get_faq_key) worden de
+    vragen één keer per kasteeltype opgebouwd en daarna uit de fragmentcache gehaald.
+    """
+    if faq_key is None:
+        items_html = create_faq_items_html(faq_data['faqs'])
+    else:
+        items_html = get_fragment('faq', faq_key, lambda: create_faq_items_html(faq_data['faqs']))
+    
+    html = f'''    <section class="section faq">
+      <div class="container">
+        <h2 class="section-title">{faq_data['title']}</h2>
+        <div class="faq-list">{items_html}'''
     
     html += '''
         </div>
@@ -195,27 +222,32 @@ def create_faq_html(faq_data):
     
     return html
 
+def add_faq_content(content, filename):
+    """Voeg FAQ-sectie toe aan de HTML-inhoud van een kasteelpagina"""
+    # Controleer of FAQ al bestaat
+    if 'class="section faq"' in content:
+        return content
+    
+    # Genereer FAQ HTML
+    faq_html = create_faq_html(get_faq_data(filename), get_faq_key(filename))
+    
+    # Voeg FAQ toe tussen </main> en de footer
+    main = get_section(content, 'main')
+    footer = get_section(content, 'footer')
+    if not main or not footer or content[main['end']:footer['start']].strip():
+        return content
+    
+    return insert_at(content, main['end'], f'\n{faq_html}\n')
+
 def add_faq_section(file_path):
     """Voeg FAQ-sectie toe aan een kasteelpagina"""
     try:
         filename = os.path.basename(file_path)
-        faq_data = get_faq_data(filename)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Controleer of FAQ al bestaat
-        if 'class="section faq"' in content:
-            return False
-        
-        # Genereer FAQ HTML
-        faq_html = create_faq_html(faq_data)
-        
-        # Voeg FAQ toe voor de footer
-        pattern = r'(</main>)(\s*<footer)'
-        replacement = f'\\1\n{faq_html}\n\\2'
-        
-        new_content = re.sub(pattern, replacement, content)
+        new_content = add_faq_content(content, filename)
         
         if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -228,11 +260,8 @@ def add_faq_section(file_path):
         print(f"  ✗ Fout bij {filename}: {e}")
         return False
 
-def add_faq_css():
-    """Voeg CSS toe voor FAQ-styling"""
-    css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
-    
-    faq_css = '''
+# CSS van de FAQ-sectie (ook geregistreerd in css_bundle.py)
+FAQ_CSS = '''
 /* FAQ Section Styles */
 .faq {
   background-color: #f8fafc;
@@ -312,13 +341,17 @@ def add_faq_css():
   }
 }'''
 
+def add_faq_css():
+    """Voeg CSS toe voor FAQ-styling"""
+    css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
+    
     try:
         with open(css_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
         if '/* FAQ Section Styles */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(faq_css)
+                f.write(FAQ_CSS)
             return True
         
         return False
@@ -328,31 +361,46 @@ def add_faq_css():
         return False
 
 def add_faq_javascript():
-    """Voeg JavaScript toe voor FAQ-functionaliteit"""
-    js_code = '''
-<script>
-function toggleFaq(index) {
-  const question = document.querySelector(`button[onclick="toggleFaq(${index})"]`);
-  const answer = document.getElementById(`faq-${index}`);
-  const isExpanded = question.getAttribute('aria-expanded') === 'true';
-  
-  // Sluit alle andere FAQ's
-  document.querySelectorAll('.faq-question').forEach(q => {
-    q.setAttribute('aria-expanded', 'false');
-  });
-  document.querySelectorAll('.faq-answer').forEach(a => {
-    a.classList.remove('open');
-  });
-  
-  // Toggle huidige FAQ
-  if (!isExpanded) {
-    question.setAttribute('aria-expanded', 'true');
-    answer.classList.add('open');
-  }
-}
-</script>'''
+    """<script>-tag van de gedeelde, uitgestelde FAQ-bundel (zie script_bundle.py)"""
+    return f'\n{bundle_script_tag()}'
+
+def add_faq_javascript_to_content(content):
+    """
+    Laad de bundel aan het einde van de body. Oude pagina's worden meteen gemigreerd:
+    de inline toggleFaq-functie verdwijnt, de onclick-handlers worden aria-controls,
+    en een tag van een vorige versie van de bundel wordt vervangen.
+    """
+    content = INLINE_FAQ_SCRIPT_PATTERN.sub('', content)
+    content = INLINE_FAQ_HANDLER_PATTERN.sub(r'aria-controls="faq-\1"', content)
+    
+    script_tag = add_faq_javascript()
+    if script_tag in content:
+        return content
+    
+    content = BUNDLE_TAG_PATTERN.sub('', content)
+    return content.replace('</body>', f'{script_tag}\n</body>', 1)
+
+def add_faq_to_page(file_path):
+    """Voeg de FAQ sectie en, indien toegevoegd, de JavaScript toe aan een kasteelpagina"""
+    if add_faq_section(file_path):
+        add_faq_javascript_to_page(file_path)
+        return True
+    
+    return False
+
+def add_faq_javascript_to_page(file_path):
+    """Voeg de FAQ JavaScript toe aan een kasteelpagina"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
     
-    return js_code
+    new_content = add_faq_javascript_to_content(content)
+    
+    if new_content != content:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        return True
+    
+    return False
 
 def main():
     """Hoofdfunctie"""
@@ -366,19 +414,7 @@ def main():
         print("  ○ FAQ CSS al aanwezig")
     
     # Vind alle kasteelbestanden
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Gevonden kasteelbestanden: {len(castle_files)}")
     
@@ -402,15 +438,7 @@ def main():
             updated_count += 1
             
             # Voeg JavaScript toe aan het einde van de body
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if 'function toggleFaq' not in content:
-                js_code = add_faq_javascript()
-                content = content.replace('</body>', f'{js_code}\n</body>')
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if add_faq_javascript_to_page(file_path):
                 print(f"  ✓ JavaScript toegevoegd")
         else:
             print(f"  ○ FAQ al aanwezig of geen wijzigingen")
@@ -422,33 +450,24 @@ def main():
     # Ga door met alle bestanden
     print(f"\nDoorgaan met alle {len(castle_files)} bestanden...")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        
-        # Skip de al behandelde testbestanden
-        if file_path in test_files:
-            continue
-            
-        if add_faq_section(file_path):
+    # Skip de al behandelde testbestanden
+    remaining_files = [f for f in castle_files if f not in test_files]
+    
+    for added in map_pages(add_faq_to_page, remaining_files):
+        if added:
             updated_count += 1
             
-            # Voeg JavaScript toe
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if 'function toggleFaq' not in content:
-                js_code = add_faq_javascript()
-                content = content.replace('</body>', f'{js_code}\n</body>')
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-            
             if updated_count % 50 == 0:
                 print(f"  Voortgang: {updated_count} FAQ secties toegevoegd...")
     
+    # Migratie: inline toggleFaq-scripts vervangen door de gedeelde bundel
+    print(f"\nBundel {bundle_script_tag()} koppelen...")
+    migrated_count = sum(1 for migrated in map_pages(add_faq_javascript_to_page, castle_files) if migrated)
+    
     print(f"\n=== EINDRESULTAAT ===")
     print(f"Totaal bestanden behandeld: {len(castle_files)}")
     print(f"FAQ secties toegevoegd: {updated_count}")
+    print(f"Pagina's gemigreerd naar de bundel: {migrated_count}")
     print(f"Elke pagina heeft nu een unieke FAQ sectie!")
 
 if __name__ == "__main__":
@@ -8,7 +8,12 @@ Liens vers: 'kastelen in België' (homepage) et 'kastelen in (provincie)' (page
 
 import os
 import re
-import glob
+
+from province_matcher import build_place_automaton, match_place
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import section_inner_html, replace_section
+from page_cache import get_page, save_page_cache
 
 # Mapping des provinces pour déterminer la province d'un château
 PROVINCES_MAPPING = {
@@ -18,7 +23,7 @@ PROVINCES_MAPPING = {
     },
     'oost-vlaanderen': {
         'name': 'Oost-Vlaanderen',
-        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem']
+        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem', 'meerbeke']
     },
     'west-vlaanderen': {
         'name': 'West-Vlaanderen',
@@ -26,7 +31,7 @@ PROVINCES_MAPPING = {
     },
     'limburg': {
         'name': 'Limburg',
-        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem']
+        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem', 'remersdaal']
     },
     'vlaams-brabant': {
         'name': 'Vlaams-Brabant',
@@ -38,7 +43,7 @@ PROVINCES_MAPPING = {
     },
     'luik': {
         'name': 'Luik',
-        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken', 'remersdaal']
+        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken']
     },
     'luxemburg': {
         'name': 'Luxemburg',
@@ -54,14 +59,15 @@ PROVINCES_MAPPING = {
     }
 }
 
+# Eén keer gecompileerde automaat over alle plaatsnamen
+PLACE_AUTOMATON = build_place_automaton(PROVINCES_MAPPING)
+
 def determine_province(filename):
     """Bepaal de provincie van een kasteel op basis van de bestandsnaam"""
-    filename_lower = filename.lower()
+    match = match_place(PLACE_AUTOMATON, filename)
     
-    for province_id, province_data in PROVINCES_MAPPING.items():
-        for place in province_data['places']:
-            if place in filename_lower:
-                return province_id, province_data['name']
+    if match:
+        return match['province'], match['name']
     
     # Default fallback
     return 'vlaams-brabant', 'Vlaams-Brabant'
@@ -115,51 +121,67 @@ def add_links_to_intro_text(paragraph_text, province_id, province_name, is_first
     
     return modified_text, changes_made
 
+def add_intro_links_to_content(content, filename):
+    """Voeg links toe aan de introductietekst in de HTML-inhoud van een kasteelpagina"""
+    province_id, province_name = determine_province(filename)
+    
+    # Zoek de intro sectie en daarin de twee paragrafen
+    intro_inner = section_inner_html(content, 'intro')
+    intro_pattern = r'\s*<p>\s*(.*?)\s*</p>\s*<p>\s*(.*?)\s*</p>\s*'
+    intro_match = re.fullmatch(intro_pattern, intro_inner, re.DOTALL) if intro_inner is not None else None
+    
+    if not intro_match:
+        return content, "Geen intro sectie gevonden"
+    
+    # Extraheer de twee paragrafen
+    paragraph1 = intro_match.group(1).strip()
+    paragraph2 = intro_match.group(2).strip()
+    
+    # Voeg links toe aan beide paragrafen
+    new_paragraph1, changes1 = add_links_to_intro_text(paragraph1, province_id, province_name, is_first_paragraph=True)
+    new_paragraph2, changes2 = add_links_to_intro_text(paragraph2, province_id, province_name, is_first_paragraph=False)
+    
+    total_changes = changes1 + changes2
+    
+    if total_changes == 0:
+        return content, "Geen wijzigingen nodig"
+    
+    # Vervang de intro sectie
+    new_intro = f'''<div class="intro">
+      <p>
+        {new_paragraph1}
+      </p>
+      <p>
+        {new_paragraph2}
+      </p>
+    </div>'''
+    
+    new_content = replace_section(content, 'intro', new_intro)
+    
+    return new_content, f"{total_changes} links toegevoegd"
+
 def update_castle_intro_links(file_path):
     """Update de introductietekst van een kasteelpagina met links"""
     try:
         filename = os.path.basename(file_path)
-        province_id, province_name = determine_province(filename)
+        
+        # Beide paragrafen hebben al links volgens de paginacache: niets te doen, niets te lezen
+        intro_paragraphs = get_page(file_path)['intro_html']
+        if len(intro_paragraphs) == 2 and all('<a href=' in paragraph for paragraph in intro_paragraphs):
+            return False, "Geen wijzigingen nodig"
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Zoek de intro sectie
-        intro_pattern = r'<div class="intro">\s*<p>\s*(.*?)\s*</p>\s*<p>\s*(.*?)\s*</p>\s*</div>'
-        intro_match = re.search(intro_pattern, content, re.DOTALL)
+        new_content, message = add_intro_links_to_content(content, filename)
         
-        if not intro_match:
-            return False, "Geen intro sectie gevonden"
-        
-        # Extraheer de twee paragrafen
-        paragraph1 = intro_match.group(1).strip()
-        paragraph2 = intro_match.group(2).strip()
-        
-        # Voeg links toe aan beide paragrafen
-        new_paragraph1, changes1 = add_links_to_intro_text(paragraph1, province_id, province_name, is_first_paragraph=True)
-        new_paragraph2, changes2 = add_links_to_intro_text(paragraph2, province_id, province_name, is_first_paragraph=False)
-        
-        total_changes = changes1 + changes2
-        
-        if total_changes > 0:
-            # Vervang de intro sectie
-            new_intro = f'''<div class="intro">
-      <p>
-        {new_paragraph1}
-      </p>
-      <p>
-        {new_paragraph2}
-      </p>
-    </div>'''
-            
-            new_content = re.sub(intro_pattern, new_intro, content, flags=re.DOTALL)
-            
+        if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
             
-            return True, f"{total_changes} links toegevoegd"
+            return True, message
         
-        return False, "Geen wijzigingen nodig"
+        return False, message
         
     except Exception as e:
         return False, f"Fout: {e}"
@@ -170,19 +192,7 @@ def main():
     
     # Vind alle kasteelbestanden
     print("Zoeken naar kasteelbestanden...")
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     print(f"Gevonden kasteelbestanden: {len(castle_files)}")
     
     # Test eerst met een paar bestanden
@@ -213,15 +223,10 @@ def main():
     # Ga door met alle bestanden
     print(f"\nDoorgaan met alle {len(castle_files)} bestanden...")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        
-        # Skip de al behandelde testbestanden
-        if file_path in test_files:
-            continue
-            
-        success, message = update_castle_intro_links(file_path)
-        
+    # Skip de al behandelde testbestanden
+    remaining_files = [f for f in castle_files if f not in test_files]
+    
+    for success, message in map_pages(update_castle_intro_links, remaining_files):
         if success:
             success_count += 1
             if "links toegevoegd" in message:
@@ -230,6 +235,8 @@ def main():
             if success_count % 50 == 0:
                 print(f"  Voortgang: {success_count} bestanden bijgewerkt...")
     
+    save_page_cache()
+    
     print(f"\n=== EINDRESULTAAT ===")
     print(f"Totaal kasteelpaginas behandeld: {len(castle_files)}")
     print(f"Succesvol bijgewerkt: {success_count}")
@@ -7,7 +7,8 @@ Script pour ajouter le préfixe "Kasteel" aux titres appropriés et ajouter les
 
 import os
 import re
-import glob
+
+from page_discovery import find_castle_files
 
 def should_add_kasteel_prefix(title):
     """Détermine si un titre a besoin du préfixe 'Kasteel'"""
@@ -176,19 +177,7 @@ def main():
     
     # 1. Met à jour les pages individuelles de châteaux
     print("\n1. Mise à jour des pages individuelles...")
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     # Test avec quelques fichiers d'abord
     test_files = castle_files[:10]
@@ -7,9 +7,14 @@ Script pour rechercher et ajouter les heures d'ouverture des châteaux belges
 
 import os
 import re
-import glob
 import time
 
+from page_discovery import find_castle_files
+from html_sections import get_section, replace_section_inner, splice
+
+# Note explicative sous la liste des heures
+NOTE_PATTERN = re.compile(r'<p class="lead" style="margin-top:\.8rem">([^<]+)</p>')
+
 # Base de données des heures d'ouverture connues
 OPENING_HOURS_DATABASE = {
     'kasteel-van-freyr-freyr.html': {
@@ -70,37 +75,44 @@ def get_opening_hours(filename):
     else:
         return OPENING_HOURS_DATABASE['default']
 
+def create_hours_list_html(hours_data):
+    """Construire les lignes <li> de la liste des heures"""
+    hours_html = []
+    for day, hours in hours_data['hours'].items():
+        hours_html.append(f'              <li><span>{day}</span><span>{hours}</span></li>')
+    
+    return '\n'.join(hours_html)
+
+def update_opening_hours_content(content, filename):
+    """Mettre à jour les heures d'ouverture dans le contenu HTML d'une page"""
+    hours_data = get_opening_hours(filename)
+    
+    # Construire le nouveau HTML pour les heures
+    hours_section = create_hours_list_html(hours_data)
+    
+    # Remplacer les heures dans la liste
+    new_content = replace_section_inner(content, 'hours-list', f'\n{hours_section}\n            ')
+    
+    # Mettre à jour la note explicative, cherchée uniquement dans la carte des heures
+    hours_card = get_section(new_content, 'hours-card')
+    if not hours_card:
+        return new_content
+    
+    note_match = NOTE_PATTERN.search(new_content, hours_card['inner_start'], hours_card['inner_end'])
+    if not note_match:
+        return new_content
+    
+    return splice(new_content, note_match.start(1), note_match.end(1), hours_data['note'])
+
 def update_opening_hours(file_path):
     """Mettre à jour les heures d'ouverture dans un fichier HTML"""
     try:
         filename = os.path.basename(file_path)
-        hours_data = get_opening_hours(filename)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Construire le nouveau HTML pour les heures
-        hours_html = []
-        for day, hours in hours_data['hours'].items():
-            hours_html.append(f'              <li><span>{day}</span><span>{hours}</span></li>')
-        
-        hours_section = '\n'.join(hours_html)
-        
-        # Pattern pour trouver la section des heures d'ouverture
-        pattern = r'(<ul class="hours-list">)(.*?)(</ul>)'
-        
-        def replace_hours(match):
-            opening_tag = match.group(1)
-            closing_tag = match.group(3)
-            return f'{opening_tag}\n{hours_section}\n            {closing_tag}'
-        
-        # Remplacer les heures
-        new_content = re.sub(pattern, replace_hours, content, flags=re.DOTALL)
-        
-        # Mettre à jour la note explicative
-        note_pattern = r'(<p class="lead" style="margin-top:\.8rem">)[^<]+(</p>)'
-        note_replacement = f'\\g<1>{hours_data["note"]}\\g<2>'
-        new_content = re.sub(note_pattern, note_replacement, new_content)
+        new_content = update_opening_hours_content(content, filename)
         
         # Vérifier si des changements ont été faits
         if new_content != content:
@@ -168,19 +180,7 @@ def main():
     print("=== AJOUT DES HEURES D'OUVERTURE ===")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Pages de châteaux trouvées: {len(castle_files)}")
     
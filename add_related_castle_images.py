@@ -7,7 +7,13 @@ Script pour ajouter les images des châteaux dans la section 'related castles'
 
 import os
 import re
-import glob
+
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from image_index import get_image_index, find_exact
+from image_derivatives import SIZES_CARD, render_image_html
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chateaux_images')
 
 def create_image_mapping():
     """Crée un mapping entre les noms de fichiers et les noms de châteaux"""
@@ -80,17 +86,60 @@ def normalize_castle_name(name):
     name = re.sub(r'\s+', '_', name)
     return name
 
-def find_image_for_castle(castle_href, image_mapping):
+def create_castle_image_lookup(image_mapping):
+    """Inverse le mapping: page château -> image, en ne gardant que les images présentes"""
+    index = get_image_index(IMAGES_DIR)
+    
+    castle_images = {}
+    for image_file, mapped_castle in image_mapping.items():
+        existing_image = find_exact(index, image_file)
+        if existing_image:
+            castle_images.setdefault(mapped_castle, existing_image)
+    
+    return castle_images
+
+def find_image_for_castle(castle_href, castle_images):
     """Trouve l'image correspondante pour un château donné"""
     # Extrait le nom du fichier HTML
     castle_file = castle_href.replace('.html', '')
     
     # Cherche une correspondance directe
-    for image_file, mapped_castle in image_mapping.items():
-        if mapped_castle == castle_file:
-            return f"./chateaux_images/{image_file}"
+    return castle_images.get(castle_file)
+
+def add_related_images_to_content(content):
+    """Remplace les gradients des related castles par les images disponibles"""
+    castle_images = create_castle_image_lookup(create_image_mapping())
+    
+    # Trouve tous les blocs related castles
+    card_pattern = r'(<a class="card" href="([^"]+)">\s*)<div class="card-media gradient-[123]"></div>'
+    matches = list(re.finditer(card_pattern, content))
+    
+    if not matches:
+        return content, "Aucune section related castles trouvée"
     
-    return None
+    updated_content = content
+    changes_made = 0
+    
+    for match in matches:
+        full_match = match.group(0)
+        card_start = match.group(1)
+        castle_href = match.group(2)
+        
+        # Cherche l'image correspondante
+        image_file = find_image_for_castle(castle_href, castle_images)
+        
+        if image_file:
+            # Remplace le gradient par l'image (avec srcset si les versions responsives existent)
+            new_card_media = f'<div class="card-media">{render_image_html(image_file, "Château", sizes=SIZES_CARD)}</div>'
+            replacement = card_start + new_card_media
+            
+            updated_content = updated_content.replace(full_match, replacement)
+            changes_made += 1
+    
+    if changes_made > 0:
+        return updated_content, f"{changes_made} images ajoutées dans related castles"
+    
+    return content, "Aucune image correspondante trouvée"
 
 def update_related_castles_with_images(file_path):
     """Met à jour la section related castles avec les images disponibles"""
@@ -98,40 +147,14 @@ def update_related_castles_with_images(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        image_mapping = create_image_mapping()
-        
-        # Trouve tous les blocs related castles
-        card_pattern = r'(<a class="card" href="([^"]+)">\s*)<div class="card-media gradient-[123]"></div>'
-        matches = list(re.finditer(card_pattern, content))
-        
-        if not matches:
-            return False, "Aucune section related castles trouvée"
-        
-        updated_content = content
-        changes_made = 0
+        new_content, message = add_related_images_to_content(content)
         
-        for match in matches:
-            full_match = match.group(0)
-            card_start = match.group(1)
-            castle_href = match.group(2)
-            
-            # Cherche l'image correspondante
-            image_path = find_image_for_castle(castle_href, image_mapping)
-            
-            if image_path:
-                # Remplace le gradient par l'image
-                new_card_media = f'<div class="card-media"><img src="{image_path}" alt="Château" class="castle-image"></div>'
-                replacement = card_start + new_card_media
-                
-                updated_content = updated_content.replace(full_match, replacement)
-                changes_made += 1
-        
-        if changes_made > 0:
+        if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            return True, f"{changes_made} images ajoutées dans related castles"
-        else:
-            return False, "Aucune image correspondante trouvée"
+                f.write(new_content)
+            return True, message
+        
+        return False, message
         
     except Exception as e:
         return False, f"Erreur: {e}"
@@ -141,19 +164,7 @@ def main():
     print("=== AJOUT D'IMAGES DANS RELATED CASTLES ===")
     
     # Trouve tous les fichiers de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     image_mapping = create_image_mapping()
     
     print(f"Trouvé {len(castle_files)} pages de châteaux")
@@ -177,11 +188,9 @@ def main():
     if success_count > 0:
         print(f"Continuation avec tous les {len(castle_files)} fichiers...")
         
-        for file_path in castle_files:
-            if file_path in test_files:
-                continue
-                
-            success, message = update_related_castles_with_images(file_path)
+        remaining_files = [f for f in castle_files if f not in test_files]
+        
+        for success, message in map_pages(update_related_castles_with_images, remaining_files):
             if success:
                 success_count += 1
                 if success_count % 25 == 0:
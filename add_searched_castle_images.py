@@ -9,10 +9,9 @@ Script pour rechercher et ajouter des images de châteaux:
 
 import os
 import re
-import glob
-import urllib.request
-from urllib.error import URLError, HTTPError
-import time
+
+from page_discovery import find_castle_files
+from image_downloader import download, download_many
 
 def create_assets_directory():
     """Créer le répertoire assets/img s'il n'existe pas"""
@@ -106,23 +105,10 @@ def search_castle_image_google(castle_name):
 
 def download_image(url, filename, img_dir):
     """Télécharger une image depuis une URL"""
-    try:
-        img_path = os.path.join(img_dir, filename)
-        
-        # Ajouter des headers pour éviter les blocages
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        
-        with urllib.request.urlopen(req) as response:
-            with open(img_path, 'wb') as f:
-                f.write(response.read())
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Erreur téléchargement {filename}: {e}")
-        return False
+    success, message = download(url, os.path.join(img_dir, filename))
+    if not success:
+        print(f"  ✗ Erreur téléchargement {filename}: {message}")
+    return success
 
 def update_html_with_image(file_path, image_filename, castle_name):
     """Mettre à jour le fichier HTML avec l'image"""
@@ -167,23 +153,12 @@ def main():
     img_dir = create_assets_directory()
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Nombre de pages de châteaux trouvées: {len(castle_files)}")
     
     success_count = 0
+    found = []
     
     # Traiter seulement les 10 premiers pour tester
     for file_path in castle_files[:10]:
@@ -191,7 +166,7 @@ def main():
         simple_name = extract_simple_castle_name(filename)
         image_filename = filename.replace('.html', '.jpg')
         
-        print(f"\nTraitement: {filename}")
+        print(f"\nRecherche: {filename}")
         print(f"  Nom simplifié: {simple_name}")
         
         # Chercher d'abord sur Wikipedia
@@ -203,22 +178,26 @@ def main():
         
         if image_url:
             print(f"  Image trouvée: {image_url}")
-            
-            # Télécharger l'image
-            if download_image(image_url, image_filename, img_dir):
-                # Mettre à jour le HTML
-                if update_html_with_image(file_path, image_filename, simple_name):
-                    print(f"  ✓ Succès: {filename}")
-                    success_count += 1
-                else:
-                    print(f"  ✗ Échec mise à jour HTML: {filename}")
-            else:
-                print(f"  ✗ Échec téléchargement: {filename}")
+            found.append((file_path, simple_name, image_filename, image_url))
         else:
             print(f"  ○ Aucune image trouvée pour: {simple_name}")
+    
+    # Télécharger toutes les images en parallèle (rate limit par serveur)
+    jobs = [(image_url, os.path.join(img_dir, image_filename)) for _, _, image_filename, image_url in found]
+    results = download_many(jobs)
+    
+    for (file_path, simple_name, image_filename, image_url), (success, message) in zip(found, results):
+        filename = os.path.basename(file_path)
         
-        # Pause pour éviter de surcharger les serveurs
-        time.sleep(1)
+        if success:
+            # Mettre à jour le HTML
+            if update_html_with_image(file_path, image_filename, simple_name):
+                print(f"  ✓ Succès: {filename}")
+                success_count += 1
+            else:
+                print(f"  ✗ Échec mise à jour HTML: {filename}")
+        else:
+            print(f"  ✗ Échec téléchargement: {filename} ({message})")
     
     print(f"\n=== RÉSUMÉ ===")
     print(f"Pages traitées: 10")
@@ -9,11 +9,9 @@ Script pour ajouter des images de châteaux de manière simple:
 
 import os
 import re
-import glob
-import urllib.request
-import urllib.parse
-from urllib.error import URLError, HTTPError
-import time
+
+from page_discovery import find_castle_files
+from image_downloader import download, download_many
 
 # Images génériques de châteaux depuis Unsplash (libres de droits)
 GENERIC_CASTLE_IMAGES = [
@@ -47,20 +45,10 @@ def extract_castle_name(filename):
 
 def download_image(url, filename, img_dir):
     """Télécharger une image depuis une URL"""
-    try:
-        # Créer le chemin complet
-        img_path = os.path.join(img_dir, filename)
-        
-        # Télécharger l'image
-        urllib.request.urlretrieve(url, img_path)
-        return True
-        
-    except (URLError, HTTPError) as e:
-        print(f"✗ Erreur téléchargement {filename}: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ Erreur inattendue pour {filename}: {e}")
-        return False
+    success, message = download(url, os.path.join(img_dir, filename))
+    if not success:
+        print(f"✗ Erreur téléchargement {filename}: {message}")
+    return success
 
 def get_image_for_castle(castle_name, index):
     """Obtenir une URL d'image pour un château donné"""
@@ -107,50 +95,32 @@ def main():
     print(f"Répertoire d'images: {img_dir}")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = glob.glob("/Users/marc/Desktop/kastelenbelgie/kasteel-*.html")
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/chateau-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/citadel-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/burcht-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/*kasteel*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/hof-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/de-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/het-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/sint-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/koninklijk-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/waterslot-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/vrieselhof-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/rentmeesterij-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/commanderij-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/domein-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/oud-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/bisschoppenhof-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/braemkasteel-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/burchtruine-*.html"))
-    castle_files.extend(glob.glob("/Users/marc/Desktop/kastelenbelgie/gaverkasteel-*.html"))
-    
-    # Enlever les doublons et trier
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Nombre de pages de châteaux trouvées: {len(castle_files)}")
     
     success_count = 0
     
+    # Obtenir l'URL de l'image pour chaque page (rotation des images génériques)
+    jobs = []
     for i, file_path in enumerate(castle_files):
+        filename = os.path.basename(file_path)
+        image_url = get_image_for_castle(extract_castle_name(filename), i)
+        jobs.append((image_url, os.path.join(img_dir, filename.replace('.html', '.jpg'))))
+    
+    # Télécharger toutes les images en parallèle (chaque URL une seule fois)
+    results = download_many(jobs)
+    
+    for file_path, (image_url, image_path), (success, message) in zip(castle_files, jobs, results):
         filename = os.path.basename(file_path)
         castle_name = extract_castle_name(filename)
-        
-        # Nom de fichier pour l'image
-        image_filename = filename.replace('.html', '.jpg')
-        
-        # Obtenir l'URL de l'image (rotation des images génériques)
-        image_url = get_image_for_castle(castle_name, i)
+        image_filename = os.path.basename(image_path)
         
         print(f"Traitement: {filename}")
         print(f"  Château: {castle_name}")
         print(f"  Image: {image_filename}")
         
-        # Télécharger l'image
-        if download_image(image_url, image_filename, img_dir):
+        if success:
             # Mettre à jour le HTML
             if update_html_with_image(file_path, image_filename, castle_name):
                 print(f"✓ Image ajoutée avec succès: {filename}")
@@ -158,10 +128,7 @@ def main():
             else:
                 print(f"✗ Échec mise à jour HTML: {filename}")
         else:
-            print(f"✗ Échec téléchargement: {filename}")
-        
-        # Petite pause pour éviter de surcharger les serveurs
-        time.sleep(0.1)
+            print(f"✗ Échec téléchargement: {filename} ({message})")
     
     print("\n=== RÉSUMÉ ===")
     print(f"Pages traitées: {len(castle_files)}")
@@ -7,10 +7,8 @@ depuis Wikimedia Commons avec vérification stricte de correspondance
 import os
 import re
 import glob
-import urllib.request
-import urllib.parse
-from urllib.error import URLError, HTTPError
-import time
+
+from image_downloader import download, download_many
 
 # Base de données d'images authentiques vérifiées depuis Wikimedia Commons
 # Chaque entrée est vérifiée pour correspondre exactement au château spécifique
@@ -68,27 +66,14 @@ def create_assets_directory():
 
 def download_verified_image(url, filename, img_dir):
     """Télécharger une image vérifiée depuis Wikimedia Commons"""
-    try:
-        file_path = os.path.join(img_dir, filename)
-        
-        # Éviter de télécharger si le fichier existe déjà
-        if os.path.exists(file_path):
-            return True
-            
-        # Headers appropriés pour Wikimedia Commons
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'KastelenBelgie/1.0 (https://kastelenbelgie.be; contact@kastelenbelgie.be)')
-        
-        with urllib.request.urlopen(req, timeout=15) as response:
-            with open(file_path, 'wb') as f:
-                f.write(response.read())
-        
-        print(f"✓ Image authentique téléchargée: {filename}")
-        return True
-        
-    except (URLError, HTTPError, Exception) as e:
-        print(f"✗ Erreur téléchargement {filename}: {e}")
-        return False
+    # Un fichier déjà présent est revalidé (ETag / Last-Modified) au lieu d'être retéléchargé
+    success, message = download(url, os.path.join(img_dir, filename))
+    
+    if success:
+        print(f"✓ Image authentique {filename}: {message}")
+    else:
+        print(f"✗ Erreur téléchargement {filename}: {message}")
+    return success
 
 def update_html_with_verified_image(file_path, image_name, source_info):
     """Mettre à jour le HTML pour inclure l'image vérifiée"""
@@ -145,6 +130,16 @@ def main():
     success_count = 0
     verified_count = 0
     
+    # Télécharger toutes les images vérifiées en une fois (en parallèle, avec cache HTTP)
+    jobs = {}
+    for file_path in castle_files:
+        filename = os.path.basename(file_path)
+        castle_data = VERIFIED_CASTLE_IMAGES.get(filename)
+        if castle_data and castle_data['verified']:
+            jobs[filename] = (castle_data['url'], os.path.join(img_dir, filename.replace('.html', '.jpg')))
+    
+    downloads = dict(zip(jobs, download_many(jobs.values())))
+    
     for file_path in castle_files:
         filename = os.path.basename(file_path)
         
@@ -154,9 +149,10 @@ def main():
             
             if castle_data['verified']:
                 image_name = f"{filename.replace('.html', '.jpg')}"
+                downloaded, message = downloads[filename]
                 
-                # Télécharger l'image vérifiée
-                if download_verified_image(castle_data['url'], image_name, img_dir):
+                # Image vérifiée téléchargée (ou encore à jour)
+                if downloaded:
                     # Mettre à jour le HTML
                     if update_html_with_verified_image(file_path, image_name, castle_data['source']):
                         success_count += 1
@@ -165,14 +161,11 @@ def main():
                     else:
                         print(f"✗ Échec mise à jour HTML: {filename}")
                 else:
-                    print(f"✗ Échec téléchargement: {filename}")
+                    print(f"✗ Échec téléchargement: {filename} ({message})")
             else:
                 print(f"⚠ Image non vérifiée ignorée: {filename}")
         else:
             print(f"○ Aucune image authentique disponible: {filename}")
-        
-        # Petite pause pour respecter les serveurs
-        time.sleep(0.2)
     
     print(f"\n=== RÉSUMÉ ===")
     print(f"Pages traitées: {len(castle_files)}")
@@ -8,7 +8,8 @@ au lieu du placeholder caché
 
 import os
 import re
-import glob
+
+from page_discovery import find_castle_files
 
 def add_visible_placeholder(file_path):
     """Ajouter un placeholder d'image visible"""
@@ -40,19 +41,7 @@ def main():
     print("=== AJOUT DE PLACEHOLDERS VISIBLES ===")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Pages de châteaux trouvées: {len(castle_files)}")
     
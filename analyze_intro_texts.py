@@ -5,51 +5,18 @@
 Script pour analyser les textes d'introduction des châteaux et identifier les contenus dupliqués
 """
 
-import os
-import re
-import glob
 from collections import defaultdict
 import hashlib
 
-def extract_intro_text(file_path):
-    """Extraire le texte d'introduction d'une page de château"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Chercher la section intro
-        intro_pattern = r'<div class="intro">(.*?)</div>'
-        intro_match = re.search(intro_pattern, content, re.DOTALL)
-        
-        if intro_match:
-            intro_html = intro_match.group(1)
-            
-            # Extraire les paragraphes
-            paragraphs = re.findall(r'<p>\s*(.*?)\s*</p>', intro_html, re.DOTALL)
-            
-            # Nettoyer le texte
-            clean_paragraphs = []
-            for p in paragraphs:
-                # Supprimer les balises HTML
-                clean_text = re.sub(r'<[^>]+>', '', p)
-                # Nettoyer les espaces
-                clean_text = ' '.join(clean_text.split())
-                if clean_text.strip():
-                    clean_paragraphs.append(clean_text.strip())
-            
-            return clean_paragraphs
-        
-        return []
-        
-    except Exception as e:
-        print(f"Erreur lors de l'extraction de {file_path}: {e}")
-        return []
+from castle_catalog import open_catalog, get_all_castles
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates
+from generic_content import rank_generic_texts
 
 def get_text_hash(text):
     """Générer un hash pour identifier les textes similaires"""
     return hashlib.md5(text.lower().encode()).hexdigest()
 
-def analyze_duplicates(castle_files):
+def analyze_duplicates(castles):
     """Analyser les doublons dans les textes d'introduction"""
     
     text_to_files = defaultdict(list)
@@ -57,9 +24,9 @@ def analyze_duplicates(castle_files):
     
     print("=== ANALYSE DES TEXTES D'INTRODUCTION ===\n")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        intro_paragraphs = extract_intro_text(file_path)
+    for castle in castles:
+        filename = castle['file']
+        intro_paragraphs = castle['intro']
         
         if intro_paragraphs:
             # Combiner tous les paragraphes
@@ -78,7 +45,7 @@ def analyze_duplicates(castle_files):
     # Identifier les doublons
     duplicates = {hash_val: files for hash_val, files in text_to_files.items() if len(files) > 1}
     
-    print(f"Pages analysées: {len(castle_files)}")
+    print(f"Pages analysées: {len(castles)}")
     print(f"Pages avec texte d'intro: {len(file_to_text)}")
     print(f"Groupes de doublons trouvés: {len(duplicates)}\n")
     
@@ -97,49 +64,44 @@ def analyze_duplicates(castle_files):
             print(f"  Texte: {sample_text}...")
             print()
     
+    # Quasi-doublons: même modèle de texte avec un autre nom de château (MinHash + LSH)
+    near_duplicates = find_near_duplicates({filename: data['text'] for filename, data in file_to_text.items()})
+    
+    print(f"=== QUASI-DOUBLONS (Jaccard ≥ {DEFAULT_THRESHOLD}) ===\n")
+    print(f"Groupes de quasi-doublons trouvés: {len(near_duplicates)}\n")
+    for i, cluster in enumerate(near_duplicates, 1):
+        print(f"Groupe {i} ({len(cluster['members'])} pages, similarité estimée ≥ {cluster['min_similarity']:.2f}):")
+        for filename in cluster['members'][:3]:
+            print(f"  - {filename}")
+        if len(cluster['members']) > 3:
+            print(f"  ... et {len(cluster['members']) - 3} autres")
+        print()
+    
     # Analyser les textes génériques
     print("=== TEXTES GÉNÉRIQUES DÉTECTÉS ===\n")
-    generic_keywords = [
-        'ce château', 'cette forteresse', 'cet édifice',
-        'situé en belgique', 'patrimoine belge', 'architecture remarquable',
-        'histoire fascinante', 'témoigne du passé', 'exemple typique'
-    ]
-    
-    generic_files = []
-    for filename, data in file_to_text.items():
-        text_lower = data['text'].lower()
-        generic_score = sum(1 for keyword in generic_keywords if keyword in text_lower)
-        
-        if generic_score >= 2 or len(data['text']) < 100:
-            generic_files.append((filename, generic_score, len(data['text'])))
+    # Mots-clés nl/fr/en compilés en un seul motif, statistiques calculées par lot
+    ranking = rank_generic_texts({filename: data['text'] for filename, data in file_to_text.items()})
+    generic_files = [(row['key'], row['hits'], row['length']) for row in ranking if row['generic']]
     
     if generic_files:
         print(f"Pages avec texte générique ({len(generic_files)}):")
-        for filename, score, length in sorted(generic_files, key=lambda x: x[1], reverse=True)[:10]:
-            print(f"  - {filename} (score: {score}, longueur: {length})")
+        for row in ranking[:10]:
+            print(f"  - {row['key']} (score: {row['hits']}, densité: {row['density']:.3f}, modèle: {row['overlap']:.0%}, longueur: {row['length']})")
     
     return file_to_text, duplicates, generic_files
 
 def main():
     """Fonction principale"""
     
-    # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    # Charger les châteaux depuis le catalogue
+    conn = open_catalog()
+    try:
+        castles = get_all_castles(conn)
+    finally:
+        conn.close()
     
     # Analyser les textes
-    file_to_text, duplicates, generic_files = analyze_duplicates(castle_files)
+    file_to_text, duplicates, generic_files = analyze_duplicates(castles)
     
     # Sauvegarder les résultats pour usage ultérieur
     print("\n=== RECOMMANDATIONS ===")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vingerafdrukken voor de statische bestanden van de gepubliceerde site.
+Elk bestand in js/, assets/ en chateaux_images/ krijgt een kopie (hardlink) met de
+hash van zijn inhoud in de naam, bv. chateaux_images/Braemkasteel.3f2a9c81d0.jpg.
+Alle verwijzingen in de pagina's worden in één doorgang met één reguliere
+expressie herschreven; bestanden die al een hash in hun naam dragen (de CSS- en
+JS-bundels) blijven zoals ze zijn. Zo'n naam verandert met de inhoud, dus de
+browser en het CDN mogen hem onbeperkt bewaren.
+_headers beschrijft de cacheregels voor de statische host: immutable voor de
+bestanden met een hash, een korte TTL voor de HTML.
+"""
+
+import os
+import re
+import shutil
+import hashlib
+from urllib.parse import unquote
+
+# Lengte van de hash in de bestandsnaam (zoals bij script_bundle en css_bundle)
+HASH_LENGTH = 10
+
+# Mappen waarvan de bestanden een vingerafdruk krijgen
+FINGERPRINT_DIRS = ('js', 'assets', 'chateaux_images')
+
+# Een naam die al een hash bevat: site.0123456789.js, style.0123456789.css
+HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+
+# Relatieve verwijzing naar een statisch bestand (niet binnen een absolute URL)
+ASSET_REFERENCE_PATTERN = re.compile(
+    r'(?<![\w/.-])(\./|/)?((?:%s|css)/[^"\'\s,()?#<>]+)' % '|'.join(FINGERPRINT_DIRS)
+)
+
+HEADERS_FILENAME = '_headers'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+HTML_CACHE_CONTROL = 'public, max-age=300, must-revalidate'
+
+def is_fingerprinted(relative_path):
+    """Draagt de bestandsnaam al een hash?"""
+    return bool(HASHED_NAME_PATTERN.search(relative_path))
+
+def file_digest(file_path):
+    """sha256 van een bestand, in blokken gelezen"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def fingerprint_name(relative_path, digest):
+    """'chateaux_images/x.jpg' -> 'chateaux_images/x.<hash>.jpg'"""
+    stem, extension = os.path.splitext(relative_path)
+    return f'{stem}.{digest[:HASH_LENGTH]}{extension}'
+
+def link_or_copy(source, target):
+    """Hardlink naar source, of een kopie als linken niet kan"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def fingerprint_assets(dist_dir, relative_paths):
+    """
+    Maak voor elk bestand (relatief aan dist_dir) een kopie met hash, als die nog
+    niet bestaat. Retourneert relatief pad -> relatief pad met hash; bestanden die
+    al een hash dragen verwijzen naar zichzelf.
+    """
+    mapping = {}
+    for relative_path in relative_paths:
+        if is_fingerprinted(relative_path):
+            mapping[relative_path] = relative_path
+            continue
+        
+        source = os.path.join(dist_dir, relative_path)
+        hashed_path = fingerprint_name(relative_path, file_digest(source))
+        target = os.path.join(dist_dir, hashed_path)
+        if not os.path.exists(target):
+            link_or_copy(source, target)
+        mapping[relative_path] = hashed_path
+    
+    return mapping
+
+def rewrite_asset_references(content, mapping):
+    """Vervang in één doorgang alle verwijzingen naar bestanden uit mapping door hun naam met hash"""
+    def replace(match):
+        hashed_path = mapping.get(unquote(match.group(2)))
+        if hashed_path is None:
+            return match.group(0)
+        return (match.group(1) or '') + hashed_path
+    
+    return ASSET_REFERENCE_PATTERN.sub(replace, content)
+
+def write_headers(dist_dir, hashed_paths, html_paths):
+    """
+    Schrijf _headers (formaat van Netlify en Cloudflare Pages): per bestand met hash
+    een immutable Cache-Control, per pagina een korte TTL. Retourneert het pad.
+    """
+    lines = ['# Gegenereerd door publish_site.py']
+    for relative_path in sorted(html_paths):
+        urls = ['/'] if relative_path == 'index.html' else []
+        for url in urls + [f'/{relative_path}']:
+            lines += [url, f'  Cache-Control: {HTML_CACHE_CONTROL}']
+    for relative_path in sorted(hashed_paths):
+        lines += [f'/{relative_path}', f'  Cache-Control: {IMMUTABLE_CACHE_CONTROL}']
+    
+    headers_path = os.path.join(dist_dir, HEADERS_FILENAME)
+    tmp_path = headers_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, headers_path)
+    return headers_path
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks van de scripts op een synthetisch corpus van N kasteelpagina's.
+Het corpus wordt opgebouwd met templates/castle-page.html, in de staat waarin
+generate_pages.sh een pagina aanmaakte (placeholders voor afbeelding, intro en
+kaarten, geen breadcrumb of FAQ), met plaatsnamen uit de PROVINCES-tabel en
+kasteelnamen van de afbeeldingen in chateaux_images. Daarnaast wordt één keer een
+gepatchte versie gemaakt (breadcrumb, FAQ, intro en afbeelding toegepast). Elke
+benchmark krijgt een verse kopie van de versie die hij nodig heeft, zodat het
+resultaat niet afhangt van de volgorde, en draait in een eigen proces, zodat de
+piek van het geheugengebruik (RSS) per functie klopt. Een proces dat sterft
+(bv. door een tekort aan geheugen) of te lang duurt, wordt als fout gemeld.
+Wandkloktijd, pagina's per seconde en piek-RSS komen in een JSON-bestand in
+.build/benchmarks, en worden vergeleken met de vorige meting.
+
+Gebruik: python3 benchmark_suite.py [N ...]   (standaard 1000 10000 100000)
+"""
+
+import os
+import io
+import sys
+import json
+import glob
+import time
+import random
+import shutil
+import platform
+import contextlib
+import queue as queue_module
+import subprocess
+import multiprocessing
+from urllib.parse import quote_plus
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import page_cache
+from page_discovery import classify_page, find_castle_files
+from page_renderer import MEDIA_PLACEHOLDER, get_renderer
+from castle_catalog import open_catalog, build_catalog, get_all_castles
+from create_province_pages import PROVINCES, find_castles_by_province
+from add_opening_hours import create_hours_list_html
+from add_breadcrumbs import add_breadcrumb_to_castle_page
+from add_faq_sections import add_faq_section
+from create_unique_intro_texts import update_intro_text
+from add_castle_images import update_castle_page_image
+from analyze_intro_texts import analyze_duplicates
+from near_duplicates import find_near_duplicates, get_intro_texts
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIR = os.path.join(SITE_ROOT, '.build', 'benchmarks')
+IMAGES_DIR = os.path.join(SITE_ROOT, 'chateaux_images')
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+CORPUS_SEED = 42
+
+# Maximale duur van één benchmark, en hoe vaak gekeken wordt of het proces nog leeft (seconden)
+BENCHMARK_TIMEOUT = 3600
+POLL_INTERVAL = 1.0
+
+# Toestand van het corpus waarop een benchmark draait
+CORPUS_NEW = 'nieuw'
+CORPUS_PATCHED = 'gepatcht'
+
+# Inhoud van een pas aangemaakte pagina, zoals generate_pages.sh ze achterliet
+NEW_PAGE_HOURS_NOTE = 'Vul hier de juiste uren in zodra je ze hebt.'
+NEW_PAGE_INTRO = '''<div class="intro">
+          <p>
+            Introtekst over {title}. Voeg hier een korte beschrijving toe van de geschiedenis,
+            het erfgoed en wat bezoekers kunnen verwachten.
+          </p>
+        </div>'''
+NEW_PAGE_CARD = '''          <a class="card" href="#">
+            <div class="card-media gradient-{i}"></div>
+            <div class="card-body"><h3>Voorbeeldkasteel {i}</h3></div>
+          </a>'''
+WEEKDAYS = ('Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag', 'Zaterdag', 'Zondag')
+
+def corpus_dir_for(count, state=CORPUS_NEW):
+    """Map van het corpus met count pagina's in de gegeven toestand"""
+    if state == CORPUS_NEW:
+        return os.path.join(BENCHMARK_DIR, f'corpus-{count}')
+    return os.path.join(BENCHMARK_DIR, f'corpus-{count}-{state}')
+
+def work_dir_for(count):
+    """Werkmap waarin telkens één benchmark op een kopie van het corpus draait"""
+    return os.path.join(BENCHMARK_DIR, f'corpus-{count}-werk')
+
+def corpus_names():
+    """Kasteelnamen (slug) van de afbeeldingen in chateaux_images die als kasteelpagina herkend worden"""
+    names = set()
+    for image_name in os.listdir(IMAGES_DIR):
+        stem, extension = os.path.splitext(image_name)
+        if extension.lower() not in ('.jpg', '.jpeg', '.png'):
+            continue
+        slug = stem.lower().replace('_', '-').replace(' ', '-')
+        if classify_page(f'{slug}-x.html') == 'castle':
+            names.add(slug)
+    return sorted(names)
+
+def corpus_places():
+    """Alle (provincie, plaats) uit de PROVINCES-tabel van de provinciepagina's"""
+    return [(province_id, place) for province_id, data in PROVINCES.items() for place in data['places']]
+
+def new_page_slots(name, slug, hours_html):
+    """Slots van de kasteeltemplate voor een pagina die nog geen enkele patch gekregen heeft"""
+    title = slug.replace('-', ' ')
+    return {
+        'NAME': name.replace('-', ' ').title(),
+        'TITLE': title,
+        'MAP_QUERY': quote_plus(title),
+        'BREADCRUMB': '',
+        'MEDIA': MEDIA_PLACEHOLDER.format(title=title),
+        'HOURS': hours_html,
+        'HOURS_NOTE': NEW_PAGE_HOURS_NOTE,
+        'INTRO': NEW_PAGE_INTRO.format(title=title),
+        'ADDRESS': 'Adres volgt',
+        'RELATED': '\n'.join(NEW_PAGE_CARD.format(i=i) for i in (1, 2, 3)),
+        'FAQ': '',
+        'SCRIPTS': '',
+    }
+
+def generate_corpus(count, seed=CORPUS_SEED):
+    """
+    Maak een corpus van count kasteelpagina's aan (een bestaand corpus wordt vervangen).
+    Retourneert de map van het corpus.
+    """
+    corpus_dir = corpus_dir_for(count)
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    os.makedirs(corpus_dir)
+    
+    rng = random.Random(seed)
+    render = get_renderer()
+    names = corpus_names()
+    places = corpus_places()
+    hours_html = create_hours_list_html({'hours': {day: '—' for day in WEEKDAYS}})
+    
+    for i in range(count):
+        name = rng.choice(names)
+        province_id, place = rng.choice(places)
+        slug = f'{name}-{i}-{place}'
+        with open(os.path.join(corpus_dir, f'{slug}.html'), 'w', encoding='utf-8') as f:
+            f.write(render(**new_page_slots(name, slug, hours_html)))
+    
+    return corpus_dir
+
+def corpus_catalog_path(corpus_dir):
+    """Catalogus van een corpus, naast het corpus zelf"""
+    return os.path.join(corpus_dir, '.build', 'castle_catalog.sqlite')
+
+def open_corpus_catalog(corpus_dir, rebuild=False):
+    """Catalogus van het corpus (opgebouwd als hij ontbreekt of verouderd is)"""
+    return open_catalog(corpus_catalog_path(corpus_dir), rebuild=rebuild, site_root=corpus_dir)
+
+# Per benchmark: setup(corpus_dir) -> argumenten (niet gemeten), run(*argumenten) -> aantal pagina's
+
+def setup_castle_files(corpus_dir):
+    """Alle pagina's van het corpus"""
+    return (find_castle_files(corpus_dir),)
+
+def run_breadcrumbs(castle_files):
+    """add_breadcrumbs: breadcrumb toevoegen aan elke pagina"""
+    for file_path in castle_files:
+        add_breadcrumb_to_castle_page(file_path)
+    return len(castle_files)
+
+def run_faq(castle_files):
+    """add_faq_sections: FAQ-sectie toevoegen aan elke pagina"""
+    for file_path in castle_files:
+        add_faq_section(file_path)
+    return len(castle_files)
+
+def run_intro(castle_files):
+    """create_unique_intro_texts: introtekst vervangen op elke pagina"""
+    for file_path in castle_files:
+        update_intro_text(file_path)
+    return len(castle_files)
+
+def run_image(castle_files):
+    """add_castle_images: placeholder vervangen door de passende afbeelding"""
+    for file_path in castle_files:
+        update_castle_page_image(file_path, IMAGES_DIR)
+    return len(castle_files)
+
+def setup_build_catalog(corpus_dir):
+    """Corpus en zijn pagina's; de catalogus zelf wordt gemeten"""
+    return corpus_dir, find_castle_files(corpus_dir)
+
+def run_build_catalog(corpus_dir, castle_files):
+    """castle_catalog: catalogus opbouwen uit de (gepatchte) pagina's"""
+    return build_catalog(corpus_catalog_path(corpus_dir), castle_files)
+
+def setup_catalog(corpus_dir):
+    """Open catalogus van het corpus"""
+    return (open_corpus_catalog(corpus_dir),)
+
+def run_find_castles_by_province(conn):
+    """create_province_pages: kastelen per provincie uit de catalogus"""
+    province_castles = find_castles_by_province(conn)
+    return sum(len(castles) for castles in province_castles.values())
+
+def setup_castles(corpus_dir):
+    """Alle catalogusrecords van het corpus"""
+    conn = open_corpus_catalog(corpus_dir)
+    try:
+        return (get_all_castles(conn),)
+    finally:
+        conn.close()
+
+def run_analyze_duplicates(castles):
+    """analyze_intro_texts: dubbele en generieke introteksten zoeken"""
+    analyze_duplicates(castles)
+    return len(castles)
+
+def run_find_near_duplicates(castles):
+    """near_duplicates: clusters van bijna-dubbele introteksten (MinHash + LSH)"""
+    find_near_duplicates(get_intro_texts(castles))
+    return len(castles)
+
+# Per benchmark: (toestand van het corpus, setup, run). De patches draaien op een nieuw
+# corpus, de catalogus en de analyses op een corpus waarop alle patches toegepast zijn
+BENCHMARKS = {
+    'add_breadcrumb_to_castle_page': (CORPUS_NEW, setup_castle_files, run_breadcrumbs),
+    'add_faq_section': (CORPUS_NEW, setup_castle_files, run_faq),
+    'update_intro_text': (CORPUS_NEW, setup_castle_files, run_intro),
+    'update_castle_page_image': (CORPUS_NEW, setup_castle_files, run_image),
+    'build_catalog': (CORPUS_PATCHED, setup_build_catalog, run_build_catalog),
+    'find_castles_by_province': (CORPUS_PATCHED, setup_catalog, run_find_castles_by_province),
+    'analyze_duplicates': (CORPUS_PATCHED, setup_castles, run_analyze_duplicates),
+    'find_near_duplicates': (CORPUS_PATCHED, setup_castles, run_find_near_duplicates),
+}
+
+# De patches die samen het gepatchte corpus opleveren, in de volgorde van een nieuwe site
+PATCHES = (run_breadcrumbs, run_faq, run_intro, run_image)
+
+def copy_corpus(source_dir, target_dir):
+    """Vervang target_dir door een kopie van de pagina's in source_dir (zonder .build)"""
+    shutil.rmtree(target_dir, ignore_errors=True)
+    shutil.copytree(source_dir, target_dir, ignore=shutil.ignore_patterns('.build'))
+    return target_dir
+
+def generate_patched_corpus(count):
+    """Maak uit het nieuwe corpus de gepatchte versie (niet gemeten); retourneert de map"""
+    corpus_dir = copy_corpus(corpus_dir_for(count), corpus_dir_for(count, CORPUS_PATCHED))
+    castle_files = find_castle_files(corpus_dir)
+    
+    page_cache.use_page_cache(os.path.join(corpus_dir, '.build', 'page_cache.pickle'))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for patch in PATCHES:
+                patch(castle_files)
+    finally:
+        page_cache.use_page_cache(page_cache.PAGE_CACHE_PATH)
+    
+    return corpus_dir
+
+def peak_rss_kb():
+    """Piek van het geheugengebruik van dit proces in KiB, of None zonder de module resource"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # macOS geeft bytes
+
+def run_benchmark(name, corpus_dir, queue):
+    """Voer één benchmark uit (in een nieuw proces) en geef het resultaat door via queue"""
+    try:
+        page_cache.use_page_cache(os.path.join(corpus_dir, '.build', 'page_cache.pickle'))
+        state, setup, run = BENCHMARKS[name]
+        args = setup(corpus_dir)
+        rss_before = peak_rss_kb()
+        
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            pages = run(*args)
+        wall = time.perf_counter() - start
+        
+        queue.put({
+            'wall_s': round(wall, 4),
+            'pages': pages,
+            'pages_per_s': round(pages / wall, 1) if wall else None,
+            'peak_rss_kb': peak_rss_kb(),
+            'baseline_rss_kb': rss_before,
+            'error': None
+        })
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def measure(name, corpus_dir, timeout=BENCHMARK_TIMEOUT):
+    """
+    Start een benchmark in een vers proces (spawn), zodat de piek-RSS niet van eerdere
+    metingen komt. Een proces dat zonder resultaat stopt of na timeout seconden nog
+    loopt, geeft een resultaat met een foutmelding in plaats van te blijven wachten.
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=run_benchmark, args=(name, corpus_dir, queue))
+    process.start()
+    
+    deadline = time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=POLL_INTERVAL)
+        except queue_module.Empty:
+            if not process.is_alive():
+                # Het resultaat kan nog onderweg zijn als het proces net gestopt is
+                try:
+                    result = queue.get(timeout=POLL_INTERVAL)
+                except queue_module.Empty:
+                    result = {'error': f"Proces gestopt zonder resultaat (exitcode {process.exitcode})"}
+            elif time.monotonic() > deadline:
+                process.terminate()
+                result = {'error': f"Langer dan {timeout} s, afgebroken"}
+    
+    process.join()
+    return result
+
+def git_commit():
+    """Huidige commit van de repository, of None"""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SITE_ROOT,
+            capture_output=True, text=True, check=True
+        )
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(results):
+    """Schrijf de resultaten naar .build/benchmarks/results-<tijd>-<commit>.json; retourneert het pad"""
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(results['timestamp']))
+    path = os.path.join(BENCHMARK_DIR, f"results-{stamp}-{results['commit'] or 'onbekend'}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return path
+
+def previous_results(current_path):
+    """De meest recente eerdere resultaten, of None"""
+    paths = sorted(path for path in glob.glob(os.path.join(BENCHMARK_DIR, 'results-*.json')) if path != current_path)
+    if not paths:
+        return None
+    with open(paths[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_results(previous, current):
+    """Druk per benchmark de verhouding van de tijd t.o.v. de vorige meting af"""
+    print(f"\n=== VERGELIJKING MET {previous['commit']} ===")
+    for size, benchmarks in current['sizes'].items():
+        for name, result in benchmarks.items():
+            old = previous['sizes'].get(size, {}).get(name)
+            if not old or old.get('error') or result.get('error') or not old['wall_s']:
+                continue
+            ratio = result['wall_s'] / old['wall_s']
+            mark = '✗' if ratio > 1.1 else '✓'
+            print(f"  {mark} {size:>7} {name}: {old['wall_s']:.3f} s → {result['wall_s']:.3f} s ({ratio:.2f}x)")
+
+def main():
+    """Hoofdfunctie"""
+    print("=== BENCHMARKS ===")
+    
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'sizes': {}
+    }
+    
+    for size in sizes:
+        print(f"\nCorpus van {size} pagina's aanmaken...")
+        start = time.perf_counter()
+        corpus_dir = generate_corpus(size)
+        print(f"  ✓ {corpus_dir} ({time.perf_counter() - start:.1f} s)")
+        
+        start = time.perf_counter()
+        patched_dir = generate_patched_corpus(size)
+        print(f"  ✓ {patched_dir} ({time.perf_counter() - start:.1f} s)")
+        
+        size_results = results['sizes'][str(size)] = {}
+        for name, (state, setup, run) in BENCHMARKS.items():
+            # Elke benchmark op een verse kopie: het resultaat hangt niet af van de volgorde
+            work_dir = copy_corpus(corpus_dir_for(size, state), work_dir_for(size))
+            result = measure(name, work_dir)
+            size_results[name] = result
+            if result['error']:
+                print(f"  ✗ {name}: {result['error']}")
+            else:
+                print(f"  ✓ {name}: {result['wall_s']:.3f} s, {result['pages_per_s']} pagina's/s, piek {result['peak_rss_kb']} KiB")
+        
+        shutil.rmtree(work_dir_for(size), ignore_errors=True)
+    
+    path = save_results(results)
+    print(f"\n✓ Resultaten opgeslagen in {path}")
+    
+    previous = previous_results(path)
+    if previous:
+        compare_results(previous, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Catalogus van alle kastelen in één SQLite-bestand (.build/castle_catalog.sqlite).
+De gegevens komen uit de paginacache (page_cache.py); daarna kunnen scripts een kasteel
+opvragen per slug, provincie of plaats via geïndexeerde queries in plaats van
+de HTML opnieuw te parsen.
+De catalogus is een alleen-lezen weergave van wat er op de pagina's staat. De
+brontabellen (CASTLES_DATABASE, FAQ_DATABASE, de adressen, de openingsuren,
+VERIFIED_CASTLE_IMAGES) blijven bewust in hun scripts: ze worden met de hand
+bijgehouden en zijn de invoer van de transformaties die de pagina's schrijven,
+terwijl de catalogus uit die pagina's wordt opgebouwd. Ze uit de catalogus lezen
+zou de bouwvolgorde omkeren. De catalogus vervangt dus enkel het opnieuw inlezen
+en parsen van de HTML door scripts die gegevens van de pagina's nodig hebben
+(near_duplicates, page_renderer, create_province_pages, analyze_intro_texts),
+niet de opzoekingen in de brontabellen.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+
+from add_breadcrumbs import PLACE_AUTOMATON
+from province_matcher import match_place
+from page_discovery import find_castle_files
+from page_cache import extract_page_structure, get_pages, get_page_hash, save_page_cache
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(SITE_ROOT, '.build', 'castle_catalog.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS castles (
+    slug TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    name TEXT,
+    province TEXT,
+    province_name TEXT,
+    place TEXT,
+    address TEXT,
+    hours TEXT,
+    hours_note TEXT,
+    image TEXT,
+    intro TEXT,
+    related TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_castles_province ON castles (province);
+CREATE INDEX IF NOT EXISTS idx_castles_place ON castles (place);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Kolommen die als JSON worden opgeslagen
+JSON_COLUMNS = ('hours', 'intro', 'related')
+
+def castle_record(page, filename):
+    """Zet de geëxtraheerde structuur van een kasteelpagina om naar een catalogusrecord"""
+    record = {
+        'slug': filename.replace('.html', ''),
+        'file': filename,
+        'name': page['h1'],
+        'province': None,
+        'province_name': None,
+        'place': None,
+        'address': page['address'],
+        'hours': dict(page['hours']),
+        'hours_note': page['hours_note'],
+        'image': page['image'],
+        'intro': list(page['intro']),
+        'related': list(page['related']),
+    }
+    
+    # Provincie en plaats
+    match = match_place(PLACE_AUTOMATON, filename)
+    if match:
+        record['province'] = match['province']
+        record['province_name'] = match['name']
+        record['place'] = match['place']
+    
+    return record
+
+def extract_castle_record(content, filename):
+    """Haal alle kasteelgegevens uit de HTML-inhoud van één pagina"""
+    return castle_record(extract_page_structure(content), filename)
+
+def get_source_stamp(castle_files):
+    """
+    Stempel van de bronpagina's: hash over de bestandsnamen en de inhoudshashes uit
+    de paginacache. Elke wijziging telt, ook een bestand met een oudere wijzigingstijd
+    (git checkout, cp -p).
+    """
+    digest = hashlib.sha256()
+    for file_path in sorted(castle_files):
+        digest.update(os.path.basename(file_path).encode('utf-8'))
+        digest.update(get_page_hash(file_path).encode('utf-8'))
+    
+    save_page_cache()
+    return digest.hexdigest()
+
+def build_catalog(catalog_path=CATALOG_PATH, castle_files=None):
+    """Bouw de catalogus opnieuw op uit de kasteelpagina's; retourneer het aantal records"""
+    if castle_files is None:
+        castle_files = find_castle_files()
+    
+    os.makedirs(os.path.dirname(catalog_path), exist_ok=True)
+    
+    conn = sqlite3.connect(catalog_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute("DELETE FROM castles")
+        
+        # De structuur komt uit de paginacache; enkel gewijzigde pagina's worden gelezen
+        pages = get_pages(castle_files)
+        
+        for file_path in castle_files:
+            record = castle_record(pages[file_path], os.path.basename(file_path))
+            for column in JSON_COLUMNS:
+                record[column] = json.dumps(record[column], ensure_ascii=False)
+            
+            conn.execute(
+                "INSERT OR REPLACE INTO castles VALUES "
+                "(:slug, :file, :name, :province, :province_name, :place, "
+                ":address, :hours, :hours_note, :image, :intro, :related)",
+                record
+            )
+        
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('source_stamp', ?)",
+            (get_source_stamp(castle_files),)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    
+    return len(castle_files)
+
+def open_catalog(catalog_path=CATALOG_PATH, rebuild=False, site_root=SITE_ROOT):
+    """
+    Open de catalogus van de pagina's in site_root. Die wordt (opnieuw) opgebouwd
+    als hij ontbreekt, als er pagina's zijn bijgekomen, verdwenen of gewijzigd sinds
+    de laatste build, of als rebuild=True.
+    """
+    castle_files = find_castle_files(site_root)
+    stale = rebuild or not os.path.exists(catalog_path)
+    
+    if not stale:
+        conn = sqlite3.connect(catalog_path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source_stamp'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        conn.close()
+        stale = row is None or row[0] != get_source_stamp(castle_files)
+    
+    if stale:
+        build_catalog(catalog_path, castle_files)
+    
+    conn = sqlite3.connect(catalog_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def row_to_castle(row):
+    """Zet een catalogusrij om naar een dict, met de JSON-kolommen gedecodeerd"""
+    castle = dict(row)
+    for column in JSON_COLUMNS:
+        castle[column] = json.loads(castle[column])
+    return castle
+
+def get_castle(conn, slug):
+    """Zoek één kasteel op slug (met of zonder .html)"""
+    row = conn.execute("SELECT * FROM castles WHERE slug = ?", (slug.replace('.html', ''),)).fetchone()
+    return row_to_castle(row) if row else None
+
+def get_all_castles(conn):
+    """Alle kastelen uit de catalogus, gesorteerd op slug"""
+    rows = conn.execute("SELECT * FROM castles ORDER BY slug")
+    return [row_to_castle(row) for row in rows]
+
+def get_castles_by_province(conn, province):
+    """Alle kastelen van een provincie, gesorteerd op slug"""
+    rows = conn.execute("SELECT * FROM castles WHERE province = ? ORDER BY slug", (province,))
+    return [row_to_castle(row) for row in rows]
+
+def get_castles_by_place(conn, place):
+    """Alle kastelen van een plaats, gesorteerd op slug"""
+    rows = conn.execute("SELECT * FROM castles WHERE place = ? ORDER BY slug", (place.lower(),))
+    return [row_to_castle(row) for row in rows]
+
+def main():
+    """Hoofdfunctie"""
+    print("=== KASTEELCATALOGUS ===")
+    
+    count = build_catalog()
+    print(f"✓ {count} kastelen opgeslagen in {CATALOG_PATH}")
+    
+    conn = open_catalog()
+    try:
+        print("\nKastelen per provincie:")
+        for province, total in conn.execute(
+            "SELECT province, COUNT(*) FROM castles GROUP BY province ORDER BY province"
+        ):
+            print(f"  {province or 'onbekend'}: {total}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
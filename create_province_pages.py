@@ -6,9 +6,11 @@ Script pour créer les pages provinces avec tous les châteaux organisés par pr
 """
 
 import os
-import glob
 import re
 
+from castle_catalog import open_catalog, get_castles_by_province
+from fragment_cache import fragment, print_fragment_stats
+
 # Définition des provinces et leurs châteaux
 PROVINCES = {
     'antwerpen': {
@@ -19,7 +21,7 @@ PROVINCES = {
     'oost-vlaanderen': {
         'name': 'Oost-Vlaanderen',
         'description': 'Oost-Vlaanderen biedt een fascinerende mix van middeleeuwse kastelen en renaissanceresidencies, getuigen van de rijke handelsgeschiedenis van de regio.',
-        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem']
+        'places': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte', 'waasmunster', 'beveren-waas', 'oostakker', 'beerlegem', 'meulebeke', 'nokere', 'olsene', 'regelsbrugge', 'wedergrate', 'wippelgem', 'meerbeke']
     },
     'west-vlaanderen': {
         'name': 'West-Vlaanderen',
@@ -29,7 +31,7 @@ PROVINCES = {
     'limburg': {
         'name': 'Limburg',
         'description': 'Limburg combineert middeleeuwse commanderijen met elegante kastelen, vaak gelegen in pittoreske natuurdomeinen die de rust van het Limburgse landschap uitstralen.',
-        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem']
+        'places': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken', 'diepenbeek', 'meer', 'nieuwerkerken', 'wimmertingen', 'rotem', 'remersdaal']
     },
     'vlaams-brabant': {
         'name': 'Vlaams-Brabant',
@@ -44,7 +46,7 @@ PROVINCES = {
     'luik': {
         'name': 'Luik',
         'description': 'Luik combineert indrukwekkende citadellen met elegante kastelen, getuigen van de strategische betekenis van deze provincie in de Europese geschiedenis.',
-        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken', 'remersdaal']
+        'places': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren', 'tilff', 'oteppe', 'hergenrath', 'sippenaeken']
     },
     'luxemburg': {
         'name': 'Luxemburg',
@@ -63,51 +65,108 @@ PROVINCES = {
     }
 }
 
-def find_castles_by_province():
-    """Vind alle kastelen georganiseerd per provincie"""
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    # Organiseer per provincie
+def find_castles_by_province(conn=None):
+    """Vind alle kastelen georganiseerd per provincie (standaard uit de catalogus van de site)"""
     province_castles = {province: [] for province in PROVINCES.keys()}
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        filename_lower = filename.lower()
-        
-        # Bepaal provincie
-        assigned = False
-        for province, data in PROVINCES.items():
-            for place in data['places']:
-                if place in filename_lower:
-                    # Extraheer kastelnaam
-                    castle_name = filename.replace('.html', '').replace('-', ' ').title()
-                    castle_name = re.sub(r'^(Kasteel|Chateau|Citadel|Burcht|Hof|Het|De|Sint)\s+', '', castle_name)
-                    
-                    province_castles[province].append({
-                        'name': castle_name,
-                        'file': filename,
-                        'place': place
-                    })
-                    assigned = True
-                    break
-            if assigned:
-                break
+    own_conn = conn is None
+    if own_conn:
+        conn = open_catalog()
+    try:
+        for province in PROVINCES.keys():
+            for castle in get_castles_by_province(conn, province):
+                filename = castle['file']
+                
+                # Extraheer kastelnaam
+                castle_name = filename.replace('.html', '').replace('-', ' ').title()
+                castle_name = re.sub(r'^(Kasteel|Chateau|Citadel|Burcht|Hof|Het|De|Sint)\s+', '', castle_name)
+                
+                province_castles[province].append({
+                    'name': castle_name,
+                    'file': filename,
+                    'place': castle['place']
+                })
+    finally:
+        if own_conn:
+            conn.close()
     
     return province_castles
 
+# Navigatie in de header van de provinciepagina's: (href, label)
+NAV_LINKS = (
+    ('./provinces.html', 'Kastelen per provincie'),
+    ('./index.html#blog', 'Blog'),
+)
+
+# Populaire kastelen in de footer van het overzicht: (bestand, naam)
+POPULAR_CASTLES = (
+    ('kasteel-van-freyr-freyr.html', 'Kasteel van Freÿr'),
+    ('kasteel-van-durbuy-durbuy.html', 'Kasteel van Durbuy'),
+    ('citadel-van-hoei-hoei.html', 'Citadel van Hoei'),
+)
+
+@fragment('header')
+def create_site_header(nav_links=NAV_LINKS):
+    """Header met de navigatie; één keer opgebouwd per navigatie"""
+    links = ''.join(f'\n        <a href="{href}">{label}</a>' for href, label in nav_links)
+    return f'''  <header class="site-header">
+    <div class="container header-inner">
+      <a class="brand" href="./">kastelenbelgie.be</a>
+      <nav class="nav">{links}
+      </nav>
+    </div>
+  </header>'''
+
+def create_site_footer(province_id=None):
+    """
+    Footer van het provincie-overzicht (province_id None: populaire kastelen)
+    of van een provinciepagina (links naar vier andere provincies).
+    """
+    if province_id is None:
+        return render_site_footer('Populaire kastelen', POPULAR_CASTLES)
+    
+    # Voeg links naar andere provincies toe
+    other_provinces = tuple(
+        (f'{other_id}.html', other_data['name'])
+        for other_id, other_data in PROVINCES.items() if other_id != province_id
+    )[:4]
+    return render_site_footer('Andere provincies', other_provinces)
+
+@fragment('footer')
+def render_site_footer(title, links):
+    """
+    Footer met één kolom links (href, label) tussen de vaste kolommen. Bewaard per
+    kolom, niet per provincie: de provincies buiten de eerste vier delen dezelfde footer.
+    """
+    items = ''.join(f'\n          <li><a href="{href}">{label}</a></li>' for href, label in links)
+    return f'''  <footer class="site-footer">
+    <div class="container footer-grid">
+      <div class="footer-col">
+        <h4>Contact</h4>
+        <p><a href="./index.html#">Contacteer ons</a></p>
+      </div>
+      <div class="footer-col">
+        <h4>{title}</h4>
+        <ul>{items}
+        </ul>
+      </div>
+      <div class="footer-col">
+        <h4>Handige links</h4>
+        <ul>
+          <li><a href="#">Privacy Policy</a></li>
+          <li><a href="#">Facebook</a></li>
+          <li><a href="#">Twitter</a></li>
+        </ul>
+      </div>
+    </div>
+    <div class="container footer-bottom">
+      <p>© 2024 kastelenbelgie.be. Alle rechten voorbehouden</p>
+    </div>
+  </footer>'''
+
 def create_provinces_overview():
     """Creëer de hoofdpagina met overzicht van alle provincies"""
-    html = '''<!doctype html>
+    html = f'''<!doctype html>
 <html lang="nl">
 <head>
   <meta charset="utf-8">
@@ -117,15 +176,7 @@ def create_provinces_overview():
   <link rel="stylesheet" href="./css/style.css">
 </head>
 <body>
-  <header class="site-header">
-    <div class="container header-inner">
-      <a class="brand" href="./">kastelenbelgie.be</a>
-      <nav class="nav">
-        <a href="./provinces.html">Kastelen per provincie</a>
-        <a href="./index.html#blog">Blog</a>
-      </nav>
-    </div>
-  </header>
+{create_site_header()}
   
   <main>
     <section class="hero">
@@ -154,39 +205,13 @@ def create_provinces_overview():
             <span class="province-link">Ontdek kastelen →</span>
           </a>'''
     
-    html += '''
+    html += f'''
         </div>
       </div>
     </section>
   </main>
-  
-  <footer class="site-footer">
-    <div class="container footer-grid">
-      <div class="footer-col">
-        <h4>Contact</h4>
-        <p><a href="./index.html#">Contacteer ons</a></p>
-      </div>
-      <div class="footer-col">
-        <h4>Populaire kastelen</h4>
-        <ul>
-          <li><a href="kasteel-van-freyr-freyr.html">Kasteel van Freÿr</a></li>
-          <li><a href="kasteel-van-durbuy-durbuy.html">Kasteel van Durbuy</a></li>
-          <li><a href="citadel-van-hoei-hoei.html">Citadel van Hoei</a></li>
-        </ul>
-      </div>
-      <div class="footer-col">
-        <h4>Handige links</h4>
-        <ul>
-          <li><a href="#">Privacy Policy</a></li>
-          <li><a href="#">Facebook</a></li>
-          <li><a href="#">Twitter</a></li>
-        </ul>
-      </div>
-    </div>
-    <div class="container footer-bottom">
-      <p>© 2024 kastelenbelgie.be. Alle rechten voorbehouden</p>
-    </div>
-  </footer>
+
+{create_site_footer()}
 </body>
 </html>'''
     
@@ -206,15 +231,7 @@ def create_province_page(province_id, province_data, castles):
   <link rel="stylesheet" href="./css/style.css">
 </head>
 <body>
-  <header class="site-header">
-    <div class="container header-inner">
-      <a class="brand" href="./">kastelenbelgie.be</a>
-      <nav class="nav">
-        <a href="./provinces.html">Kastelen per provincie</a>
-        <a href="./index.html#blog">Blog</a>
-      </nav>
-    </div>
-  </header>
+{create_site_header()}
   
   <main>
     <section class="hero">
@@ -249,45 +266,15 @@ def create_province_page(province_id, province_data, castles):
       </div>
     </section>
   </main>
-  
-  <footer class="site-footer">
-    <div class="container footer-grid">
-      <div class="footer-col">
-        <h4>Contact</h4>
-        <p><a href="./index.html#">Contacteer ons</a></p>
-      </div>
-      <div class="footer-col">
-        <h4>Andere provincies</h4>
-        <ul>'''
-    
-    # Voeg links naar andere provincies toe
-    other_provinces = [(k, v) for k, v in PROVINCES.items() if k != province_id][:4]
-    for other_id, other_data in other_provinces:
-        html += f'          <li><a href="{other_id}.html">{other_data["name"]}</a></li>\n'
-    
-    html += '''        </ul>
-      </div>
-      <div class="footer-col">
-        <h4>Handige links</h4>
-        <ul>
-          <li><a href="#">Privacy Policy</a></li>
-          <li><a href="#">Facebook</a></li>
-          <li><a href="#">Twitter</a></li>
-        </ul>
-      </div>
-    </div>
-    <div class="container footer-bottom">
-      <p>© 2024 kastelenbelgie.be. Alle rechten voorbehouden</p>
-    </div>
-  </footer>
+
+{create_site_footer(province_id)}
 </body>
 </html>'''
     
     return html
 
-def add_province_css():
-    """Voeg CSS toe voor provincie-paginas"""
-    css_code = '''
+# CSS van de provinciepagina's (ook geregistreerd in css_bundle.py)
+PROVINCE_CSS = '''
 /* Province Pages Styles */
 .province-grid {
   display: grid;
@@ -432,7 +419,9 @@ def add_province_css():
     grid-template-columns: 1fr;
   }
 }'''
-    
+
+def add_province_css():
+    """Voeg CSS toe voor provincie-paginas"""
     css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
     
     try:
@@ -441,11 +430,11 @@ def add_province_css():
         
         if '/* Province Pages Styles */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(css_code)
+                f.write(PROVINCE_CSS)
             return True
         
         return False
-        
+    
     except Exception as e:
         print(f"Fout bij CSS toevoegen: {e}")
         return False
@@ -502,6 +491,7 @@ def main():
     print(f"Hoofdpagina aangemaakt: provinces.html")
     print(f"Provinciepaginas aangemaakt: {created_pages}")
     print(f"Totaal kastelen georganiseerd: {total_castles}")
+    print_fragment_stats()
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,10 @@ Script pour créer des textes d'introduction uniques pour chaque château belge
 
 import os
 import re
-import glob
+
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import replace_section
 
 # Base de données des informations uniques pour chaque château
 CASTLE_UNIQUE_INFO = {
@@ -107,24 +110,33 @@ def create_unique_intro(filename):
         'paragraphs': template['paragraphs']
     }
 
+def create_intro_html(paragraphs):
+    """HTML van het intro-blok (de inspringing van de eerste regel blijft staan)"""
+    intro_html = '<div class="intro">\n'
+    for paragraph in paragraphs:
+        intro_html += f'      <p>\n        {paragraph}\n      </p>\n'
+    intro_html += '    </div>'
+    return intro_html
+
+def update_intro_content(content, filename):
+    """
+    Vervang de introductietekst in de HTML-inhoud van een kasteelpagina.
+    Enkel de tekst zelf: de links komen van add_intro_links.
+    """
+    intro_html = create_intro_html(create_unique_intro(filename)['paragraphs'])
+    
+    # Vervang de bestaande intro sectie (ook als die geneste divs bevat)
+    return replace_section(content, 'intro', intro_html)
+
 def update_intro_text(file_path):
     """Update de introductietekst in een HTML-bestand"""
     try:
         filename = os.path.basename(file_path)
-        intro_data = create_unique_intro(filename)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Bouw de nieuwe intro HTML
-        intro_html = '    <div class="intro">\n'
-        for paragraph in intro_data['paragraphs']:
-            intro_html += f'      <p>\n        {paragraph}\n      </p>\n'
-        intro_html += '    </div>'
-        
-        # Vervang de bestaande intro sectie
-        pattern = r'<div class="intro">.*?</div>'
-        new_content = re.sub(pattern, intro_html, content, flags=re.DOTALL)
+        new_content = update_intro_content(content, filename)
         
         # Controleer of er wijzigingen zijn
         if new_content != content:
@@ -143,19 +155,7 @@ def main():
     print("=== CREATIE VAN UNIEKE INTRODUCTIETEKSTEN ===")
     
     # Vind alle kasteelbestanden
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Gevonden kasteelbestanden: {len(castle_files)}")
     
@@ -187,14 +187,11 @@ def main():
     # Ga door met alle bestanden
     print(f"\nDoorgaan met alle {len(castle_files)} bestanden...")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        
-        # Skip de al behandelde testbestanden
-        if filename in [f.split('/')[-1] for f in test_files]:
-            continue
-            
-        if update_intro_text(file_path):
+    # Skip de al behandelde testbestanden
+    remaining_files = [f for f in castle_files if f not in test_files]
+    
+    for updated in map_pages(update_intro_text, remaining_files):
+        if updated:
             updated_count += 1
             if updated_count % 50 == 0:
                 print(f"  Voortgang: {updated_count} bestanden bijgewerkt...")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kritieke CSS per paginatype.
+Per sjabloon (soort pagina uit page_discovery plus de gelinkte stylesheet: kasteel,
+provincie, blog, overzicht, ...) worden de regels van de bundel gekozen die de
+markup boven de vouw nodig heeft: de header en de eerste sectie van elke pagina
+van dat type. Die subset komt inline in de <head>; de volledige stylesheet wordt
+niet-blokkerend geladen (preload, met een <noscript>-terugval).
+De subset wordt één keer per sjabloon berekend, niet per pagina.
+"""
+
+import re
+
+from page_discovery import classify_page
+from css_bundle import linked_stylesheets, collect_used_names, purge_rules, serialize
+
+# Markup boven de vouw: tot de tweede <section>, maar minstens zoveel tekens van de body
+FOLD_MIN_CHARS = 3000
+
+BODY_PATTERN = re.compile(r'<body\b', re.IGNORECASE)
+SECTION_PATTERN = re.compile(r'<section\b', re.IGNORECASE)
+
+# Blokkerende link naar een gebundelde stylesheet
+STYLESHEET_TAG_PATTERN = re.compile(r'<link rel="stylesheet" href="((?:\./)?css/[\w-]+\.[0-9a-f]+\.css)">')
+
+# In-procescache: (bundel, classes en id's boven de vouw) -> kritieke CSS
+_CRITICAL_CSS = {}
+
+def fold_markup(content):
+    """De markup boven de vouw: <head> en de body tot de tweede <section>"""
+    match = BODY_PATTERN.search(content)
+    body = match.start() if match else 0
+    
+    sections = [section.start() for section in SECTION_PATTERN.finditer(content, body)]
+    end = sections[1] if len(sections) > 1 else len(content)
+    return content[:max(end, body + FOLD_MIN_CHARS)]
+
+def page_template(filename, content):
+    """Sjabloon van een pagina: (soort, gelinkte stylesheet), bv. ('castle', 'style.css')"""
+    sheets = linked_stylesheets(content)
+    return classify_page(filename), sheets[0] if sheets else None
+
+def fold_names(contents):
+    """Classes en id's boven de vouw van een reeks pagina's van één sjabloon"""
+    return frozenset(collect_used_names([fold_markup(content) for content in contents], js_dir=None))
+
+def critical_rules(nodes, used):
+    """Minimale CSS voor de gegeven classes en id's (plus de regels zonder class of id)"""
+    return serialize(purge_rules(nodes, used)[0])
+
+def build_critical_css(pages, stylesheets):
+    """
+    Kritieke CSS per sjabloon (pages: bestandsnaam -> inhoud, stylesheets: resultaat
+    van css_bundle.build_stylesheets). Retourneert sjabloon -> CSS.
+    """
+    templates = {}
+    for filename, content in pages.items():
+        template = page_template(filename, content)
+        if template[1] in stylesheets:
+            templates.setdefault(template, []).append(content)
+    
+    result = {}
+    for template, contents in sorted(templates.items()):
+        used = fold_names(contents)
+        key = (stylesheets[template[1]]['filename'], used)
+        if key not in _CRITICAL_CSS:
+            _CRITICAL_CSS[key] = critical_rules(stylesheets[template[1]]['nodes'], used)
+        result[template] = _CRITICAL_CSS[key]
+    
+    return result
+
+def inline_critical_css(content, css):
+    """
+    Zet de kritieke CSS inline in de <head> en laad de gebundelde stylesheet
+    niet-blokkerend. Pagina's zonder gebundelde stylesheet blijven ongewijzigd.
+    """
+    def replace(match):
+        href = match.group(1)
+        return (
+            f'<style>{css}</style>\n'
+            f'  <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'  <noscript><link rel="stylesheet" href="{href}"></noscript>'
+        )
+    
+    return STYLESHEET_TAG_PATTERN.sub(replace, content, count=1)
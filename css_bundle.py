@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CSS-bundels voor de gepubliceerde site.
+Verschillende scripts voegen blokken met regels toe aan css/style.css (elk blok
+herkenbaar aan zijn markeercommentaar); de blokken staan hier in één register.
+Per stylesheet worden de bron en de geregistreerde blokken die er nog niet in
+staan samengevoegd, ontdubbeld (een declaratie die verderop voor dezelfde
+selector opnieuw gezet wordt, verdwijnt), gezuiverd van selectors die geen enkele
+pagina gebruikt (op basis van de classes en id's in de HTML en de JavaScript),
+geminificeerd en weggeschreven als css/<naam>.<hash>.css.
+"""
+
+import os
+import re
+import glob
+import hashlib
+
+import add_faq_sections
+import add_breadcrumbs
+import add_castle_images
+import create_province_pages
+import update_province_pages
+import improve_titles_and_provinces
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+CSS_DIR = os.path.join(SITE_ROOT, 'css')
+JS_DIR = os.path.join(SITE_ROOT, 'js')
+
+# Lengte van de hash in de bestandsnaam
+HASH_LENGTH = 10
+
+# Register: blokken die scripts aan een stylesheet toevoegen, in volgorde
+CSS_BLOCKS = {
+    'style.css': [
+        add_faq_sections.FAQ_CSS,
+        create_province_pages.PROVINCE_CSS,
+        add_breadcrumbs.BREADCRUMB_CSS,
+        add_castle_images.IMAGE_CSS,
+        update_province_pages.PROVINCE_INTRO_CSS,
+        improve_titles_and_provinces.PROVINCE_ALIGNMENT_CSS,
+    ],
+    'style-new.css': [],
+}
+
+# At-rules met geneste regels; andere at-rules (@font-face, @keyframes, ...) blijven ongemoeid
+NESTED_AT_RULES = ('@media', '@supports')
+
+# Strings blijven staan, commentaar verdwijnt
+COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL)
+STRING_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+# Markeercommentaar aan het begin van een geregistreerd blok
+MARKER_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+# Classes en id's in een selector (na het weglaten van [attributen] en (argumenten))
+SELECTOR_NAME_PATTERN = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)')
+SELECTOR_ARGUMENT_PATTERN = re.compile(r'\[[^\[\]]*\]|\([^()]*\)')
+
+# Gebruikte classes en id's in HTML en in JavaScript-strings
+ATTRIBUTE_PATTERN = re.compile(r'\b(?:class|id)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+SCRIPT_PATTERN = re.compile(r'<script\b[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+JS_STRING_PATTERN = re.compile(r'"([^"\n]*)"|\'([^\'\n]*)\'|`([^`]*)`')
+NAME_PATTERN = re.compile(r'-?[_a-zA-Z][\w-]*')
+
+# Stylesheet-links in de pagina's: href="./css/style.css", href="css/style-new.css", ...
+STYLESHEET_LINK_PATTERN = re.compile(r'href="(?:\./)?css/([\w-]+?)(?:\.[0-9a-f]{%d})?\.css"' % HASH_LENGTH)
+
+def strip_comments(css):
+    """CSS zonder commentaar (strings blijven ongewijzigd)"""
+    return COMMENT_PATTERN.sub(lambda match: match.group(1) or '', css)
+
+def skip_string(text, pos):
+    """Positie na de string die op pos begint"""
+    match = STRING_PATTERN.match(text, pos)
+    return match.end() if match else pos + 1
+
+def find_block_end(text, pos):
+    """Positie van de accolade die het blok vanaf pos sluit"""
+    depth = 1
+    while pos < len(text):
+        char = text[pos]
+        if char in '"\'':
+            pos = skip_string(text, pos)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return pos
+        pos += 1
+    return pos
+
+def split_outside(text, separator):
+    """Splits op separator buiten strings en haakjes"""
+    parts = []
+    depth = 0
+    start = 0
+    pos = 0
+    while pos < len(text):
+        char = text[pos]
+        if char in '"\'':
+            pos = skip_string(text, pos)
+            continue
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:pos])
+            start = pos + 1
+        pos += 1
+    parts.append(text[start:])
+    return parts
+
+def minify_value(value):
+    """Witruimte in een waarde inkorten, behalve in strings"""
+    parts = STRING_PATTERN.split(value)
+    for i in range(0, len(parts), 2):
+        text = ' '.join(parts[i].split())
+        parts[i] = re.sub(r'\s*,\s*', ',', text)
+    return ''.join(parts).strip()
+
+def minify_selector(selector):
+    """Witruimte in een selector inkorten (rond combinators en komma's)"""
+    return re.sub(r'\s*([>+~,])\s*', r'\1', ' '.join(selector.split()))
+
+def minify_prelude(prelude):
+    """Witruimte in de voorwaarde van een at-rule inkorten: '@media (max-width: 768px)'"""
+    prelude = ' '.join(prelude.split())
+    return re.sub(r'\(\s*([\w-]+)\s*:\s*', r'(\1:', prelude).replace(' )', ')')
+
+def parse_declarations(body):
+    """Declaraties van een regel: lijst (eigenschap, waarde, important)"""
+    declarations = []
+    for part in split_outside(body, ';'):
+        if ':' not in part:
+            continue
+        prop, value = part.split(':', 1)
+        prop = prop.strip().lower()
+        value = minify_value(value)
+        important = bool(re.search(r'!\s*important$', value, re.IGNORECASE))
+        if important:
+            value = re.sub(r'\s*!\s*important$', '', value, flags=re.IGNORECASE)
+        if prop and value:
+            declarations.append((prop, value, important))
+    return declarations
+
+def parse_rules(text, pos=0):
+    """
+    Regels vanaf pos tot de sluitende accolade (of het einde): lijst knopen
+    {'type': 'rule', 'selectors', 'declarations'}, {'type': 'at', 'prelude', 'rules'},
+    {'type': 'raw', 'prelude', 'body'} of {'type': 'statement', 'text'}.
+    Retourneert (knopen, positie na het blok).
+    """
+    nodes = []
+    start = pos
+    while pos < len(text):
+        char = text[pos]
+        if char in '"\'':
+            pos = skip_string(text, pos)
+            continue
+        
+        if char == '{':
+            prelude = ' '.join(text[start:pos].split())
+            if prelude.split(' ', 1)[0].lower() in NESTED_AT_RULES:
+                children, pos = parse_rules(text, pos + 1)
+                nodes.append({'type': 'at', 'prelude': minify_prelude(prelude), 'rules': children})
+            else:
+                end = find_block_end(text, pos + 1)
+                body = text[pos + 1:end]
+                if prelude.startswith('@'):
+                    nodes.append({'type': 'raw', 'prelude': minify_prelude(prelude), 'body': minify_value(body)})
+                else:
+                    selectors = tuple(minify_selector(selector) for selector in split_outside(prelude, ','))
+                    nodes.append({'type': 'rule', 'selectors': selectors, 'declarations': parse_declarations(body)})
+                pos = end + 1
+            start = pos
+            continue
+        
+        if char == '}':
+            return nodes, pos + 1
+        
+        if char == ';':
+            statement = ' '.join(text[start:pos].split())
+            if statement:
+                nodes.append({'type': 'statement', 'text': statement})
+            start = pos + 1
+        pos += 1
+    
+    return nodes, pos
+
+def parse_css(css):
+    """Parseer een stylesheet tot een lijst knopen (zie parse_rules)"""
+    return parse_rules(strip_comments(css))[0]
+
+def block_marker(block):
+    """Markeercommentaar van een geregistreerd blok, bv. '/* FAQ Section Styles */'"""
+    match = MARKER_PATTERN.search(block)
+    return match.group(0) if match else None
+
+def collect_source(name, css_dir=CSS_DIR):
+    """Bron van een stylesheet plus de geregistreerde blokken waarvan de marker er nog niet in staat"""
+    with open(os.path.join(css_dir, name), 'r', encoding='utf-8') as f:
+        css = f.read()
+    
+    for block in CSS_BLOCKS.get(name, ()):
+        marker = block_marker(block)
+        if marker is None or marker not in css:
+            css += block
+    
+    return css
+
+def walk_rules(nodes, context=()):
+    """Alle gewone regels met hun context (de at-rules eromheen), in bronvolgorde"""
+    for node in nodes:
+        if node['type'] == 'rule':
+            yield context, node
+        elif node['type'] == 'at':
+            yield from walk_rules(node['rules'], context + (node['prelude'],))
+
+def dedupe_rules(nodes):
+    """
+    Verwijder declaraties die verderop in dezelfde context voor dezelfde selectors
+    opnieuw gezet worden (die latere declaratie wint toch), en exacte dubbels binnen
+    een regel. Retourneert het aantal verwijderde declaraties; lege regels vallen later weg.
+    """
+    # (context, selectors) -> {eigenschap: True als een latere declaratie !important is}
+    later = {}
+    removed = 0
+    
+    for context, rule in reversed(list(walk_rules(nodes))):
+        seen = later.setdefault((context, rule['selectors']), {})
+        kept = []
+        own = set()
+        
+        for prop, value, important in reversed(rule['declarations']):
+            if (prop, value, important) in own or (prop in seen and (seen[prop] or not important)):
+                removed += 1
+                continue
+            own.add((prop, value, important))
+            kept.append((prop, value, important))
+        
+        for prop, value, important in kept:
+            seen[prop] = seen.get(prop, False) or important
+        rule['declarations'] = kept[::-1]
+    
+    return removed
+
+def selector_names(selector):
+    """Classes en id's die een element moet hebben om de selector te matchen"""
+    previous = None
+    while previous != selector:
+        previous = selector
+        selector = SELECTOR_ARGUMENT_PATTERN.sub('', selector)
+    return SELECTOR_NAME_PATTERN.findall(selector)
+
+def collect_used_names(html_contents, js_dir=JS_DIR):
+    """
+    Classes en id's die de site gebruikt: de class- en id-attributen van de pagina's,
+    plus elk woord in een string van een script (classList.add('open'), innerHTML, ...).
+    Met js_dir=None tellen enkel de inline scripts van de pagina's mee.
+    """
+    used = set()
+    scripts = []
+    
+    for content in html_contents:
+        for match in ATTRIBUTE_PATTERN.finditer(content):
+            used.update((match.group(1) or match.group(2) or '').split())
+        scripts.extend(SCRIPT_PATTERN.findall(content))
+    
+    for js_path in glob.glob(os.path.join(js_dir, '*.js')) if js_dir else ():
+        with open(js_path, 'r', encoding='utf-8') as f:
+            scripts.append(f.read())
+    
+    for script in scripts:
+        for match in JS_STRING_PATTERN.finditer(script):
+            used.update(NAME_PATTERN.findall(match.group(1) or match.group(2) or match.group(3) or ''))
+    
+    return used
+
+def purge_rules(nodes, used):
+    """
+    Verwijder selectors met een class of id die geen pagina gebruikt, en daarna lege
+    regels en lege at-rules. Retourneert (knopen, aantal verwijderde selectors).
+    """
+    purged = 0
+    result = []
+    
+    for node in nodes:
+        if node['type'] == 'rule':
+            selectors = tuple(
+                selector for selector in node['selectors']
+                if all(name in used for kind, name in selector_names(selector))
+            )
+            purged += len(node['selectors']) - len(selectors)
+            if selectors and node['declarations']:
+                result.append(dict(node, selectors=selectors))
+        elif node['type'] == 'at':
+            rules, count = purge_rules(node['rules'], used)
+            purged += count
+            if rules:
+                result.append(dict(node, rules=rules))
+        else:
+            result.append(node)
+    
+    return result, purged
+
+def serialize(nodes):
+    """Geminificeerde CSS van een lijst knopen"""
+    parts = []
+    for node in nodes:
+        if node['type'] == 'rule':
+            declarations = ';'.join(
+                f"{prop}:{value}{'!important' if important else ''}"
+                for prop, value, important in node['declarations']
+            )
+            parts.append(f"{','.join(node['selectors'])}{{{declarations}}}")
+        elif node['type'] == 'at':
+            parts.append(f"{node['prelude']}{{{serialize(node['rules'])}}}")
+        elif node['type'] == 'raw':
+            parts.append(f"{node['prelude']}{{{node['body']}}}")
+        else:
+            parts.append(f"{node['text']};")
+    return ''.join(parts)
+
+def count_rules(nodes):
+    """Aantal gewone regels, ook binnen at-rules"""
+    return sum(1 for rule in walk_rules(nodes))
+
+def build_stylesheet(name, used, output_dir, css_dir=CSS_DIR):
+    """
+    Bouw de bundel van één stylesheet in output_dir als <naam>.<hash>.css en ruim
+    oudere versies op. Retourneert een dict met 'filename', de geparste regels
+    ('nodes') en de statistieken.
+    """
+    source = collect_source(name, css_dir)
+    nodes = parse_css(source)
+    rules_before = count_rules(nodes)
+    
+    deduped = dedupe_rules(nodes)
+    nodes, purged = purge_rules(nodes, used)
+    css = serialize(nodes)
+    
+    stem = os.path.splitext(name)[0]
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    filename = f'{stem}.{digest}.css'
+    output_path = os.path.join(output_dir, filename)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    if not os.path.exists(output_path):
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(css)
+        os.replace(tmp_path, output_path)
+    
+    for old_path in glob.glob(os.path.join(output_dir, f'{stem}.*.css')):
+        if os.path.basename(old_path) != filename:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+    
+    return {
+        'filename': filename,
+        'nodes': nodes,
+        'source_bytes': len(source.encode('utf-8')),
+        'bytes': len(css.encode('utf-8')),
+        'rules_before': rules_before,
+        'rules': count_rules(nodes),
+        'deduped_declarations': deduped,
+        'purged_selectors': purged,
+    }
+
+def linked_stylesheets(content):
+    """Namen van de lokale stylesheets die een pagina linkt, bv. ['style.css']"""
+    return [f'{stem}.css' for stem in STYLESHEET_LINK_PATTERN.findall(content)]
+
+def build_stylesheets(pages, output_dir, css_dir=CSS_DIR, js_dir=JS_DIR):
+    """
+    Bouw een bundel voor elke stylesheet die een pagina linkt (pages: pad -> inhoud).
+    Elke bundel wordt gezuiverd tegen de pagina's die hem linken.
+    Retourneert naam -> statistieken (met 'filename' en 'pages').
+    """
+    corpora = {}
+    for content in pages.values():
+        for name in linked_stylesheets(content):
+            corpora.setdefault(name, []).append(content)
+    
+    results = {}
+    for name in sorted(corpora):
+        if not os.path.exists(os.path.join(css_dir, name)):
+            continue
+        used = collect_used_names(corpora[name], js_dir)
+        results[name] = build_stylesheet(name, used, output_dir, css_dir)
+        results[name]['pages'] = len(corpora[name])
+    
+    return results
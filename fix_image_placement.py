@@ -8,7 +8,8 @@ Les images doivent être à l'intérieur de la div detail-media, pas après
 
 import os
 import re
-import glob
+
+from page_discovery import find_castle_files
 
 def fix_image_placement(file_path):
     """Corriger le placement de l'image dans le HTML"""
@@ -44,19 +45,7 @@ def main():
     print("=== CORRECTION DU PLACEMENT DES IMAGES ===")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Pages de châteaux trouvées: {len(castle_files)}")
     
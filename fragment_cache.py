@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gedeelde cache voor HTML-fragmenten die op veel pagina's identiek zijn:
+header, footer, navigatie en de FAQ-blokken per kasteeltype.
+Een fragment wordt per build één keer opgebouwd, bewaard onder zijn naam en de
+invoer waarvan het afhangt (kasteeltype, provincie, navigatie...), en daarna
+als hetzelfde string-object hergebruikt. Per fragment worden hits en misses geteld.
+"""
+
+import functools
+
+# In-procescache: (fragmentnaam, sleutel) -> HTML
+_FRAGMENTS = {}
+
+# Tellers per fragmentnaam: {'hits': n, 'misses': n}
+_STATS = {}
+
+def get_fragment(name, key, build):
+    """
+    Fragment uit de cache, of opgebouwd met build() en bewaard.
+    key moet hashbaar zijn en alles bevatten waarvan het fragment afhangt.
+    """
+    stats = _STATS.setdefault(name, {'hits': 0, 'misses': 0})
+    cache_key = (name, key)
+    
+    html = _FRAGMENTS.get(cache_key)
+    if html is not None:
+        stats['hits'] += 1
+        return html
+    
+    stats['misses'] += 1
+    html = build()
+    _FRAGMENTS[cache_key] = html
+    return html
+
+def fragment(name):
+    """Decorator: onthoud het resultaat van een fragmentfunctie per combinatie van (hashbare) argumenten"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return get_fragment(name, key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def fragment_stats():
+    """Hits en misses per fragment, plus het totaal onder 'totaal'"""
+    stats = {name: dict(counts) for name, counts in sorted(_STATS.items())}
+    stats['totaal'] = {
+        'hits': sum(counts['hits'] for counts in _STATS.values()),
+        'misses': sum(counts['misses'] for counts in _STATS.values())
+    }
+    return stats
+
+def clear_fragments():
+    """Leeg de cache en zet de tellers terug op nul"""
+    _FRAGMENTS.clear()
+    _STATS.clear()
+
+def print_fragment_stats():
+    """Druk de tellers af, één regel per fragment"""
+    print("Fragmentcache:")
+    for name, counts in fragment_stats().items():
+        lookups = counts['hits'] + counts['misses']
+        ratio = counts['hits'] / lookups * 100 if lookups else 0
+        print(f"  {name}: {counts['hits']} hits, {counts['misses']} misses ({ratio:.0f}% hits)")
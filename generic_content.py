@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Score voor generieke introteksten.
+De trefwoordlijsten per taal (nl/fr/en) worden samen omgezet naar één reguliere
+expressie in de vorm van een prefixboom (trie), zodat elke tekst in één doorgang
+gescand wordt in plaats van één keer per trefwoord, en op elke positie enkel de
+tak van de eerste letter geprobeerd wordt. Per tekst worden lengte, aantal treffers, trefwoorddichtheid en
+sjabloonoverlap (het aandeel shingles dat in veel andere teksten terugkomt)
+berekend.
+Het rapport rangschikt de teksten van meest naar minst generiek.
+"""
+
+import re
+from collections import Counter
+
+from near_duplicates import get_shingles
+
+# Generieke formuleringen per taal, in kleine letters
+GENERIC_KEYWORDS = {
+    'nl': [
+        'een prachtig voorbeeld', 'de kastelen in belgië', 'belgisch erfgoed', 'belgische erfgoedketen',
+        'rijke geschiedenis', 'door de eeuwen heen', 'getuigt van', 'weerspiegelt', 'boeiend',
+        'waardevol voorbeeld', 'uniek', 'typisch voorbeeld', 'indrukwekkend', 'de moeite waard',
+        'adellijke families', 'architecturale', 'verfijnde smaak', 'toenmalige adel'
+    ],
+    'fr': [
+        'ce château', 'cette forteresse', 'cet édifice', 'situé en belgique', 'patrimoine belge',
+        'architecture remarquable', 'histoire fascinante', 'témoigne du passé', 'exemple typique'
+    ],
+    'en': [
+        'this castle', 'rich history', 'stunning example', 'over the centuries', 'must-see',
+        'belgian heritage', 'remarkable architecture', 'steeped in history'
+    ],
+}
+
+# Een shingle is sjabloontekst als hij in minstens dit aandeel van de teksten voorkomt
+TEMPLATE_SHARE = 0.05
+
+# Grenzen waarboven een tekst als generiek gemarkeerd wordt
+MIN_GENERIC_HITS = 2
+MIN_TEXT_LENGTH = 100
+MAX_TEMPLATE_OVERLAP = 0.5
+
+# In-procescache: trefwoorden -> (patroon, trefwoord -> taal)
+_COMPILED_KEYWORDS = {}
+
+def trie_pattern(words):
+    """
+    Reguliere expressie voor een lijst woorden als prefixboom, bv. 'ce(?:t(?:te)?)?' voor ce, cet en cette.
+    Een woord dat een prefix van een ander is wordt optioneel, zodat het langste voorgaat.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 and not end else f"(?:{'|'.join(branches)})"
+        return body + '?' if end else body
+    
+    return build(trie)
+
+def compile_keywords(keywords=None):
+    """
+    Eén patroon voor alle trefwoorden van alle talen, als prefixboom.
+    Retourneert (patroon, trefwoord -> taal).
+    """
+    if keywords is None:
+        keywords = GENERIC_KEYWORDS
+    
+    key = tuple((language, tuple(words)) for language, words in sorted(keywords.items()))
+    if key not in _COMPILED_KEYWORDS:
+        languages = {}
+        for language, words in keywords.items():
+            for word in words:
+                languages.setdefault(word.lower(), language)
+        
+        pattern = re.compile(rf'\b(?:{trie_pattern(languages)})(?!\w)')
+        _COMPILED_KEYWORDS[key] = (pattern, languages)
+    
+    return _COMPILED_KEYWORDS[key]
+
+def score_text(text, compiled):
+    """Treffers van één tekst: (aantal, aantal per taal, gevonden trefwoorden)"""
+    pattern, languages = compiled
+    matches = pattern.findall(text.lower())
+    per_language = Counter(languages[match] for match in matches)
+    return len(matches), per_language, sorted(set(matches))
+
+def template_overlap(shingle_sets):
+    """Per tekst het aandeel shingles dat in minstens TEMPLATE_SHARE van de teksten voorkomt"""
+    document_frequency = Counter()
+    for shingles in shingle_sets:
+        document_frequency.update(shingles)
+    
+    minimum = max(2, int(len(shingle_sets) * TEMPLATE_SHARE))
+    return [
+        sum(1 for shingle in shingles if document_frequency[shingle] >= minimum) / len(shingles) if shingles else 0.0
+        for shingles in shingle_sets
+    ]
+
+def batch_statistics(texts, keywords=None):
+    """
+    Statistieken voor een lijst teksten, per kolom: length, words, hits, density,
+    overlap, plus languages en matches per tekst.
+    """
+    compiled = compile_keywords(keywords)
+    
+    lengths = []
+    word_counts = []
+    hits = []
+    languages = []
+    matches = []
+    shingle_sets = []
+    
+    # Identieke teksten (kopieën van een sjabloon) worden één keer gescand
+    scanned = {}
+    
+    for text in texts:
+        if text not in scanned:
+            scanned[text] = score_text(text, compiled) + (len(text.split()), get_shingles(text))
+        count, per_language, found, words, shingles = scanned[text]
+        
+        lengths.append(len(text))
+        word_counts.append(words)
+        hits.append(count)
+        languages.append(dict(per_language))
+        matches.append(found)
+        shingle_sets.append(shingles)
+    
+    return {
+        'length': lengths,
+        'words': word_counts,
+        'hits': hits,
+        'density': [count / max(words, 1) for count, words in zip(hits, word_counts)],
+        'overlap': template_overlap(shingle_sets),
+        'languages': languages,
+        'matches': matches,
+    }
+
+def rank_generic_texts(texts, keywords=None):
+    """
+    Rangschik teksten (dict sleutel -> tekst) van meest naar minst generiek.
+    Retourneert een lijst dicts met de statistieken per tekst en 'generic' als de
+    tekst te kort is, te veel generieke trefwoorden of te veel sjabloontekst bevat.
+    """
+    keys = list(texts)
+    stats = batch_statistics([texts[key] for key in keys], keywords)
+    
+    generic = [
+        hits >= MIN_GENERIC_HITS or length < MIN_TEXT_LENGTH or overlap >= MAX_TEMPLATE_OVERLAP
+        for hits, length, overlap in zip(stats['hits'], stats['length'], stats['overlap'])
+    ]
+    order = sorted(range(len(keys)), key=lambda i: (not generic[i], -stats['overlap'][i], -stats['density'][i]))
+    
+    return [
+        {
+            'key': keys[i],
+            'generic': generic[i],
+            'length': stats['length'][i],
+            'hits': stats['hits'][i],
+            'density': round(stats['density'][i], 4),
+            'overlap': round(stats['overlap'][i], 3),
+            'languages': stats['languages'][i],
+            'matches': stats['matches'][i],
+        }
+        for i in order
+    ]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Coördinaten van de kastelen en een k-d-boom om kastelen in de buurt te vinden.
+data/gazetteer.tsv koppelt elke plaats uit de provincie- en regiotabellen, elke
+gemeente uit de adressentabel en de overige plaatsen uit de bestandsnamen aan een
+breedte- en lengtegraad (gemeentecentrum, offline, zonder geocoding-dienst). Een kasteel krijgt de coördinaten van de gemeente
+uit zijn adres, anders van de plaatsnaam in zijn bestandsnaam.
+De punten worden geprojecteerd op een vlak in km rond België (equirectangulair;
+over de afstanden in België minder dan 1% fout) en in een 2D k-d-boom gezet:
+de k dichtste kastelen en de kastelen binnen X km in O(log n) per vraag.
+"""
+
+import os
+import re
+import math
+import heapq
+import unicodedata
+
+from province_matcher import build_place_automaton, match_place
+from page_discovery import find_castle_files
+from update_addresses_comprehensive import get_comprehensive_castle_addresses
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_PATH = os.path.join(SITE_ROOT, 'data', 'gazetteer.tsv')
+
+# Breedtegraad waarrond geprojecteerd wordt (midden van België)
+REFERENCE_LATITUDE = 50.5
+
+# km per graad breedte, en per graad lengte op de referentiebreedte
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON = 111.32 * math.cos(math.radians(REFERENCE_LATITUDE))
+
+# Franse of andere schrijfwijzen in de adressen -> plaatsnaam in de gazetteer
+PLACE_ALIASES = {
+    'bruxelles': 'brussel',
+    'nivelles': 'nijvel',
+    'jodoigne': 'geldenaken',
+    'tournai': 'doornik',
+}
+
+# Postcode en gemeente achteraan een adres: "..., 2180 Ekeren"
+ADDRESS_PLACE_PATTERN = re.compile(r'\b\d{4}\s+(.+?)\s*$')
+
+# In-procescache: pad -> {plaats: (lat, lon)}
+_GAZETTEERS = {}
+
+# Automaat over de plaatsen van de gazetteer, per pad
+_GAZETTEER_AUTOMATA = {}
+
+def normalize_place(name):
+    """Plaatsnaam als slug: kleine letters, zonder accenten, koppeltekens i.p.v. spaties"""
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+    return PLACE_ALIASES.get(slug, slug)
+
+def load_gazetteer(gazetteer_path=GAZETTEER_PATH):
+    """Lees de gazetteer (place, lat, lon per regel, tab-gescheiden, met kopregel)"""
+    if gazetteer_path not in _GAZETTEERS:
+        gazetteer = {}
+        with open(gazetteer_path, 'r', encoding='utf-8') as f:
+            next(f, None)
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) >= 3:
+                    gazetteer[fields[0]] = (float(fields[1]), float(fields[2]))
+        _GAZETTEERS[gazetteer_path] = gazetteer
+    return _GAZETTEERS[gazetteer_path]
+
+def get_gazetteer_automaton(gazetteer_path=GAZETTEER_PATH):
+    """Aho-Corasick automaat over alle plaatsen van de gazetteer (voor bestandsnamen)"""
+    if gazetteer_path not in _GAZETTEER_AUTOMATA:
+        places = list(load_gazetteer(gazetteer_path))
+        _GAZETTEER_AUTOMATA[gazetteer_path] = build_place_automaton({'gazetteer': {'places': places}}, priority={})
+    return _GAZETTEER_AUTOMATA[gazetteer_path]
+
+def address_place(address):
+    """Gemeente uit een adres ("Veltwijcklaan, 2180 Ekeren" -> 'ekeren'), of None"""
+    match = ADDRESS_PLACE_PATTERN.search(address or '')
+    return normalize_place(match.group(1)) if match else None
+
+def locate_castle(filename, addresses=None, gazetteer_path=GAZETTEER_PATH):
+    """
+    Coördinaten van een kasteel: (lat, lon, plaats) of None.
+    Eerst de gemeente uit de adressentabel, anders de plaatsnaam in de bestandsnaam.
+    """
+    gazetteer = load_gazetteer(gazetteer_path)
+    if addresses is None:
+        addresses = get_comprehensive_castle_addresses()
+    
+    filename = os.path.basename(filename)
+    place = address_place(addresses.get(filename.replace('.html', '')))
+    if place not in gazetteer:
+        match = match_place(get_gazetteer_automaton(gazetteer_path), filename)
+        place = match['place'] if match else None
+    
+    if place is None:
+        return None
+    
+    lat, lon = gazetteer[place]
+    return lat, lon, place
+
+def project(lat, lon):
+    """Breedte/lengte naar x/y in km op het vlak rond België"""
+    return lon * KM_PER_DEGREE_LON, lat * KM_PER_DEGREE_LAT
+
+def build_kdtree(points, depth=0):
+    """
+    k-d-boom over punten (x, y, sleutel), afwisselend gesplitst op x en y.
+    Een knoop is (punt, as, links, rechts); gelijke punten blijven in volgorde van de sleutel.
+    """
+    if not points:
+        return None
+    
+    axis = depth % 2
+    points = sorted(points, key=lambda point: (point[axis], point[2]))
+    middle = len(points) // 2
+    
+    return (
+        points[middle],
+        axis,
+        build_kdtree(points[:middle], depth + 1),
+        build_kdtree(points[middle + 1:], depth + 1),
+    )
+
+def nearest(tree, x, y, count, exclude=()):
+    """
+    De count dichtste punten bij (x, y): lijst (afstand in km, sleutel), dichtste eerst.
+    Punten op gelijke afstand als de grens worden allemaal bijgehouden; bij gelijke
+    afstand gaat de kleinste sleutel voor, zodat het resultaat vastligt.
+    """
+    # Max-heap (negatieve afstanden) van de count kleinste afstanden tot nu toe
+    bound = []
+    found = []
+    
+    def visit(node):
+        if node is None:
+            return
+        
+        point, axis, left, right = node
+        if point[2] not in exclude:
+            distance = math.hypot(point[0] - x, point[1] - y)
+            if len(bound) < count:
+                heapq.heappush(bound, -distance)
+                found.append((distance, point[2]))
+            elif distance <= -bound[0]:
+                heapq.heappushpop(bound, -distance)
+                found.append((distance, point[2]))
+        
+        delta = (x, y)[axis] - point[axis]
+        near, far = (left, right) if delta < 0 else (right, left)
+        visit(near)
+        
+        # De andere kant enkel als het splitsvlak niet verder ligt dan de count-de afstand
+        if len(bound) < count or abs(delta) <= -bound[0]:
+            visit(far)
+    
+    if count > 0:
+        visit(tree)
+    return sorted(found)[:count]
+
+def within(tree, x, y, radius):
+    """Alle punten binnen radius km van (x, y): lijst (afstand, sleutel), dichtste eerst"""
+    found = []
+    
+    def visit(node):
+        if node is None:
+            return
+        
+        point, axis, left, right = node
+        distance = math.hypot(point[0] - x, point[1] - y)
+        if distance <= radius:
+            found.append((distance, point[2]))
+        
+        delta = (x, y)[axis] - point[axis]
+        if delta - radius <= 0:
+            visit(left)
+        if delta + radius >= 0:
+            visit(right)
+    
+    visit(tree)
+    return sorted(found)
+
+def build_castle_index(filenames, gazetteer_path=GAZETTEER_PATH):
+    """
+    Index van de kastelen met bekende coördinaten:
+    {'tree', 'locations': bestandsnaam -> (lat, lon, plaats), 'unlocated': [bestandsnamen]}.
+    """
+    addresses = get_comprehensive_castle_addresses()
+    locations = {}
+    unlocated = []
+    
+    for filename in filenames:
+        filename = os.path.basename(filename)
+        location = locate_castle(filename, addresses, gazetteer_path)
+        if location:
+            locations[filename] = location
+        else:
+            unlocated.append(filename)
+    
+    points = [project(lat, lon) + (filename,) for filename, (lat, lon, place) in locations.items()]
+    return {'tree': build_kdtree(points), 'locations': locations, 'unlocated': unlocated}
+
+def nearby_castles(index, filename, count=3, location=None):
+    """
+    De count dichtste kastelen uit de index bij een kasteel: lijst (afstand in km, bestandsnaam).
+    location (lat, lon, plaats) is nodig voor een kasteel dat zelf niet in de index zit.
+    """
+    filename = os.path.basename(filename)
+    location = location or index['locations'].get(filename) or locate_castle(filename)
+    if location is None:
+        return []
+    
+    x, y = project(location[0], location[1])
+    return nearest(index['tree'], x, y, count, exclude={filename})
+
+def castles_within(index, filename, radius, location=None):
+    """Kastelen uit de index binnen radius km van een kasteel (zonder het kasteel zelf)"""
+    filename = os.path.basename(filename)
+    location = location or index['locations'].get(filename) or locate_castle(filename)
+    if location is None:
+        return []
+    
+    x, y = project(location[0], location[1])
+    return [(distance, key) for distance, key in within(index['tree'], x, y, radius) if key != filename]
+
+def main():
+    """Hoofdfunctie"""
+    print("=== KASTELEN IN DE BUURT ===")
+    
+    castle_files = find_castle_files()
+    index = build_castle_index(castle_files)
+    
+    print(f"Gazetteer: {len(load_gazetteer())} plaatsen")
+    print(f"Kastelen met coördinaten: {len(index['locations'])}/{len(castle_files)}")
+    for filename in index['unlocated']:
+        print(f"  ○ Geen plaats gevonden: {filename}")
+    
+    for filename in sorted(index['locations'])[:5]:
+        neighbours = ', '.join(f"{key} ({distance:.1f} km)" for distance, key in nearby_castles(index, filename))
+        print(f"  ✓ {filename}: {neighbours}")
+
+if __name__ == "__main__":
+    main()
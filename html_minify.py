@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Veilige HTML-minificatie voor de gepubliceerde pagina's.
+De f-string-sjablonen van de scripts laten veel inspringing achter. Buiten
+<pre>, <textarea>, <script> en <style> wordt elke reeks witruimte één spatie;
+rond blokelementen (div, section, li, meta, ...) verdwijnt ze helemaal, want daar
+wordt ze niet weergegeven. Tussen inline elementen blijft één spatie staan.
+Commentaar verdwijnt, behalve voorwaardelijk commentaar (<!--[if ...]>).
+"""
+
+import re
+
+# Elementen waarvan de inhoud ongewijzigd blijft
+PRESERVED_TAGS = ('pre', 'textarea', 'script', 'style')
+
+# Elementen waarrond witruimte niet weergegeven wordt
+BLOCK_TAGS = (
+    'html', 'head', 'body', 'meta', 'link', 'title', 'base', 'noscript',
+    'div', 'section', 'header', 'footer', 'main', 'nav', 'article', 'aside',
+    'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'form', 'fieldset',
+    'figure', 'figcaption', 'blockquote', 'hr', 'br', 'picture', 'source', 'iframe',
+)
+
+# Beschermde blokken en commentaar
+PROTECTED_PATTERN = re.compile(
+    r'(<(%s)\b.*?</\2\s*>)|(<!--(?!\[if).*?-->)' % '|'.join(PRESERVED_TAGS),
+    re.DOTALL | re.IGNORECASE
+)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+BLOCK_TAG_PATTERN = re.compile(r' ?(</?(?:%s)\b[^>]*>) ?' % '|'.join(BLOCK_TAGS), re.IGNORECASE)
+DOCTYPE_PATTERN = re.compile(r'(<!doctype[^>]*>) ', re.IGNORECASE)
+
+def minify_text(text):
+    """Witruimte inkorten in een stuk HTML zonder beschermde blokken"""
+    text = WHITESPACE_PATTERN.sub(' ', text)
+    text = BLOCK_TAG_PATTERN.sub(r'\1', text)
+    return DOCTYPE_PATTERN.sub(r'\1', text)
+
+def minify_html(content):
+    """Minificeer een HTML-pagina; de inhoud van <pre>, <textarea>, <script> en <style> blijft ongewijzigd"""
+    parts = []
+    pending = ''
+    position = 0
+    after_block = False
+    
+    for match in PROTECTED_PATTERN.finditer(content):
+        pending += content[position:match.start()]
+        position = match.end()
+        if match.group(3):
+            # Commentaar verdwijnt; de tekst errond wordt samen ingekort
+            continue
+        
+        tag = match.group(2).lower()
+        text = minify_text(pending)
+        if after_block:
+            text = text.lstrip(' ')
+        if tag in ('script', 'style'):
+            text = text.rstrip(' ')
+        
+        parts.append(text)
+        parts.append(match.group(1))
+        pending = ''
+        after_block = tag in ('script', 'style')
+    
+    text = minify_text(pending + content[position:])
+    parts.append(text.lstrip(' ') if after_block else text)
+    return ''.join(parts).strip()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Secties van een kasteelpagina terugvinden in één doorgang met html.parser.
+Voor elke bekende sectie (detail-header, detail-media, hours-card, intro,
+gerelateerde kastelen, faq, main, footer...) worden de tekenposities van de
+open- en sluittag bijgehouden, rekening houdend met geneste elementen. Een
+transformatie kan zo op een gekende positie knippen en plakken in plaats van
+de hele pagina opnieuw met een reguliere expressie te doorzoeken.
+De parser kost enkele milliseconden per pagina; de posities worden daarom per
+inhoud bewaard (hier en in de paginacache, zie page_cache.py), zodat enkel een
+gewijzigde pagina opnieuw geparst wordt.
+"""
+
+from html.parser import HTMLParser
+
+# Sectienaam -> (tag, class die in het class-attribuut moet staan, of None)
+SECTIONS = {
+    'detail-header': ('section', 'detail-header'),
+    'detail-media': ('div', 'detail-media'),
+    'hours-card': ('aside', 'hours-card'),
+    'hours-list': ('ul', 'hours-list'),
+    'intro': ('div', 'intro'),
+    'address-info': ('div', 'address-info'),
+    'related': ('section', 'related'),
+    'card-grid': ('div', 'card-grid'),
+    'faq': ('section', 'faq'),
+    'main': ('main', None),
+    'footer': ('footer', None),
+}
+
+# Aantal pagina's waarvan de secties in het geheugen blijven
+MAX_CACHED_PAGES = 8
+
+# Elementen zonder sluittag
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+})
+
+# In-procescache: pagina-inhoud -> secties
+_SECTION_CACHE = {}
+
+class SectionLocator(HTMLParser):
+    """Parser die per bekende sectie de posities van de eerste voorkomen bijhoudt"""
+    
+    def __init__(self, content):
+        super().__init__(convert_charrefs=False)
+        self.content = content
+        self.sections = {}
+        self.stack = []
+        
+        # Beginpositie van elke regel, om (regel, kolom) om te zetten naar een tekenpositie
+        self.line_starts = [0]
+        position = content.find('\n')
+        while position != -1:
+            self.line_starts.append(position + 1)
+            position = content.find('\n', position + 1)
+    
+    def char_offset(self):
+        """Tekenpositie van de tag die nu verwerkt wordt"""
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+    
+    def section_name(self, tag, attrs):
+        """Naam van de sectie die met deze tag begint, of None"""
+        classes = None
+        for name, (section_tag, section_class) in SECTIONS.items():
+            if tag != section_tag or name in self.sections:
+                continue
+            if section_class is None:
+                return name
+            if classes is None:
+                classes = (dict(attrs).get('class') or '').split()
+            if section_class in classes:
+                return name
+        return None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        
+        start = self.char_offset()
+        inner_start = start + len(self.get_starttag_text())
+        self.stack.append((tag, self.section_name(tag, attrs), start, inner_start))
+    
+    def handle_endtag(self, tag):
+        # Sluit alle elementen die binnen het gesloten element nog open stonden
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return  # Sluittag zonder opentag: negeren
+        
+        inner_end = self.char_offset()
+        end = self.content.find('>', inner_end) + 1
+        closed = self.stack[index:]  # Niet expliciet gesloten elementen eindigen waar hun ouder sluit
+        del self.stack[index:]
+        
+        for open_tag, name, start, inner_start in closed:
+            if name and name not in self.sections:
+                self.sections[name] = {
+                    'start': start,
+                    'inner_start': inner_start,
+                    'inner_end': inner_end,
+                    'end': end if open_tag == tag else inner_end
+                }
+
+def parse_sections(content):
+    """Eén doorgang met de parser over de volledige pagina"""
+    locator = SectionLocator(content)
+    locator.feed(content)
+    locator.close()
+    return locator.sections
+
+def remember_sections(content, sections):
+    """Bewaar de secties van een pagina in de cache (de oudste valt eruit)"""
+    if len(_SECTION_CACHE) >= MAX_CACHED_PAGES:
+        del _SECTION_CACHE[next(iter(_SECTION_CACHE))]
+    _SECTION_CACHE[content] = sections
+
+def locate_sections(content):
+    """
+    Posities van alle bekende secties in de pagina, als
+    {naam: {'start', 'inner_start', 'inner_end', 'end'}}.
+    start/end omvatten de open- en sluittag, inner_start/inner_end enkel de inhoud.
+    Het resultaat wordt hergebruikt zolang dezelfde inhoud opnieuw gevraagd wordt.
+    """
+    sections = _SECTION_CACHE.get(content)
+    if sections is None:
+        sections = parse_sections(content)
+        remember_sections(content, sections)
+    return sections
+
+def shift_offset(key, offset, start, end, delta):
+    """
+    Nieuwe waarde van een positie na het vervangen van content[start:end].
+    Bij een invoeging (start == end) blijft een positie die het einde van een tag
+    markeert staan en schuift een positie die het begin van een tag markeert mee.
+    Retourneert None voor een positie binnen het vervangen stuk.
+    """
+    if offset < start or (offset == start and (start < end or key in ('inner_start', 'end'))):
+        return offset
+    if offset >= end:
+        return offset + delta
+    return None
+
+def shift_sections(sections, start, end, length):
+    """Secties na een splice, of None als een sectie in het vervangen stuk lag"""
+    delta = length - (end - start)
+    shifted = {}
+    
+    for name, section in sections.items():
+        shifted[name] = {}
+        for key, offset in section.items():
+            new_offset = shift_offset(key, offset, start, end, delta)
+            if new_offset is None:
+                return None
+            shifted[name][key] = new_offset
+    
+    return shifted
+
+def contains_section(html):
+    """Snelle test of een HTML-fragment mogelijk zelf een bekende sectie bevat"""
+    return any(
+        f'<{tag}' in html and (section_class is None or section_class in html)
+        for tag, section_class in SECTIONS.values()
+    )
+
+def splice(content, start, end, html):
+    """
+    Vervang content[start:end] door html. Als de secties van de pagina al gekend
+    zijn, worden hun posities verschoven in plaats van de nieuwe pagina opnieuw te parsen.
+    """
+    new_content = content[:start] + html + content[end:]
+    
+    sections = _SECTION_CACHE.get(content)
+    if sections is not None and not contains_section(html):
+        shifted = shift_sections(sections, start, end, len(html))
+        if shifted is not None:
+            remember_sections(new_content, shifted)
+    
+    return new_content
+
+def get_section(content, name):
+    """Positie van een sectie, of None als de pagina ze niet heeft"""
+    return locate_sections(content).get(name)
+
+def section_html(content, name):
+    """Volledige HTML van een sectie (met open- en sluittag), of None"""
+    section = get_section(content, name)
+    return content[section['start']:section['end']] if section else None
+
+def section_inner_html(content, name):
+    """Inhoud van een sectie zonder open- en sluittag, of None"""
+    section = get_section(content, name)
+    return content[section['inner_start']:section['inner_end']] if section else None
+
+def replace_section(content, name, new_html):
+    """Vervang een volledige sectie (met open- en sluittag); ongewijzigd als de sectie ontbreekt"""
+    section = get_section(content, name)
+    if not section:
+        return content
+    
+    # De vervangen sectie zelf wordt bij de volgende opvraging opnieuw gelokaliseerd
+    new_content = content[:section['start']] + new_html + content[section['end']:]
+    sections = {key: value for key, value in locate_sections(content).items() if key != name}
+    shifted = shift_sections(sections, section['start'], section['end'], len(new_html))
+    
+    tag = SECTIONS[name][0]
+    if shifted is not None and new_html.startswith(f'<{tag}') and new_html.endswith(f'</{tag}>'):
+        inner_start = new_html.index('>') + 1
+        inner_end = new_html.rindex('</')
+        if not contains_section(new_html[inner_start:inner_end]):
+            shifted[name] = {
+                'start': section['start'],
+                'inner_start': section['start'] + inner_start,
+                'inner_end': section['start'] + inner_end,
+                'end': section['start'] + len(new_html)
+            }
+            remember_sections(new_content, shifted)
+    
+    return new_content
+
+def replace_section_inner(content, name, new_inner):
+    """Vervang de inhoud van een sectie en behoud de open- en sluittag"""
+    section = get_section(content, name)
+    if not section:
+        return content
+    return splice(content, section['inner_start'], section['inner_end'], new_inner)
+
+def insert_at(content, position, html):
+    """Voeg html in op een tekenpositie"""
+    return splice(content, position, position, html)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Build-stap voor responsieve afbeeldingen.
+Voor elke bronafbeelding in chateaux_images worden verkleinde versies per breedte
+(JPEG, WebP en, als Pillow het ondersteunt, AVIF) aangemaakt in .build/derivatives,
+buiten de bronbestanden; publish_site.py publiceert ze als chateaux_images/derivatives.
+Afbeeldingen waarvan alle versies al nieuwer zijn dan de bron worden overgeslagen.
+De bronpagina's bevatten een gewone <img> (render_image_html), want de versies
+bestaan enkel in de gepubliceerde site; publish_site.py vervangt die door de
+<picture> met srcset/sizes van render_picture_html, in beide gevallen met de
+width/height van de bron. Enkel de kaartafbeeldingen worden lazy geladen; de
+afbeelding bovenaan een kasteelpagina is het grootste element boven de vouw.
+"""
+
+import os
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from page_executor import map_pages
+from image_dimensions import dimension_attributes
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(SITE_ROOT, 'chateaux_images')
+DERIVATIVES_DIR = os.path.join(SITE_ROOT, '.build', 'derivatives')
+
+# Pad van de versies op de gepubliceerde site
+DERIVATIVES_URL_PATH = 'chateaux_images/derivatives'
+
+# Breedtes in pixels; een bron wordt nooit vergroot
+WIDTH_BUCKETS = (480, 800, 1200)
+
+# Uitvoerformaten, van modern naar klassiek: (extensie, Pillow-formaat, MIME-type, opties)
+OUTPUT_FORMATS = (
+    ('avif', 'AVIF', 'image/avif', {'quality': 55}),
+    ('webp', 'WEBP', 'image/webp', {'quality': 78, 'method': 6}),
+    ('jpg', 'JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+# sizes-attributen per plaats op de site
+SIZES_DETAIL = '(max-width: 900px) 100vw, 680px'
+SIZES_CARD = '(max-width: 640px) 100vw, (max-width: 900px) 50vw, 360px'
+
+# In-procescache: map -> (wijzigingstijd, bestandsnamen)
+_LISTING_CACHE = {}
+
+def supported_formats():
+    """Uitvoerformaten die de geïnstalleerde Pillow kan schrijven"""
+    if Image is None:
+        return ()
+    
+    Image.init()
+    return tuple(fmt for fmt in OUTPUT_FORMATS if fmt[1] in Image.SAVE)
+
+def derivative_name(image_name, width, extension):
+    """Bestandsnaam van een afgeleide versie, bv. Kasteel_van_freyr-800.webp"""
+    return f"{os.path.splitext(image_name)[0]}-{width}.{extension}"
+
+def is_up_to_date(source_path, output_paths):
+    """Alle uitvoerbestanden bestaan en zijn niet ouder dan de bron"""
+    source_mtime = os.path.getmtime(source_path)
+    for output_path in output_paths:
+        if not os.path.exists(output_path) or os.path.getmtime(output_path) < source_mtime:
+            return False
+    return True
+
+def generate_derivatives(source_path, output_dir=DERIVATIVES_DIR):
+    """
+    Maak alle versies van één bronafbeelding aan.
+    Retourneert (aantal aangemaakte bestanden, bericht).
+    """
+    formats = supported_formats()
+    if not formats:
+        return 0, "Pillow niet beschikbaar"
+    
+    image_name = os.path.basename(source_path)
+    
+    try:
+        with Image.open(source_path) as image:
+            source_width, source_height = image.size
+            
+            widths = [width for width in WIDTH_BUCKETS if width <= source_width]
+            if not widths:
+                return 0, "Kleiner dan de kleinste breedte"
+            
+            outputs = [
+                (width, fmt, os.path.join(output_dir, derivative_name(image_name, width, fmt[0])))
+                for width in widths for fmt in formats
+            ]
+            
+            if is_up_to_date(source_path, [output_path for _, _, output_path in outputs]):
+                return 0, "Al up-to-date"
+            
+            os.makedirs(output_dir, exist_ok=True)
+            rgb_image = image.convert('RGB')
+            created = 0
+            
+            for width in widths:
+                height = round(source_height * width / source_width)
+                resized = rgb_image if width == source_width else rgb_image.resize((width, height), Image.LANCZOS)
+                
+                for extension, pil_format, mime_type, options in formats:
+                    output_path = os.path.join(output_dir, derivative_name(image_name, width, extension))
+                    resized.save(output_path, pil_format, **options)
+                    created += 1
+        
+        return created, f"{created} versies aangemaakt"
+    
+    except Exception as e:
+        return 0, f"Fout: {e}"
+
+def list_derivatives(output_dir=DERIVATIVES_DIR):
+    """Bestandsnamen in de derivatives-map, hergebruikt zolang de map niet wijzigt"""
+    try:
+        mtime = os.stat(output_dir).st_mtime_ns
+    except OSError:
+        return frozenset()
+    
+    cached = _LISTING_CACHE.get(output_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    names = frozenset(os.listdir(output_dir))
+    _LISTING_CACHE[output_dir] = (mtime, names)
+    return names
+
+def build_srcsets(image_name, output_dir=DERIVATIVES_DIR, url_prefix=f'./{DERIVATIVES_URL_PATH}/'):
+    """
+    Geef {extensie: srcset} voor de versies die effectief bestaan.
+    Een leeg resultaat betekent dat de afbeelding nog niet verwerkt is.
+    """
+    available = list_derivatives(output_dir)
+    srcsets = {}
+    
+    for extension, pil_format, mime_type, options in OUTPUT_FORMATS:
+        candidates = [
+            f"{url_prefix}{derivative_name(image_name, width, extension)} {width}w"
+            for width in WIDTH_BUCKETS
+            if derivative_name(image_name, width, extension) in available
+        ]
+        if candidates:
+            srcsets[extension] = ', '.join(candidates)
+    
+    return srcsets
+
+def image_attributes(image_name, alt, css_class):
+    """src, alt, class en de width/height van de bron"""
+    src = f"./chateaux_images/{image_name}"
+    return f'src="{src}" alt="{alt}" class="{css_class}"' + dimension_attributes(os.path.join(SOURCE_DIR, image_name))
+
+def render_image_html(image_name, alt, css_class='castle-image', sizes=SIZES_DETAIL):
+    """HTML voor een kasteelafbeelding in de bronpagina's: een gewone <img>"""
+    return f'<img {image_attributes(image_name, alt, css_class)}>'
+
+def render_picture_html(image_name, alt, css_class='castle-image', sizes=SIZES_DETAIL):
+    """
+    HTML voor een kasteelafbeelding op de gepubliceerde site: <picture> met srcset als
+    er versies zijn, anders de <img> van render_image_html.
+    Enkel kaartafbeeldingen (SIZES_CARD) krijgen loading="lazy".
+    """
+    srcsets = build_srcsets(image_name)
+    if not srcsets:
+        return render_image_html(image_name, alt, css_class, sizes)
+    
+    img_attributes = image_attributes(image_name, alt, css_class)
+    
+    sources = ''.join(
+        f'<source type="{mime_type}" srcset="{srcsets[extension]}" sizes="{sizes}">'
+        for extension, pil_format, mime_type, options in OUTPUT_FORMATS
+        if extension != 'jpg' and extension in srcsets
+    )
+    
+    if 'jpg' in srcsets:
+        img_attributes += f' srcset="{srcsets["jpg"]}" sizes="{sizes}"'
+    
+    if sizes == SIZES_CARD:
+        img_attributes += ' loading="lazy"'
+    
+    return f'<picture>{sources}<img {img_attributes} decoding="async"></picture>'
+
+def find_source_images(source_dir=SOURCE_DIR):
+    """Alle bronafbeeldingen (niet de afgeleide versies zelf)"""
+    return sorted(
+        os.path.join(source_dir, name) for name in os.listdir(source_dir)
+        if name.lower().endswith(('.jpg', '.jpeg', '.png')) and os.path.isfile(os.path.join(source_dir, name))
+    )
+
+def main():
+    """Hoofdfunctie"""
+    print("=== RESPONSIEVE AFBEELDINGEN ===")
+    
+    formats = supported_formats()
+    if not formats:
+        print("❌ Pillow is niet geïnstalleerd (pip install Pillow); geen versies aangemaakt")
+        return
+    
+    print(f"Formaten: {', '.join(fmt[0] for fmt in formats)}")
+    print(f"Breedtes: {', '.join(str(width) for width in WIDTH_BUCKETS)}")
+    
+    source_images = find_source_images()
+    print(f"Bronafbeeldingen: {len(source_images)}")
+    
+    created_total = 0
+    processed_count = 0
+    error_count = 0
+    
+    for source_path, (created, message) in zip(source_images, map_pages(generate_derivatives, source_images)):
+        if message.startswith("Fout"):
+            print(f"  ✗ {os.path.basename(source_path)}: {message}")
+            error_count += 1
+        elif created:
+            processed_count += 1
+            created_total += created
+            if processed_count % 25 == 0:
+                print(f"  Voortgang: {processed_count} afbeeldingen verwerkt...")
+    
+    print(f"\n=== EINDRESULTAAT ===")
+    print(f"Afbeeldingen verwerkt: {processed_count}")
+    print(f"Overgeslagen (up-to-date of te klein): {len(source_images) - processed_count - error_count}")
+    print(f"Versies aangemaakt: {created_total}")
+    print(f"Fouten: {error_count}")
+
+if __name__ == "__main__":
+    main()
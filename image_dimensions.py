@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Afmetingen van afbeeldingen bepalen zonder ze te decoderen.
+Van JPEG, PNG, GIF en WebP worden enkel de headerbytes gelezen. De resultaten
+worden bewaard in .build/image_sizes.json, per bestand met grootte en
+wijzigingstijd, zodat een afbeelding pas opnieuw gelezen wordt als ze wijzigt.
+Met de afmetingen krijgt elke gegenereerde <img> width/height-attributen en
+schuift de layout niet meer op tijdens het laden.
+"""
+
+import os
+import re
+import json
+import struct
+import time
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+SIZE_CACHE_PATH = os.path.join(SITE_ROOT, '.build', 'image_sizes.json')
+
+# JPEG start-of-frame markers (niet DHT C4, JPG C8 en DAC CC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# EXIF-oriëntaties waarbij de browser de afbeelding een kwartslag draait
+EXIF_ROTATED = frozenset({5, 6, 7, 8})
+
+# Extensies van de afbeeldingen die list_images en probe_directory bekijken
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# In-procescache: absoluut pad -> {size, mtime_ns, width, height}
+_SIZE_CACHE = None
+_SIZE_CACHE_DIRTY = False
+
+def read_exif_orientation(segment):
+    """Oriëntatie uit een APP1/EXIF-segment, of None"""
+    if not segment.startswith(b'Exif\x00\x00'):
+        return None
+    
+    tiff = segment[6:]
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+    
+    try:
+        ifd_offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        entry_count = struct.unpack(endian + 'H', tiff[ifd_offset:ifd_offset + 2])[0]
+        for i in range(entry_count):
+            entry = tiff[ifd_offset + 2 + i * 12:ifd_offset + 14 + i * 12]
+            tag, value_type = struct.unpack(endian + 'HH', entry[:4])
+            if tag == 0x0112:
+                return struct.unpack(endian + 'H', entry[8:10])[0]
+    except struct.error:
+        return None
+    
+    return None
+
+def probe_jpeg(f):
+    """Afmetingen van een JPEG: loop de segmenten af tot de SOF-marker"""
+    f.seek(2)
+    orientation = None
+    
+    while True:
+        marker = f.read(2)
+        while marker[:1] == b'\xff' and marker[1:2] == b'\xff':
+            marker = marker[1:] + f.read(1)  # Opvulbytes
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue  # Markers zonder lengte
+        if code == 0xD9:
+            return None
+        
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        
+        if code in JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            if orientation in EXIF_ROTATED:
+                width, height = height, width
+            return width, height
+        
+        if code == 0xE1 and orientation is None:
+            orientation = read_exif_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+def probe_png(header):
+    """Afmetingen van een PNG uit de IHDR-chunk"""
+    if header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+def probe_gif(header):
+    """Afmetingen van een GIF uit het logical screen descriptor"""
+    return struct.unpack('<HH', header[6:10])
+
+def probe_webp(header):
+    """Afmetingen van een WebP (VP8, VP8L of VP8X)"""
+    chunk = header[12:16]
+    
+    if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    
+    if chunk == b'VP8L' and header[20:21] == b'\x2f':
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    
+    return None
+
+def probe_image_size(path):
+    """
+    Lees de afmetingen (breedte, hoogte) uit de header van een afbeelding.
+    Retourneert None voor onbekende of beschadigde bestanden.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(32)
+            
+            if header[:3] == b'\xff\xd8\xff':
+                return probe_jpeg(f)
+            if header[:8] == b'\x89PNG\r\n\x1a\n':
+                return probe_png(header)
+            if header[:6] in (b'GIF87a', b'GIF89a'):
+                return probe_gif(header)
+            if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+                return probe_webp(header)
+    except (OSError, struct.error):
+        return None
+    
+    return None
+
+def load_size_cache(cache_path=SIZE_CACHE_PATH):
+    """Lees de afmetingencache één keer per proces"""
+    global _SIZE_CACHE
+    
+    if _SIZE_CACHE is None:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                _SIZE_CACHE = json.load(f)
+        except (OSError, ValueError):
+            _SIZE_CACHE = {}
+    
+    return _SIZE_CACHE
+
+def save_size_cache(cache_path=SIZE_CACHE_PATH):
+    """Schrijf de afmetingencache atomisch weg als er iets gewijzigd is"""
+    global _SIZE_CACHE_DIRTY
+    
+    if not _SIZE_CACHE_DIRTY:
+        return
+    
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_SIZE_CACHE, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+    _SIZE_CACHE_DIRTY = False
+
+def get_image_size(path):
+    """Afmetingen van een afbeelding uit de cache, of opnieuw gelezen als ze gewijzigd is"""
+    global _SIZE_CACHE_DIRTY
+    
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    
+    cache = load_size_cache()
+    entry = cache.get(path)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return (entry['width'], entry['height']) if entry['width'] else None
+    
+    size = probe_image_size(path)
+    cache[path] = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'width': size[0] if size else None,
+        'height': size[1] if size else None
+    }
+    _SIZE_CACHE_DIRTY = True
+    return size
+
+def list_images(images_dir):
+    """Afbeeldingen in een map met grootte en wijzigingstijd, zonder ze te openen: {naam: (grootte, mtime_ns)}"""
+    images = {}
+    
+    if os.path.isdir(images_dir):
+        for name in sorted(os.listdir(images_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                stat = os.stat(os.path.join(images_dir, name))
+                images[name] = (stat.st_size, stat.st_mtime_ns)
+    
+    return images
+
+def probe_directory(images_dir):
+    """Bepaal de afmetingen van alle afbeeldingen in een map; retourneert {naam: (breedte, hoogte)}"""
+    sizes = {}
+    
+    if os.path.isdir(images_dir):
+        for name in sorted(os.listdir(images_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                size = get_image_size(os.path.join(images_dir, name))
+                if size:
+                    sizes[name] = size
+    
+    save_size_cache()
+    return sizes
+
+def dimension_attributes(path):
+    """width/height-attributen voor een <img>, of een lege string als de afmetingen onbekend zijn"""
+    size = get_image_size(path)
+    if not size:
+        return ''
+    return f' width="{size[0]}" height="{size[1]}"'
+
+def add_dimensions_to_content(content, base_dir=SITE_ROOT):
+    """Voeg width/height toe aan elke lokale <img> die ze nog niet heeft"""
+    def add_dimensions(match):
+        tag = match.group(0)
+        if re.search(r'\swidth=', tag):
+            return tag
+        
+        src = match.group(1)
+        if '://' in src or src.startswith(('data:', '/')):
+            return tag
+        
+        attributes = dimension_attributes(os.path.join(base_dir, os.path.normpath(src)))
+        if not attributes:
+            return tag
+        return tag[:-1].rstrip('/ ') + attributes + '>'
+    
+    return re.sub(r'<img\s[^>]*?src="([^"]+)"[^>]*>', add_dimensions, content)
+
+def main():
+    """Hoofdfunctie"""
+    print("=== AFMETINGEN AFBEELDINGEN ===")
+    
+    for images_dir in (os.path.join(SITE_ROOT, 'chateaux_images'), os.path.join(SITE_ROOT, 'assets', 'img')):
+        start = time.perf_counter()
+        sizes = probe_directory(images_dir)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {os.path.relpath(images_dir, SITE_ROOT)}: {len(sizes)} afbeeldingen in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
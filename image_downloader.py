@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gedeelde downloader voor de scripts die afbeeldingen ophalen (Wikimedia, Unsplash, Pixabay...).
+- Meerdere downloads tegelijk via een threadpool met een vast aantal workers
+- Elke worker houdt per host een keep-alive verbinding open (http.client); ze
+  worden gesloten zodra de threadpool stopt
+- Per host een minimale tijd tussen twee requests, in plaats van vaste pauzes
+- Opnieuw proberen met exponentiële backoff bij 429, 5xx en netwerkfouten
+- HTTP-cache in .build/http_cache.json: een bestand dat al bestaat wordt met
+  If-None-Match / If-Modified-Since gerevalideerd en bij 304 niet opnieuw opgehaald
+Werkt met http:// en https://, dus ook tegen een lokale testserver.
+"""
+
+import os
+import json
+import time
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+HTTP_CACHE_PATH = os.path.join(SITE_ROOT, '.build', 'http_cache.json')
+
+USER_AGENT = 'KastelenBelgie/1.0 (https://kastelenbelgie.be; contact@kastelenbelgie.be)'
+
+MAX_WORKERS = 6
+TIMEOUT = 15
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+MAX_REDIRECTS = 5
+
+# Minimale tijd in seconden tussen twee requests naar dezelfde host
+DEFAULT_HOST_INTERVAL = 0.2
+HOST_INTERVALS = {
+    'upload.wikimedia.org': 0.5,
+}
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+# Verbindingen per worker-thread: (scheme, host, port) -> HTTPConnection
+_LOCAL = threading.local()
+
+# Dezelfde verbindingen per thread-id, om ze van buiten de thread te kunnen sluiten
+_THREAD_CONNECTIONS = {}
+_CONNECTIONS_LOCK = threading.Lock()
+
+# Tijdstip waarop elke host opnieuw aangesproken mag worden
+_HOST_NEXT_REQUEST = {}
+_HOST_LOCK = threading.Lock()
+
+_CACHE_LOCK = threading.Lock()
+
+def host_interval(host):
+    """Minimale tijd tussen twee requests naar een host"""
+    return HOST_INTERVALS.get(host, DEFAULT_HOST_INTERVAL)
+
+def wait_for_host(host):
+    """Wacht tot de host volgens de rate limit opnieuw aangesproken mag worden"""
+    with _HOST_LOCK:
+        now = time.monotonic()
+        start = max(now, _HOST_NEXT_REQUEST.get(host, now))
+        _HOST_NEXT_REQUEST[host] = start + host_interval(host)
+    
+    if start > now:
+        time.sleep(start - now)
+
+def get_connection(scheme, host, port):
+    """Keep-alive verbinding van de huidige thread voor een host, aangemaakt bij eerste gebruik"""
+    connections = getattr(_LOCAL, 'connections', None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+        with _CONNECTIONS_LOCK:
+            _THREAD_CONNECTIONS[threading.get_ident()] = connections
+    
+    key = (scheme, host, port)
+    if key not in connections:
+        if scheme == 'https':
+            connections[key] = http.client.HTTPSConnection(host, port, timeout=TIMEOUT)
+        else:
+            connections[key] = http.client.HTTPConnection(host, port, timeout=TIMEOUT)
+    return connections[key]
+
+def drop_connection(scheme, host, port):
+    """Sluit een verbinding na een fout; de volgende request opent een nieuwe"""
+    connections = getattr(_LOCAL, 'connections', {})
+    connection = connections.pop((scheme, host, port), None)
+    if connection:
+        connection.close()
+
+def close_connections(thread_ids):
+    """Sluit alle verbindingen van de gegeven threads, bv. van een threadpool die gestopt is"""
+    for thread_id in thread_ids:
+        with _CONNECTIONS_LOCK:
+            connections = _THREAD_CONNECTIONS.pop(thread_id, {})
+        for connection in connections.values():
+            connection.close()
+        connections.clear()
+
+def load_http_cache(cache_path=HTTP_CACHE_PATH):
+    """Lees de HTTP-cache; een ontbrekende of onleesbare cache is leeg"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_http_cache(cache, cache_path=HTTP_CACHE_PATH):
+    """Schrijf de HTTP-cache atomisch weg"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+def conditional_headers(entry, dest_path):
+    """If-None-Match / If-Modified-Since voor een bestand dat al gedownload is"""
+    if not entry or not os.path.exists(dest_path) or entry.get('path') != dest_path:
+        return {}
+    
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def retry_delay(attempt, response=None):
+    """Wachttijd voor de volgende poging: Retry-After van de server, anders exponentiële backoff"""
+    if response is not None:
+        retry_after = response.getheader('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return BACKOFF_SECONDS * (2 ** attempt)
+
+def fetch(url, headers):
+    """
+    Eén GET-request met redirects, rate limit en retries.
+    Retourneert (status, response, body); bij een netwerkfout na alle pogingen
+    wordt de laatste uitzondering opnieuw opgeworpen.
+    """
+    for redirect in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        
+        for attempt in range(MAX_RETRIES + 1):
+            wait_for_host(parts.hostname)
+            connection = get_connection(scheme, parts.hostname, port)
+            
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                drop_connection(scheme, parts.hostname, port)
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(retry_delay(attempt))
+                continue
+            
+            if response.will_close:
+                drop_connection(scheme, parts.hostname, port)
+            
+            if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                time.sleep(retry_delay(attempt, response))
+                continue
+            break
+        
+        if response.status in REDIRECT_STATUSES and response.getheader('Location'):
+            url = urllib.parse.urljoin(url, response.getheader('Location'))
+            continue
+        
+        return response.status, response, body
+    
+    return response.status, response, body
+
+def download(url, dest_path, cache=None, extra_headers=None):
+    """
+    Download url naar dest_path, of revalideer een eerdere download.
+    Retourneert (succes, bericht). Als cache None is, wordt .build/http_cache.json
+    gelezen en meteen weer weggeschreven.
+    """
+    own_cache = cache is None
+    if own_cache:
+        cache = load_http_cache()
+    
+    with _CACHE_LOCK:
+        entry = cache.get(url)
+    
+    headers = {'User-Agent': USER_AGENT, 'Accept': 'image/*,*/*;q=0.8'}
+    headers.update(conditional_headers(entry, dest_path))
+    if extra_headers:
+        headers.update(extra_headers)
+    
+    try:
+        status, response, body = fetch(url, headers)
+    except (OSError, http.client.HTTPException) as e:
+        return False, f"Fout: {e}"
+    
+    if status == 304:
+        return True, "Niet gewijzigd (cache)"
+    
+    if status != 200:
+        return False, f"HTTP {status}"
+    
+    os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+    tmp_path = dest_path + '.part'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, dest_path)
+    
+    with _CACHE_LOCK:
+        cache[url] = {
+            'path': dest_path,
+            'etag': response.getheader('ETag'),
+            'last_modified': response.getheader('Last-Modified'),
+            'size': len(body)
+        }
+    
+    if own_cache:
+        save_http_cache(cache)
+    
+    return True, f"Gedownload ({len(body)} bytes)"
+
+def download_many(jobs, workers=MAX_WORKERS, cache_path=HTTP_CACHE_PATH):
+    """
+    Download een lijst (url, doelpad) met een beperkt aantal gelijktijdige requests.
+    Dezelfde url wordt maar één keer opgehaald en daarna naar de andere doelpaden gekopieerd.
+    Retourneert de resultaten (succes, bericht) in dezelfde volgorde als jobs.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    
+    cache = load_http_cache(cache_path)
+    
+    # Eén download per unieke url
+    first_job = {}
+    for url, dest_path in jobs:
+        first_job.setdefault(url, dest_path)
+    
+    # Threads van de pool, om na afloop hun keep-alive verbindingen te sluiten
+    pool_threads = []
+    
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(first_job))),
+            initializer=lambda: pool_threads.append(threading.get_ident())
+        ) as executor:
+            futures = {
+                url: executor.submit(download, url, dest_path, cache)
+                for url, dest_path in first_job.items()
+            }
+            downloads = {url: future.result() for url, future in futures.items()}
+    finally:
+        close_connections(pool_threads)
+    
+    save_http_cache(cache, cache_path)
+    
+    results = []
+    for url, dest_path in jobs:
+        success, message = downloads[url]
+        source_path = first_job[url]
+        
+        copy_needed = dest_path != source_path and (
+            not os.path.exists(dest_path) or not message.startswith("Niet gewijzigd")
+        )
+        if success and copy_needed:
+            with open(source_path, 'rb') as src, open(dest_path + '.part', 'wb') as dst:
+                dst.write(src.read())
+            os.replace(dest_path + '.part', dest_path)
+            message = f"Gekopieerd van {os.path.basename(source_path)}"
+        
+        results.append((success, message))
+    
+    return results
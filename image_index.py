@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Index van de kasteelafbeeldingen voor het koppelen van pagina's aan afbeeldingen.
+De afbeeldingsmap wordt één keer per run gescand: per afbeelding worden de
+genormaliseerde naam en de woordenset vooraf berekend, plus een omgekeerde index
+woord -> afbeeldingen. Een pagina wordt enkel vergeleken met de afbeeldingen
+waarmee ze minstens één woord deelt.
+"""
+
+import os
+import re
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+# Veelvoorkomende woorden die niets zeggen over welk kasteel het is
+COMMON_WORDS = frozenset({'kasteel', 'chateau', 'van', 'de', 'het', 'le', 'la', 'du', 'des', 'te', 'in', 'op', 'aan'})
+
+# In-procescache: map -> (wijzigingstijd, index)
+_INDEX_CACHE = {}
+
+def normalize_name(name):
+    """Normaliseer een naam: kleine letters, zonder extensie en scheidingstekens"""
+    name = name.lower()
+    name = re.sub(r'\.(jpg|jpeg|png|gif)$', '', name)
+    name = re.sub(r'[_\-\s]+', '', name)
+    return name
+
+def tokenize(name):
+    """Woordenset van een naam"""
+    return frozenset(re.split(r'[_\-\s]+', name.lower()))
+
+def build_image_index(images_dir):
+    """Scan de afbeeldingsmap één keer en bouw de index op"""
+    images = []
+    if os.path.isdir(images_dir):
+        with os.scandir(images_dir) as entries:
+            images = sorted(entry.name for entry in entries if entry.name.endswith(IMAGE_EXTENSIONS))
+    
+    by_name = {}
+    tokens = {}
+    postings = {}
+    
+    for image_name in images:
+        by_name.setdefault(normalize_name(image_name), image_name)
+        tokens[image_name] = tokenize(os.path.splitext(image_name)[0])
+        for token in tokens[image_name]:
+            postings.setdefault(token, []).append(image_name)
+    
+    return {
+        'dir': images_dir,
+        'images': images,
+        'by_name': by_name,
+        'normalized': [(normalize_name(image_name), image_name) for image_name in images],
+        'tokens': tokens,
+        'postings': postings,
+        'filtered_tokens': {},
+    }
+
+def get_image_index(images_dir):
+    """Index van een afbeeldingsmap, hergebruikt zolang de map niet wijzigt"""
+    try:
+        mtime = os.stat(images_dir).st_mtime_ns
+    except OSError:
+        mtime = None
+    
+    cached = _INDEX_CACHE.get(images_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    index = build_image_index(images_dir)
+    _INDEX_CACHE[images_dir] = (mtime, index)
+    return index
+
+def find_exact(index, name):
+    """Afbeelding met exact dezelfde genormaliseerde naam, of None"""
+    return index['by_name'].get(normalize_name(name))
+
+def find_containing(index, name):
+    """Eerste afbeelding waarvan de genormaliseerde naam de naam bevat of erin vervat zit"""
+    name_normalized = normalize_name(name)
+    
+    for image_normalized, image_name in index['normalized']:
+        if name_normalized in image_normalized or image_normalized in name_normalized:
+            return image_name
+    
+    return None
+
+def filtered_tokens(index, common_words):
+    """Woordensets van alle afbeeldingen zonder de gewone woorden, één keer per woordenlijst"""
+    key = frozenset(common_words)
+    if key not in index['filtered_tokens']:
+        index['filtered_tokens'][key] = {
+            image_name: image_tokens - key for image_name, image_tokens in index['tokens'].items()
+        }
+    return index['filtered_tokens'][key]
+
+def find_best_match(index, name, common_words=COMMON_WORDS, threshold=0.3):
+    """
+    Afbeelding met de hoogste Jaccard-score boven de drempel, of None.
+    Enkel afbeeldingen die een woord delen met de naam komen in aanmerking.
+    """
+    name_words = tokenize(name) - frozenset(common_words)
+    if not name_words:
+        return None
+    
+    candidates = set()
+    for word in name_words:
+        candidates.update(index['postings'].get(word, ()))
+    
+    image_tokens = filtered_tokens(index, common_words)
+    best_match = None
+    best_score = 0
+    
+    for image_name in sorted(candidates):
+        image_words = image_tokens[image_name]
+        if not image_words:
+            continue
+        
+        score = len(name_words & image_words) / len(name_words | image_words)
+        if score > best_score and score > threshold:
+            best_score = score
+            best_match = image_name
+    
+    return best_match
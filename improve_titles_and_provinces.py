@@ -7,7 +7,8 @@ Script pour uniformiser les titres des châteaux et améliorer les pages provinc
 
 import os
 import re
-import glob
+
+from page_discovery import find_castle_files
 
 def clean_castle_title(title):
     """Nettoie et uniformise le titre d'un château"""
@@ -151,9 +152,8 @@ def update_province_content_and_alignment():
     
     return updated_count
 
-def add_province_alignment_css():
-    """Ajoute le CSS pour aligner le texte à gauche dans les pages provinces"""
-    css_code = '''
+# CSS d'alignement des pages provinces (aussi enregistré dans css_bundle.py)
+PROVINCE_ALIGNMENT_CSS = '''
 /* Province content alignment */
 .province-content {
   text-align: left;
@@ -167,7 +167,9 @@ def add_province_alignment_css():
   text-align: center;
   margin-top: 2rem;
 }'''
-    
+
+def add_province_alignment_css():
+    """Ajoute le CSS pour aligner le texte à gauche dans les pages provinces"""
     css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
     
     try:
@@ -188,7 +190,7 @@ def add_province_alignment_css():
             return True
         elif '/* Province content alignment */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(css_code)
+                f.write(PROVINCE_ALIGNMENT_CSS)
             return True
         
         return False
@@ -203,19 +205,7 @@ def main():
     
     # 1. Uniformise les titres des châteaux
     print("\n1. Uniformisation des titres de châteaux...")
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     print(f"Trouvé {len(castle_files)} pages de châteaux")
     
     # Test avec quelques fichiers
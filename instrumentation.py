@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Meetlaag voor de pipeline: per transformatie het aantal oproepen, wandklok- en
+CPU-tijd en het aantal gewijzigde pagina's, de gelezen en geschreven bytes, en
+de tijd per reguliere expressie. Gemeten worden de gecompileerde patronen op
+moduleniveau van de scripts van de site (bv. CARD_PATTERN): die worden zolang
+de meetlaag aanstaat door een gemeten omhulsel vervangen. De module re zelf
+blijft onaangeroerd; patronen die als string aan re.sub, re.search, ...
+meegegeven worden, tellen dus niet mee.
+Optioneel wordt de hele run geprofileerd met cProfile en/of tracemalloc.
+Na de run komt een JSON-rapport in .build/reports.
+
+Aanzetten met de omgevingsvariabele PIPELINE_INSTRUMENT, bv.
+    PIPELINE_INSTRUMENT=1 python3 site_pipeline.py
+    PIPELINE_INSTRUMENT=cprofile,tracemalloc python3 site_pipeline.py
+De variabele wordt pas gelezen bij de eerste oproep van is_enabled(); een
+onbekende optie geeft een waarschuwing en wordt genegeerd. Uitgeschakeld kost
+het enkel een test per transformatie.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import multiprocessing
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+REPORTS_DIR = os.path.join(SITE_ROOT, '.build', 'reports')
+
+ENV_VAR = 'PIPELINE_INSTRUMENT'
+KNOWN_OPTIONS = ('metrics', 'cprofile', 'tracemalloc')
+
+# Methodes van een gecompileerd patroon die gemeten worden
+PATTERN_METHODS = ('search', 'match', 'fullmatch', 'sub', 'subn', 'findall', 'finditer', 'split')
+
+# Maximale lengte van een patroon als sleutel in het rapport
+PATTERN_KEY_LENGTH = 120
+
+# Aantal regels in de top van het profiel en van tracemalloc
+REPORT_TOP = 30
+
+ENABLED = False
+OPTIONS = frozenset()
+
+# Is PIPELINE_INSTRUMENT al gelezen (of de meetlaag expliciet ingesteld)?
+_CONFIGURED = False
+
+# Vervangen patronen zolang de meethooks geïnstalleerd zijn: (module, naam, origineel)
+_WRAPPED_PATTERNS = []
+
+# Gegevens van de lopende run (cProfile, tracemalloc, starttijden)
+_RUN = {}
+
+def new_metrics():
+    """Lege meetgegevens"""
+    return {
+        'pages': 0,
+        'transforms': {},
+        'io': {'files_read': 0, 'bytes_read': 0, 'read_s': 0.0, 'files_written': 0, 'bytes_written': 0, 'write_s': 0.0},
+        'regex': {}
+    }
+
+_METRICS = new_metrics()
+
+def parse_options(value):
+    """
+    Opties uit de omgevingsvariabele; '1' of 'metrics' meet enkel, cprofile/tracemalloc
+    meten ook. Retourneert (opties, onbekende opties); de onbekende worden niet gebruikt.
+    """
+    options = {option.strip().lower() for option in (value or '').split(',') if option.strip()}
+    options.discard('0')
+    unknown = sorted(options - set(KNOWN_OPTIONS) - {'1'})
+    options -= set(unknown)
+    
+    if not options:
+        return frozenset(), unknown
+    return frozenset((options - {'1'}) | {'metrics'}), unknown
+
+def configure(options):
+    """Zet de meetlaag aan (met de gegeven opties) of uit (lege opties)"""
+    global ENABLED, OPTIONS, _CONFIGURED
+    
+    OPTIONS = frozenset(options)
+    ENABLED = bool(OPTIONS)
+    _CONFIGURED = True
+    
+    if ENABLED:
+        install_regex_hooks()
+    else:
+        remove_regex_hooks()
+
+def configure_from_environment():
+    """Lees PIPELINE_INSTRUMENT; een onbekende optie geeft een waarschuwing (enkel in het hoofdproces)"""
+    options, unknown = parse_options(os.environ.get(ENV_VAR))
+    if unknown and multiprocessing.parent_process() is None:
+        print(f"⚠️ Onbekende optie in {ENV_VAR} genegeerd: {', '.join(unknown)} "
+              f"(mogelijk: 1, {', '.join(KNOWN_OPTIONS)})", file=sys.stderr)
+    configure(options)
+
+def is_enabled():
+    """Staat de meetlaag aan? Bij de eerste oproep wordt PIPELINE_INSTRUMENT gelezen, ook in een worker"""
+    if not _CONFIGURED:
+        configure_from_environment()
+    return ENABLED
+
+def needs_serial():
+    """cProfile en tracemalloc zien enkel het eigen proces: dan geen procespool gebruiken"""
+    return is_enabled() and bool(OPTIONS & {'cprofile', 'tracemalloc'})
+
+def pattern_key(pattern):
+    """Sleutel van een patroon (string of gecompileerd) in het rapport"""
+    text = getattr(pattern, 'pattern', pattern)
+    if isinstance(text, bytes):
+        text = text.decode('latin-1')
+    text = str(text)
+    return text if len(text) <= PATTERN_KEY_LENGTH else text[:PATTERN_KEY_LENGTH] + '…'
+
+def record_regex(pattern, seconds):
+    """Tel één oproep van een patroon"""
+    stats = _METRICS['regex'].get(pattern_key(pattern))
+    if stats is None:
+        stats = _METRICS['regex'][pattern_key(pattern)] = {'calls': 0, 'time_s': 0.0}
+    stats['calls'] += 1
+    stats['time_s'] += seconds
+
+def timed_regex_function(pattern, func):
+    """Omhulsel rond pattern.search, pattern.sub, ... dat de tijd van het patroon bijhoudt"""
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_regex(pattern, time.perf_counter() - start)
+    return timed
+
+def timed_finditer(pattern, func):
+    """Omhulsel rond pattern.finditer: de tijd van het doorlopen telt mee"""
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        iterator = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    match = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield match
+        finally:
+            record_regex(pattern, elapsed)
+    return timed
+
+class TimedPattern:
+    """Gecompileerd patroon waarvan de methodes uit PATTERN_METHODS gemeten worden"""
+    
+    def __init__(self, pattern):
+        self.pattern_object = pattern
+        for name in PATTERN_METHODS:
+            func = getattr(pattern, name)
+            setattr(self, name, timed_finditer(pattern, func) if name == 'finditer' else timed_regex_function(pattern, func))
+    
+    def __getattr__(self, name):
+        # flags, groups, groupindex, pattern, scanner, ...
+        return getattr(self.pattern_object, name)
+
+def site_modules():
+    """De geladen modules van de scripts van de site (niet de standaardbibliotheek)"""
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == SITE_ROOT and module is not sys.modules[__name__]:
+            modules.append(module)
+    return modules
+
+def install_regex_hooks(modules=None):
+    """Vervang de gecompileerde patronen op moduleniveau door gemeten versies (één keer)"""
+    if _WRAPPED_PATTERNS:
+        return
+    
+    for module in (site_modules() if modules is None else modules):
+        for name, value in list(vars(module).items()):
+            if isinstance(value, re.Pattern):
+                _WRAPPED_PATTERNS.append((module, name, value))
+                setattr(module, name, TimedPattern(value))
+
+def remove_regex_hooks():
+    """Zet de originele patronen terug"""
+    for module, name, pattern in _WRAPPED_PATTERNS:
+        setattr(module, name, pattern)
+    _WRAPPED_PATTERNS.clear()
+
+def run_transform(transform, content, filename):
+    """Voer een transformatie uit en meet oproepen, wandklok- en CPU-tijd en gewijzigde pagina's"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    new_content = transform['func'](content, filename)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    
+    stats = _METRICS['transforms'].get(transform['name'])
+    if stats is None:
+        stats = _METRICS['transforms'][transform['name']] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'pages_changed': 0}
+    stats['calls'] += 1
+    stats['wall_s'] += wall
+    stats['cpu_s'] += cpu
+    if new_content != content:
+        stats['pages_changed'] += 1
+    
+    return new_content
+
+def record_page():
+    """Tel een verwerkte pagina"""
+    _METRICS['pages'] += 1
+
+def record_read(content, seconds):
+    """Tel een gelezen pagina"""
+    _METRICS['io']['files_read'] += 1
+    _METRICS['io']['bytes_read'] += len(content.encode('utf-8'))
+    _METRICS['io']['read_s'] += seconds
+
+def record_write(content, seconds):
+    """Tel een geschreven pagina"""
+    _METRICS['io']['files_written'] += 1
+    _METRICS['io']['bytes_written'] += len(content.encode('utf-8'))
+    _METRICS['io']['write_s'] += seconds
+
+def collect_metrics():
+    """Geef de meetgegevens van dit proces terug en begin opnieuw (voor het resultaat van een worker)"""
+    global _METRICS
+    
+    metrics = _METRICS
+    _METRICS = new_metrics()
+    return metrics
+
+def add_metrics(metrics):
+    """Tel meetgegevens (bv. van een worker) op bij die van dit proces"""
+    _METRICS['pages'] += metrics['pages']
+    
+    for name, stats in metrics['transforms'].items():
+        total = _METRICS['transforms'].setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'pages_changed': 0})
+        for key, value in stats.items():
+            total[key] += value
+    
+    for key, value in metrics['io'].items():
+        _METRICS['io'][key] += value
+    
+    for pattern, stats in metrics['regex'].items():
+        total = _METRICS['regex'].setdefault(pattern, {'calls': 0, 'time_s': 0.0})
+        total['calls'] += stats['calls']
+        total['time_s'] += stats['time_s']
+
+def start_run():
+    """Begin een run: starttijden, en cProfile/tracemalloc als die gevraagd zijn"""
+    if not is_enabled():
+        return
+    
+    _RUN.clear()
+    _RUN['started'] = time.time()
+    _RUN['wall_start'] = time.perf_counter()
+    _RUN['cpu_start'] = time.process_time()
+    
+    if 'tracemalloc' in OPTIONS:
+        import tracemalloc
+        tracemalloc.start(25)
+    
+    if 'cprofile' in OPTIONS:
+        import cProfile
+        _RUN['profiler'] = cProfile.Profile()
+        _RUN['profiler'].enable()
+
+def profile_summary(profiler, stamp, reports_dir):
+    """Bewaar het profiel als .prof en geef de top van de functies op cumulatieve tijd"""
+    import pstats
+    
+    profile_path = os.path.join(reports_dir, f'run-{stamp}.prof')
+    profiler.dump_stats(profile_path)
+    
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (file_name, line, function), (primitive_calls, calls, total, cumulative, callers) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.relpath(file_name, SITE_ROOT) if file_name.startswith(SITE_ROOT) else file_name}:{line}({function})",
+            'calls': calls,
+            'tottime_s': round(total, 6),
+            'cumtime_s': round(cumulative, 6)
+        })
+    rows.sort(key=lambda row: row['cumtime_s'], reverse=True)
+    return {'file': profile_path, 'top': rows[:REPORT_TOP]}
+
+def tracemalloc_summary():
+    """Top van de allocaties per regel en de piek, daarna wordt tracemalloc gestopt"""
+    import tracemalloc
+    
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    top = [
+        {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", 'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+        for stat in snapshot.statistics('lineno')[:REPORT_TOP]
+    ]
+    return {'current_kb': round(current / 1024, 1), 'peak_kb': round(peak / 1024, 1), 'top': top}
+
+def round_metrics(metrics):
+    """Afgeronde tijden, transformaties op tijd gesorteerd, enkel de traagste patronen"""
+    transforms = {
+        name: {key: round(value, 6) if isinstance(value, float) else value for key, value in stats.items()}
+        for name, stats in sorted(metrics['transforms'].items(), key=lambda item: item[1]['wall_s'], reverse=True)
+    }
+    regex = [
+        {'pattern': pattern, 'calls': stats['calls'], 'time_s': round(stats['time_s'], 6)}
+        for pattern, stats in sorted(metrics['regex'].items(), key=lambda item: item[1]['time_s'], reverse=True)
+    ]
+    io_stats = {key: round(value, 6) if isinstance(value, float) else value for key, value in metrics['io'].items()}
+    return {'pages': metrics['pages'], 'transforms': transforms, 'io': io_stats, 'regex': regex[:REPORT_TOP * 2]}
+
+def finish_run(extra=None, reports_dir=REPORTS_DIR):
+    """Sluit de run af en schrijf het JSON-rapport; retourneert het pad (of None als de meetlaag uit staat)"""
+    if not is_enabled():
+        return None
+    
+    profiler = _RUN.pop('profiler', None)
+    if profiler:
+        profiler.disable()
+    
+    os.makedirs(reports_dir, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(_RUN.get('started', time.time())))
+    
+    report = {
+        'started': _RUN.get('started'),
+        'wall_s': round(time.perf_counter() - _RUN.get('wall_start', time.perf_counter()), 6),
+        'cpu_s': round(time.process_time() - _RUN.get('cpu_start', time.process_time()), 6),
+        'options': sorted(OPTIONS),
+    }
+    report.update(extra or {})
+    report.update(round_metrics(_METRICS))
+    
+    if profiler:
+        report['cprofile'] = profile_summary(profiler, stamp, reports_dir)
+    if 'tracemalloc' in OPTIONS:
+        report['tracemalloc'] = tracemalloc_summary()
+    
+    report_path = os.path.join(reports_dir, f'run-{stamp}.json')
+    tmp_path = report_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, report_path)
+    return report_path
@@ -0,0 +1,25 @@
+// FAQ accordion: één gedelegeerde listener voor alle vragen op de pagina
+document.addEventListener('click', (e) => {
+  const question = e.target.closest('.faq-question');
+  if (!question) {
+    return;
+  }
+
+  const answer = question.nextElementSibling;
+  const isExpanded = question.getAttribute('aria-expanded') === 'true';
+  const list = question.closest('.faq-list') || document;
+
+  // Sluit alle andere FAQ's
+  list.querySelectorAll('.faq-question').forEach(q => {
+    q.setAttribute('aria-expanded', 'false');
+  });
+  list.querySelectorAll('.faq-answer').forEach(a => {
+    a.classList.remove('open');
+  });
+
+  // Toggle huidige FAQ
+  if (!isExpanded && answer) {
+    question.setAttribute('aria-expanded', 'true');
+    answer.classList.add('open');
+  }
+});
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bijna-dubbele introteksten vinden met shingles, MinHash en LSH-banding.
+Een md5 van de tekst vindt enkel exacte kopieën; teksten uit hetzelfde sjabloon
+met een andere kasteelnaam glippen erdoor, en alle paren vergelijken is O(n²).
+Elke tekst wordt een verzameling woord-shingles, samengevat in een MinHash-
+handtekening; teksten die in minstens één band van de handtekening overeenkomen
+zijn kandidaten, en enkel die worden vergeleken. Zo blijft het bijna lineair.
+De Jaccard-gelijkenis van een paar wordt geschat uit de handtekeningen.
+
+Als build-gate: python3 near_duplicates.py [drempel]
+geeft exitcode 1 als er clusters boven de drempel (standaard 0.8) zijn.
+"""
+
+import re
+import sys
+import zlib
+import random
+import argparse
+
+from castle_catalog import open_catalog, get_all_castles
+
+# Woorden per shingle
+SHINGLE_SIZE = 3
+
+# Lengte van de MinHash-handtekening (aantal hashfuncties)
+NUM_PERM = 64
+
+# Standaard Jaccard-drempel voor bijna-dubbels
+DEFAULT_THRESHOLD = 0.8
+
+# Vaste seed: dezelfde tekst geeft in elke run dezelfde handtekening
+MINHASH_SEED = 1
+
+# Mersenne-priem voor de hashfuncties (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# In-procescache: (num_perm, seed) -> lijst (a, b)
+_PERMUTATIONS = {}
+
+def get_permutations(num_perm=NUM_PERM, seed=MINHASH_SEED):
+    """Coëfficiënten (a, b) van de hashfuncties van de handtekening"""
+    key = (num_perm, seed)
+    if key not in _PERMUTATIONS:
+        rng = random.Random(seed)
+        _PERMUTATIONS[key] = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+    return _PERMUTATIONS[key]
+
+def get_shingles(text, size=SHINGLE_SIZE):
+    """Verzameling van 32-bit hashes van de woord-shingles van een tekst (kleine letters)"""
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return set()
+    
+    # Korter dan één shingle: de hele tekst is de enige shingle
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(max(len(words) - size, 0) + 1)
+    }
+
+def minhash_signature(shingles, permutations):
+    """MinHash-handtekening: per hashfunctie de kleinste waarde over de shingles"""
+    if not shingles:
+        return tuple([MAX_HASH] * len(permutations))
+    
+    return tuple(
+        min([(a * shingle + b) % MERSENNE_PRIME for shingle in shingles]) & MAX_HASH
+        for a, b in permutations
+    )
+
+def estimate_jaccard(signature1, signature2):
+    """Geschatte Jaccard-gelijkenis: het aandeel gelijke posities in de handtekeningen"""
+    equal = sum(1 for value1, value2 in zip(signature1, signature2) if value1 == value2)
+    return equal / len(signature1)
+
+def lsh_parameters(threshold, num_perm=NUM_PERM):
+    """
+    Aantal banden en rijen per band voor een drempel. Een paar met gelijkenis s wordt
+    kandidaat met kans 1 - (1 - s^r)^b; het buigpunt ligt rond (1/b)^(1/r). Gekozen
+    wordt het hoogste buigpunt dat niet boven de drempel ligt, zodat weinig paren
+    boven de drempel gemist worden; de kandidaten worden daarna toch nagekeken.
+    """
+    options = []
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0:
+            bands = num_perm // rows
+            options.append(((1 / bands) ** (1 / rows), bands, rows))
+    
+    below = [option for option in options if option[0] <= threshold]
+    point, bands, rows = max(below) if below else min(options)
+    return bands, rows
+
+def find_root(parents, item):
+    """Wortel van een element in de union-find, met padhalvering"""
+    while parents[item] != item:
+        parents[item] = parents[parents[item]]
+        item = parents[item]
+    return item
+
+def find_near_duplicates(texts, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+    """
+    Clusters van bijna-dubbele teksten.
+    texts: dict sleutel (bv. bestandsnaam) -> tekst.
+    Retourneert een lijst clusters, de grootste eerst, elk een dict met
+    'members' (gesorteerde sleutels), 'pairs' (sleutel, sleutel, geschatte Jaccard)
+    en de kleinste en gemiddelde geschatte gelijkenis van die paren.
+    """
+    permutations = get_permutations(num_perm)
+    bands, rows = lsh_parameters(threshold, num_perm)
+    
+    keys = list(texts)
+    signatures = []
+    by_text = {}
+    for key in keys:
+        # Identieke teksten delen hun handtekening
+        text = texts[key]
+        if text not in by_text:
+            by_text[text] = minhash_signature(get_shingles(text, shingle_size), permutations)
+        signatures.append(by_text[text])
+    
+    # Per band: emmers van teksten met dezelfde rijen in die band
+    buckets = {}
+    for index, signature in enumerate(signatures):
+        for band in range(bands):
+            band_key = (band, signature[band * rows:(band + 1) * rows])
+            buckets.setdefault(band_key, []).append(index)
+    
+    parents = list(range(len(keys)))
+    checked = set()
+    pairs = []
+    
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        
+        # Elk lid tegen het eerste lid van de emmer: lineair, ook bij grote groepen kopieën
+        first = members[0]
+        for other in members[1:]:
+            pair = (first, other)
+            if pair in checked:
+                continue
+            checked.add(pair)
+            
+            # Al in dezelfde cluster: het paar voegt niets toe
+            if find_root(parents, first) == find_root(parents, other):
+                continue
+            
+            similarity = estimate_jaccard(signatures[first], signatures[other])
+            if similarity >= threshold:
+                pairs.append((first, other, similarity))
+                parents[find_root(parents, other)] = find_root(parents, first)
+    
+    clusters = {}
+    for first, other, similarity in pairs:
+        cluster = clusters.setdefault(find_root(parents, first), {'members': set(), 'pairs': []})
+        cluster['members'].update((first, other))
+        cluster['pairs'].append((keys[first], keys[other], round(similarity, 3)))
+    
+    result = []
+    for cluster in clusters.values():
+        similarities = [similarity for first, other, similarity in cluster['pairs']]
+        result.append({
+            'members': sorted(keys[index] for index in cluster['members']),
+            'pairs': cluster['pairs'],
+            'min_similarity': min(similarities),
+            'mean_similarity': round(sum(similarities) / len(similarities), 3)
+        })
+    
+    result.sort(key=lambda cluster: (-len(cluster['members']), cluster['members'][0]))
+    return result
+
+def get_intro_texts(castles):
+    """Introtekst per pagina uit de catalogusrecords (paragrafen samengevoegd)"""
+    return {castle['file']: ' '.join(castle['intro']) for castle in castles if castle['intro']}
+
+def check_near_duplicates(castles, threshold=DEFAULT_THRESHOLD):
+    """Build-gate: (geslaagd, bericht, clusters)"""
+    texts = get_intro_texts(castles)
+    clusters = find_near_duplicates(texts, threshold)
+    
+    if not clusters:
+        return True, f"Geen bijna-dubbele introteksten ({len(texts)} teksten, drempel {threshold})", clusters
+    
+    pages = sum(len(cluster['members']) for cluster in clusters)
+    return False, f"{len(clusters)} clusters met {pages} bijna-dubbele introteksten (drempel {threshold})", clusters
+
+def threshold_argument(value):
+    """Drempel van de commandolijn: een getal groter dan 0 en hoogstens 1"""
+    try:
+        threshold = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is geen getal")
+    if not 0 < threshold <= 1:
+        raise argparse.ArgumentTypeError(f"{value} ligt niet tussen 0 (exclusief) en 1")
+    return threshold
+
+def main():
+    """Hoofdfunctie"""
+    parser = argparse.ArgumentParser(description="Zoek bijna-dubbele introteksten; exitcode 1 als er clusters boven de drempel zijn")
+    parser.add_argument('drempel', nargs='?', type=threshold_argument, default=DEFAULT_THRESHOLD,
+                        help=f"Jaccard-drempel tussen 0 en 1 (standaard {DEFAULT_THRESHOLD})")
+    threshold = parser.parse_args().drempel
+    bands, rows = lsh_parameters(threshold)
+    
+    print("=== BIJNA-DUBBELE INTROTEKSTEN ===")
+    print(f"Drempel: {threshold} ({NUM_PERM} hashfuncties, {bands} banden van {rows} rijen, shingles van {SHINGLE_SIZE} woorden)")
+    
+    conn = open_catalog()
+    try:
+        castles = get_all_castles(conn)
+    finally:
+        conn.close()
+    
+    success, message, clusters = check_near_duplicates(castles, threshold)
+    
+    for i, cluster in enumerate(clusters, 1):
+        print(f"\nCluster {i} ({len(cluster['members'])} pagina's, gelijkenis {cluster['min_similarity']:.2f}-{cluster['mean_similarity']:.2f}):")
+        for filename in cluster['members'][:5]:
+            print(f"  - {filename}")
+        if len(cluster['members']) > 5:
+            print(f"  ... en {len(cluster['members']) - 5} andere")
+    
+    print(f"\n=== EINDRESULTAAT ===")
+    print(f"{'✓' if success else '✗'} {message}")
+    
+    if not success:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
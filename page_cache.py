@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Persistente cache van de geëxtraheerde structuur van elke pagina.
+Per pagina worden de sectieposities, de <title>, de h1, de introparagrafen,
+de hoofdafbeelding, adres en openingsuren, de kaarten en de provincielinks één
+keer uit de HTML gehaald en bewaard in .build/page_cache.pickle. Zolang grootte
+en wijzigingstijd (of anders de inhoudshash) van de pagina gelijk blijven,
+wordt de HTML niet meer gelezen.
+"""
+
+import os
+import re
+import pickle
+import hashlib
+
+from html_sections import SECTIONS, locate_sections, remember_sections
+from page_discovery import PAGE_KINDS, classify_page, find_pages
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+PAGE_CACHE_PATH = os.path.join(SITE_ROOT, '.build', 'page_cache.pickle')
+
+# Verhogen als extract_page_structure() andere of extra velden oplevert
+PAGE_CACHE_VERSION = 1
+
+# In-procescache: (versie, {absoluut pad: {size, mtime_ns, sha256, page}})
+_PAGE_CACHE = None
+_PAGE_CACHE_DIRTY = False
+
+# Bestand waaruit de in-procescache geladen is en waarnaar hij geschreven wordt
+_PAGE_CACHE_PATH = PAGE_CACHE_PATH
+
+def cache_version():
+    """Versie van de cache, samen met de sectiedefinities waar de posities van afhangen"""
+    return f"{PAGE_CACHE_VERSION}:{sorted(SECTIONS.items())}"
+
+def clean_text(html):
+    """Verwijder HTML-tags en normaliseer witruimte"""
+    return ' '.join(re.sub(r'<[^>]+>', '', html).split())
+
+def inner_html(content, sections, name):
+    """Inhoud van een sectie, of None"""
+    section = sections.get(name)
+    return content[section['inner_start']:section['inner_end']] if section else None
+
+def extract_page_structure(content):
+    """Haal alle gegevens die de scripts nodig hebben in één keer uit een pagina"""
+    sections = locate_sections(content)
+    page = {
+        'sections': {name: dict(section) for name, section in sections.items()},
+        'title': None,
+        'h1': None,
+        'h3': re.findall(r'<h3>([^<]+)</h3>', content),
+        'intro': [],
+        'intro_html': [],
+        'image': None,
+        'address': None,
+        'hours': {},
+        'hours_note': None,
+        'related': [],
+        'cards': re.findall(r'<a class="castle-card" href="([^"]+)"[^>]*>.*?<h3>([^<]+)</h3>', content, re.DOTALL),
+        'province_links': sorted({
+            href for href in re.findall(r'<a [^>]*href="([^"#]+\.html)', content)
+            if classify_page(os.path.basename(href)) == 'province'
+        }),
+    }
+    
+    title_match = re.search(r'<title>(.*?)</title>', content, re.DOTALL)
+    if title_match:
+        page['title'] = clean_text(title_match.group(1))
+    
+    h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
+    if h1_match:
+        page['h1'] = clean_text(h1_match.group(1))
+    
+    # Introductietekst, per paragraaf (ruwe HTML en platte tekst)
+    intro = inner_html(content, sections, 'intro')
+    if intro is not None:
+        for paragraph in re.findall(r'<p>\s*(.*?)\s*</p>', intro, re.DOTALL):
+            page['intro_html'].append(paragraph)
+            text = clean_text(paragraph)
+            if text:
+                page['intro'].append(text)
+    
+    # Hoofdafbeelding
+    image_match = re.match(r'\s*(?:<picture>(?:<source[^>]*>)*)?<img src="([^"]+)"', inner_html(content, sections, 'detail-media') or '')
+    if image_match:
+        page['image'] = image_match.group(1)
+    
+    # Adres: eerste regel na de naam in het adresblok
+    address = inner_html(content, sections, 'address-info')
+    if address is not None:
+        lines = [clean_text(p) for p in re.findall(r'<p>(.*?)</p>', address, re.DOTALL)]
+        if len(lines) > 1:
+            page['address'] = lines[1]
+    
+    # Openingsuren en de note eronder
+    hours = inner_html(content, sections, 'hours-list')
+    if hours is not None:
+        for day, day_hours in re.findall(r'<li><span>(.*?)</span><span>(.*?)</span></li>', hours):
+            page['hours'][day] = day_hours
+    
+    note_match = re.search(r'<p class="lead" style="margin-top:\.8rem">([^<]+)</p>', inner_html(content, sections, 'hours-card') or '')
+    if note_match:
+        page['hours_note'] = note_match.group(1).strip()
+    
+    # Gerelateerde kastelen
+    related = inner_html(content, sections, 'related')
+    if related is not None:
+        page['related'] = re.findall(r'<a class="card" href="([^"]+)">', related)
+    
+    return page
+
+def use_page_cache(cache_path):
+    """
+    Gebruik een ander cachebestand, bv. voor een corpus buiten de site.
+    Openstaande wijzigingen worden eerst weggeschreven naar het huidige bestand.
+    """
+    global _PAGE_CACHE, _PAGE_CACHE_PATH
+    
+    save_page_cache()
+    _PAGE_CACHE = None
+    _PAGE_CACHE_PATH = cache_path
+
+def load_page_cache(cache_path=None):
+    """Lees de paginacache één keer per proces; een oude versie wordt genegeerd"""
+    global _PAGE_CACHE
+    
+    if cache_path is None:
+        cache_path = _PAGE_CACHE_PATH
+    
+    if _PAGE_CACHE is None:
+        try:
+            with open(cache_path, 'rb') as f:
+                version, pages = pickle.load(f)
+            if version != cache_version():
+                pages = {}
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            pages = {}
+        _PAGE_CACHE = pages
+    
+    return _PAGE_CACHE
+
+def save_page_cache(cache_path=None):
+    """Schrijf de paginacache atomisch weg als er iets gewijzigd is"""
+    global _PAGE_CACHE_DIRTY
+    
+    if not _PAGE_CACHE_DIRTY:
+        return
+    
+    if cache_path is None:
+        cache_path = _PAGE_CACHE_PATH
+    
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((cache_version(), _PAGE_CACHE), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    _PAGE_CACHE_DIRTY = False
+
+def store_page(file_path, stat, sha256, page):
+    """Neem een (opnieuw) geëxtraheerde pagina op in de cache"""
+    global _PAGE_CACHE_DIRTY
+    
+    load_page_cache()[file_path] = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'page': page
+    }
+    _PAGE_CACHE_DIRTY = True
+
+def get_entry(file_path):
+    """Cacheregel van een pagina ({size, mtime_ns, sha256, page}), of None"""
+    return load_page_cache().get(os.path.abspath(file_path))
+
+def put_entry(file_path, entry):
+    """
+    Neem een cacheregel over die elders gemaakt is, bv. in een worker van de procespool:
+    die heeft een eigen kopie van de cache en kan enkel zijn resultaat teruggeven.
+    """
+    global _PAGE_CACHE_DIRTY
+    
+    file_path = os.path.abspath(file_path)
+    cache = load_page_cache()
+    if cache.get(file_path) != entry:
+        cache[file_path] = entry
+        _PAGE_CACHE_DIRTY = True
+
+def hash_content(content):
+    """SHA-256 van de pagina-inhoud"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def read_page(file_path):
+    """
+    Lees een pagina en geef (inhoud, structuur) terug. Als de inhoud overeenkomt
+    met de cache worden ook de sectieposities doorgegeven aan html_sections, zodat
+    een transformatie de pagina niet opnieuw hoeft te parsen.
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    sha256 = hash_content(content)
+    entry = load_page_cache().get(file_path)
+    
+    if entry and entry['sha256'] == sha256:
+        if entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            store_page(file_path, stat, sha256, entry['page'])
+        remember_sections(content, entry['page']['sections'])
+        return content, entry['page']
+    
+    page = extract_page_structure(content)
+    store_page(file_path, stat, sha256, page)
+    return content, page
+
+def update_page(file_path, content):
+    """Neem de structuur op van inhoud die net naar file_path geschreven is"""
+    file_path = os.path.abspath(file_path)
+    store_page(file_path, os.stat(file_path), hash_content(content), extract_page_structure(content))
+
+def get_page(file_path):
+    """
+    Structuur van een pagina zonder de HTML te lezen als grootte en
+    wijzigingstijd ongewijzigd zijn; anders wordt de pagina gelezen en beslist de hash.
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    
+    entry = load_page_cache().get(file_path)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['page']
+    
+    content, page = read_page(file_path)
+    return page
+
+def get_page_hash(file_path):
+    """
+    Inhoudshash (sha256) van een pagina uit de cache; de pagina wordt enkel gelezen
+    als grootte of wijzigingstijd veranderd zijn.
+    """
+    get_page(file_path)
+    return load_page_cache()[os.path.abspath(file_path)]['sha256']
+
+def get_pages(file_paths):
+    """Structuur van een reeks pagina's als {pad: structuur}; de cache wordt daarna weggeschreven"""
+    pages = {file_path: get_page(file_path) for file_path in file_paths}
+    save_page_cache()
+    return pages
+
+def main():
+    """Hoofdfunctie"""
+    print("=== PAGINACACHE ===")
+    
+    for kind in PAGE_KINDS:
+        pages = get_pages(find_pages(kind))
+        print(f"  {kind}: {len(pages)} paginas")
+    
+    print(f"✓ Opgeslagen in {PAGE_CACHE_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Centrale pagina-index van de site.
+Eén os.scandir over de site-root deelt elke HTML-pagina in als kasteel, provincie,
+blog, juridisch of overig. De indeling wordt bewaard in .build/page_index.json en
+hergebruikt zolang de wijzigingstijd van de map (en de patroonlijst) niet verandert.
+"""
+
+import os
+import json
+import fnmatch
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# De enige definitie van wat een kasteelpagina is
+CASTLE_PATTERNS = [
+    "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
+    "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
+    "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
+    "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
+    "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
+]
+
+PROVINCE_PATTERNS = [
+    "antwerpen.html", "oost-vlaanderen.html", "west-vlaanderen.html", "limburg.html",
+    "vlaams-brabant.html", "namen.html", "luik.html", "luxemburg.html",
+    "henegouwen.html", "waals-brabant.html", "provinces.html", "kastelen-*.html"
+]
+
+BLOG_PATTERNS = ["blog-*.html"]
+
+LEGAL_PATTERNS = ["privacybeleid.html", "algemene-voorwaarden.html"]
+
+PAGE_KINDS = ('castle', 'province', 'blog', 'legal', 'other')
+
+# In-procescache: site-root -> (sleutel, indeling)
+_INDEX_CACHE = {}
+
+def classify_page(filename):
+    """Deel een HTML-bestandsnaam in als castle, province, blog, legal of other"""
+    for kind, patterns in (
+        ('castle', CASTLE_PATTERNS),
+        ('province', PROVINCE_PATTERNS),
+        ('blog', BLOG_PATTERNS),
+        ('legal', LEGAL_PATTERNS),
+    ):
+        if any(fnmatch.fnmatchcase(filename, pattern) for pattern in patterns):
+            return kind
+    
+    return 'other'
+
+def scan_pages(site_root=SITE_ROOT):
+    """Eén scandir over de site-root; retourneert {soort: [bestandsnamen]}"""
+    pages = {kind: [] for kind in PAGE_KINDS}
+    
+    with os.scandir(site_root) as entries:
+        for entry in entries:
+            if entry.name.endswith('.html') and entry.is_file():
+                pages[classify_page(entry.name)].append(entry.name)
+    
+    for filenames in pages.values():
+        filenames.sort()
+    
+    return pages
+
+def index_key(site_root):
+    """Cachesleutel: wijzigingstijd van de map plus de patroonlijsten"""
+    patterns = json.dumps([CASTLE_PATTERNS, PROVINCE_PATTERNS, BLOG_PATTERNS, LEGAL_PATTERNS])
+    return f"{os.stat(site_root).st_mtime_ns}:{patterns}"
+
+def discover_pages(site_root=SITE_ROOT, index_path=None):
+    """
+    Geef de pagina-indeling van de site als {soort: [bestandsnamen]}.
+    Eerst de in-procescache, dan het indexbestand, anders een nieuwe scan.
+    """
+    if index_path is None:
+        index_path = os.path.join(site_root, '.build', 'page_index.json')
+    
+    key = index_key(site_root)
+    
+    cached = _INDEX_CACHE.get(site_root)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    pages = None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('key') == key:
+            pages = index['pages']
+    except (OSError, ValueError):
+        pass
+    
+    if pages is None:
+        pages = scan_pages(site_root)
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            # Het aanmaken van .build kan de wijzigingstijd van de root zelf veranderen
+            key = index_key(site_root)
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'pages': pages}, f, indent=1)
+        except OSError:
+            pass  # Zonder schrijfrechten werkt de index gewoon zonder cachebestand
+    
+    _INDEX_CACHE[site_root] = (key, pages)
+    return pages
+
+def find_pages(kind, site_root=SITE_ROOT):
+    """Volledige paden van alle pagina's van een soort, gesorteerd"""
+    return [os.path.join(site_root, filename) for filename in discover_pages(site_root)[kind]]
+
+def find_castle_files(site_root=SITE_ROOT):
+    """Vind alle kasteelbestanden in de site"""
+    return find_pages('castle', site_root)
+
+def main():
+    """Hoofdfunctie"""
+    print("=== PAGINA-INDEX ===")
+    
+    pages = discover_pages()
+    for kind in PAGE_KINDS:
+        print(f"  {kind}: {len(pages[kind])} paginas")
+
+if __name__ == "__main__":
+    main()
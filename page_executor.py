@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gedeelde executor die paginabewerkingen over een procespool verdeelt.
+De pagina's worden in chunks naar de workers gestuurd en de resultaten komen
+in dezelfde volgorde terug als de invoer, zodat tellers en voortgangsmeldingen
+in de main() van de scripts ongewijzigd blijven werken.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Onder dit aantal pagina's kost het opstarten van de pool meer dan het oplevert
+MIN_PARALLEL_PAGES = 32
+
+# Aantal chunks per worker: genoeg om ongelijke paginagroottes op te vangen
+CHUNKS_PER_WORKER = 4
+
+def default_workers():
+    """Aantal workers: één per beschikbare core"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def map_pages(func, file_paths, *args, workers=None, chunksize=None):
+    """
+    Pas func(file_path, *args) toe op elke pagina en geef de resultaten in
+    invoervolgorde terug (als generator). func moet een functie op moduleniveau zijn.
+    Kleine batches of workers=1 worden gewoon sequentieel verwerkt.
+    """
+    file_paths = list(file_paths)
+    if workers is None:
+        workers = default_workers()
+    workers = min(workers, len(file_paths))
+    
+    if workers <= 1 or len(file_paths) < MIN_PARALLEL_PAGES:
+        for file_path in file_paths:
+            yield func(file_path, *args)
+        return
+    
+    if chunksize is None:
+        chunksize = max(1, -(-len(file_paths) // (workers * CHUNKS_PER_WORKER)))
+    
+    arg_lists = [[arg] * len(file_paths) for arg in args]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, file_paths, *arg_lists, chunksize=chunksize)
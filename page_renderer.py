@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Volledige kasteelpagina's renderen vanuit de catalogus, in één schrijfbeurt per pagina.
+templates/castle-page.html wordt samen met de snippets die het invoegt
+({{> booking-snippet.html}}, {{> pricing-snippet.html}}) één keer omgezet naar een
+Python-functie met benoemde slots ({{NAME}}, {{INTRO}}, {{RELATED}}...). De vaste
+tekst zit als constanten in die functie; renderen is enkel de slots invullen en
+samenvoegen. De tekstslots (naam, titel, adres, ...) worden HTML-geëscaped, de
+zoekterm van de kaart URL-gecodeerd; de HTML-slots komen uit de bouwfuncties van
+de scripts. De slots komen uit het catalogusrecord (naam, provincie, afbeelding,
+adres) en uit dezelfde tabellen die de afzonderlijke scripts gebruiken (intro,
+openingsuren, FAQ, gerelateerde kastelen), zodat de pagina meteen volledig is in
+plaats van laag per laag gepatcht te worden.
+Bestaande pagina's worden overgeslagen, zoals het oude generate_pages.sh deed: ze
+zijn met de hand bijgewerkt. Met --overwrite worden ook die opnieuw gerenderd.
+"""
+
+import os
+import re
+import html
+import time
+import argparse
+from urllib.parse import quote_plus
+
+import add_breadcrumbs
+import add_faq_sections
+import add_intro_links
+import add_opening_hours
+import add_related_castle_images
+import create_unique_intro_texts
+import related_castles
+import update_addresses_comprehensive
+import update_related_castles_descriptions
+from add_castle_images import create_media_html, find_matching_image
+from castle_catalog import open_catalog, get_all_castles
+from page_discovery import classify_page
+from fragment_cache import print_fragment_stats
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(SITE_ROOT, 'templates')
+IMAGES_DIR = os.path.join(SITE_ROOT, 'chateaux_images')
+URLS_PATH = os.path.join(SITE_ROOT, 'data', 'urls.txt')
+
+CASTLE_TEMPLATE = 'castle-page.html'
+
+# {{SLOT}} of {{> snippet.html}}
+TAG_PATTERN = re.compile(r'\{\{\s*(?:(>)\s*([\w.-]+)|([A-Z][A-Z0-9_]*))\s*\}\}')
+
+# Placeholder in het detail-media blok zolang er geen afbeelding is
+MEDIA_PLACEHOLDER = '''<div class="detail-media" aria-label="Afbeelding van {title}">
+            <div class="image-placeholder">Afbeelding volgt</div>
+          </div>'''
+
+# Slots met platte tekst; de andere slots zijn al HTML
+TEXT_SLOTS = ('NAME', 'TITLE', 'ADDRESS', 'HOURS_NOTE')
+
+# In-procescache: (map, templatenaam) -> (stempel, gebruikte bestanden, renderfunctie)
+_COMPILED_TEMPLATES = {}
+
+def read_template(name, templates_dir=TEMPLATES_DIR, included=None):
+    """
+    Lees een template en voeg de snippets ({{> naam}}) recursief in.
+    included verzamelt de gelezen bestanden, voor de stempel van de cache.
+    """
+    if included is None:
+        included = []
+    if name in included:
+        raise ValueError(f"Template {name} voegt zichzelf in")
+    
+    path = os.path.join(templates_dir, name)
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    included.append(name)
+    
+    def include(match):
+        if not match.group(1):
+            return match.group(0)
+        snippet = read_template(match.group(2), templates_dir, included)
+        return snippet[:-1] if snippet.endswith('\n') else snippet
+    
+    return TAG_PATTERN.sub(include, text)
+
+def compile_template(text, name='template'):
+    """
+    Zet een template om naar een functie render(**slots) -> str.
+    Elk slot wordt een keyword-only argument; een ontbrekend slot geeft een TypeError.
+    """
+    parts = []
+    slots = []
+    position = 0
+    
+    for match in TAG_PATTERN.finditer(text):
+        if match.group(1):
+            raise ValueError(f"Snippet {match.group(2)} niet ingevoegd in {name}")
+        if match.start() > position:
+            parts.append(repr(text[position:match.start()]))
+        slot = match.group(3)
+        parts.append(slot)
+        if slot not in slots:
+            slots.append(slot)
+        position = match.end()
+    
+    if position < len(text):
+        parts.append(repr(text[position:]))
+    
+    signature = f"*, {', '.join(slots)}" if slots else ''
+    source = f"def render({signature}):\n    return ''.join(({', '.join(parts)},))\n"
+    
+    namespace = {}
+    exec(compile(source, f'<template {name}>', 'exec'), namespace)
+    render = namespace['render']
+    render.slots = tuple(slots)
+    return render
+
+def template_stamp(names, templates_dir=TEMPLATES_DIR):
+    """Wijzigingstijden van een template en zijn snippets"""
+    return tuple(os.stat(os.path.join(templates_dir, name)).st_mtime_ns for name in names)
+
+def get_renderer(name=CASTLE_TEMPLATE, templates_dir=TEMPLATES_DIR):
+    """Gecompileerde renderfunctie van een template; opnieuw gecompileerd als een bestand wijzigt"""
+    key = (templates_dir, name)
+    cached = _COMPILED_TEMPLATES.get(key)
+    if cached and cached[0] == template_stamp(cached[1], templates_dir):
+        return cached[2]
+    
+    included = []
+    render = compile_template(read_template(name, templates_dir, included), name)
+    _COMPILED_TEMPLATES[key] = (template_stamp(included, templates_dir), tuple(included), render)
+    return render
+
+def castle_province(record):
+    """Provincie (id, naam) uit het record, met dezelfde standaard als de breadcrumbs"""
+    if record['province']:
+        return record['province'], record['province_name']
+    return add_breadcrumbs.determine_province(record['file'])
+
+def castle_address(record):
+    """Adres uit het record, of uit de adressentabel zolang de pagina nog 'volgt' vermeldt"""
+    address = record['address']
+    if address and 'volgt' not in address.lower():
+        return address
+    
+    addresses = update_addresses_comprehensive.get_comprehensive_castle_addresses()
+    return addresses.get(record['slug'], address or 'Adres volgt')
+
+def castle_media(record, images_dir=IMAGES_DIR):
+    """Detail-media blok: de afbeelding van de pagina, anders een passende afbeelding, anders de placeholder"""
+    image_name = None
+    if record['image'] and record['image'].startswith('./chateaux_images/'):
+        image_name = os.path.basename(record['image'])
+        if not os.path.exists(os.path.join(images_dir, image_name)):
+            image_name = None
+    
+    if image_name is None:
+        image_name = find_matching_image(record['file'], images_dir)
+    
+    if image_name is None:
+        return MEDIA_PLACEHOLDER.format(title=record['slug'].replace('-', ' '))
+    return create_media_html(image_name, record['file'])
+
+def castle_intro(record, province_id, province_name):
+    """Intro-blok met de unieke tekst en de links naar België en de provincie"""
+    paragraphs = list(create_unique_intro_texts.create_unique_intro(record['file'])['paragraphs'])
+    
+    # Zoals add_intro_links: enkel bij precies twee paragrafen
+    if len(paragraphs) == 2:
+        paragraphs = [
+            add_intro_links.add_links_to_intro_text(paragraph.strip(), province_id, province_name, is_first_paragraph=(i == 0))[0]
+            for i, paragraph in enumerate(paragraphs)
+        ]
+    
+    return create_unique_intro_texts.create_intro_html(paragraphs)
+
+def castle_related(record):
+    """Kaarten van de gerelateerde kastelen, met hun afbeelding als die er is"""
+    related_castles = update_related_castles_descriptions.get_related_castles(record['file'])
+    cards_html = update_related_castles_descriptions.create_related_cards_html(related_castles)
+    cards_html, message = add_related_castle_images.add_related_images_to_content(cards_html)
+    return cards_html
+
+def escape_text(value):
+    """Platte tekst voor in HTML, ook binnen een attribuut tussen dubbele aanhalingstekens"""
+    return html.escape(value, quote=False).replace('"', '&quot;')
+
+def castle_slots(record):
+    """Alle slots van de kasteeltemplate voor één catalogusrecord"""
+    filename = record['file']
+    title = record['slug'].replace('-', ' ')
+    province_id, province_name = castle_province(record)
+    hours_data = add_opening_hours.get_opening_hours(filename)
+    
+    slots = {
+        'NAME': record['name'] or title,
+        'TITLE': title,
+        'MAP_QUERY': quote_plus(title),
+        'BREADCRUMB': add_breadcrumbs.create_breadcrumb_html(
+            'castle', add_breadcrumbs.extract_castle_name(filename), province_id, province_name
+        ),
+        'MEDIA': castle_media(record),
+        'HOURS': add_opening_hours.create_hours_list_html(hours_data),
+        'HOURS_NOTE': hours_data['note'],
+        'INTRO': castle_intro(record, province_id, province_name),
+        'ADDRESS': castle_address(record),
+        'RELATED': castle_related(record),
+        'FAQ': add_faq_sections.create_faq_html(
+            add_faq_sections.get_faq_data(filename), add_faq_sections.get_faq_key(filename)
+        ),
+        'SCRIPTS': add_faq_sections.add_faq_javascript(),
+    }
+    for slot in TEXT_SLOTS:
+        slots[slot] = escape_text(slots[slot])
+    return slots
+
+def render_castle_page(record, render=None):
+    """Volledige HTML van een kasteelpagina"""
+    if render is None:
+        render = get_renderer()
+    return render(**castle_slots(record))
+
+def new_castle_record(slug):
+    """Record voor een kasteel uit data/urls.txt dat nog niet in de catalogus staat"""
+    return {
+        'slug': slug,
+        'file': f'{slug}.html',
+        'name': None,
+        'province': None,
+        'province_name': None,
+        'place': None,
+        'address': None,
+        'hours': {},
+        'hours_note': None,
+        'image': None,
+        'intro': [],
+        'related': [],
+    }
+
+def read_url_slugs(urls_path=URLS_PATH):
+    """Slugs van de kasteelpagina's in data/urls.txt (eerste kolom, zonder header)"""
+    if not os.path.exists(urls_path):
+        return []
+    
+    slugs = []
+    with open(urls_path, 'r', encoding='utf-8') as f:
+        next(f, None)
+        for line in f:
+            url = line.split('\t')[0].strip().rstrip('/')
+            slug = url.rsplit('/', 1)[-1]
+            if slug and classify_page(f'{slug}.html') == 'castle':
+                slugs.append(slug)
+    return slugs
+
+def get_castle_records(conn):
+    """Alle catalogusrecords, aangevuld met de kastelen uit data/urls.txt die nog geen pagina hebben"""
+    records = get_all_castles(conn)
+    known = {record['slug'] for record in records}
+    
+    for slug in read_url_slugs():
+        if slug not in known:
+            records.append(new_castle_record(slug))
+            known.add(slug)
+    
+    return records
+
+def write_castle_page(record, output_dir, render, overwrite=False):
+    """
+    Render één pagina en schrijf ze enkel als de inhoud verschilt; retourneert (geschreven, bericht).
+    Een bestaande pagina wordt overgeslagen, tenzij overwrite.
+    """
+    output_path = os.path.join(output_dir, record['file'])
+    exists = os.path.exists(output_path)
+    if exists and not overwrite:
+        return False, "Bestaat al"
+    
+    content = render_castle_page(record, render)
+    if exists:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False, "Ongewijzigd"
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True, "Gerenderd"
+
+def render_site(output_dir=SITE_ROOT, records=None, overwrite=False):
+    """
+    Render de kasteelpagina's naar output_dir; retourneert de lijst (bestand, geschreven, bericht).
+    Bestaande pagina's worden overgeslagen, tenzij overwrite.
+    """
+    if records is None:
+        conn = open_catalog()
+        try:
+            records = get_castle_records(conn)
+        finally:
+            conn.close()
+    
+    os.makedirs(output_dir, exist_ok=True)
+    render = get_renderer()
+    update_related_castles_descriptions.prepare_related_castles([record['file'] for record in records])
+    
+    results = []
+    for record in records:
+        try:
+            written, message = write_castle_page(record, output_dir, render, overwrite)
+        except Exception as e:
+            written, message = False, f"Fout: {e}"
+        results.append((record['file'], written, message))
+    
+    related_castles.save_related_cache()
+    return results
+
+def main():
+    """Hoofdfunctie"""
+    parser = argparse.ArgumentParser(description="Render de kasteelpagina's vanuit de catalogus")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="ook bestaande pagina's opnieuw renderen en overschrijven")
+    args = parser.parse_args()
+    
+    print("=== KASTEELPAGINA'S RENDEREN ===")
+    
+    start = time.perf_counter()
+    render = get_renderer()
+    print(f"Template: {CASTLE_TEMPLATE} ({len(render.slots)} slots: {', '.join(render.slots)})")
+    
+    results = render_site(overwrite=args.overwrite)
+    elapsed = time.perf_counter() - start
+    
+    written_count = 0
+    skipped_count = 0
+    error_count = 0
+    
+    for i, (filename, written, message) in enumerate(results, 1):
+        if message.startswith("Fout"):
+            print(f"  ✗ {filename}: {message}")
+            error_count += 1
+        elif written:
+            written_count += 1
+        elif message == "Bestaat al":
+            skipped_count += 1
+        
+        if i % 50 == 0:
+            print(f"  Voortgang: {i}/{len(results)} pagina's gerenderd...")
+    
+    print(f"\n=== EINDRESULTAAT ===")
+    print(f"Pagina's gerenderd: {len(results)}")
+    print(f"Pagina's geschreven: {written_count}")
+    print(f"Overgeslagen (bestaan al): {skipped_count}")
+    print(f"Ongewijzigd: {len(results) - written_count - skipped_count - error_count}")
+    print(f"Fouten: {error_count}")
+    print(f"Tijd: {elapsed:.2f} s")
+    print_fragment_stats()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Voorgecomprimeerde varianten van de gepubliceerde HTML, CSS en JavaScript.
+Naast elk bestand komt een .gz (gzip, niveau 9) en, als de module zstandard
+geïnstalleerd is, een .zst; de statische host kan die rechtstreeks serveren
+zonder bij elke aanvraag te comprimeren. Een variant die niet kleiner is dan het
+origineel wordt niet geschreven.
+Het comprimeren loopt over de procespool van page_executor. De hash van elk
+bestand wordt in .build/precompress.json bewaard: bestanden waarvan de inhoud
+niet veranderd is, worden overgeslagen.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from page_executor import map_pages
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+PRECOMPRESS_MANIFEST_PATH = os.path.join(SITE_ROOT, '.build', 'precompress.json')
+
+# Verhogen als de compressie-instellingen veranderen
+PRECOMPRESS_VERSION = 1
+
+# Bestandstypes die gecomprimeerd worden
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js')
+
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+
+def available_encodings():
+    """Extensies van de varianten die hier gemaakt kunnen worden"""
+    return ('.gz', '.zst') if zstandard is not None else ('.gz',)
+
+def compress(data, extension):
+    """Comprimeer bytes voor één variant (.gz of .zst), deterministisch"""
+    if extension == '.gz':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+def compress_file(file_path, known_hashes):
+    """
+    Schrijf de varianten van één bestand als de inhoud veranderd is.
+    Retourneert (pad, hash, aantal geschreven varianten, paden van de bestaande varianten).
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    
+    digest = hashlib.sha256(data).hexdigest()
+    encodings = available_encodings()
+    
+    existing = [file_path + extension for extension in encodings if os.path.exists(file_path + extension)]
+    if known_hashes.get(file_path) == digest and len(existing) == len(encodings):
+        return file_path, digest, 0, existing
+    
+    written = 0
+    existing = []
+    for extension in encodings:
+        variant_path = file_path + extension
+        compressed = compress(data, extension)
+        if len(compressed) >= len(data):
+            if os.path.exists(variant_path):
+                os.remove(variant_path)
+            continue
+        
+        tmp_path = variant_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, variant_path)
+        written += 1
+        existing.append(variant_path)
+    
+    return file_path, digest, written, existing
+
+def load_manifest(manifest_path=PRECOMPRESS_MANIFEST_PATH):
+    """Hashes van de vorige keer: pad -> sha256 (leeg bij een andere versie of encodings)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if manifest.get('version') != PRECOMPRESS_VERSION or manifest.get('encodings') != list(available_encodings()):
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(hashes, manifest_path=PRECOMPRESS_MANIFEST_PATH):
+    """Schrijf de hashes weg (atomair via een tijdelijk bestand)"""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': PRECOMPRESS_VERSION, 'encodings': list(available_encodings()), 'files': hashes}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def precompress(paths, manifest_path=PRECOMPRESS_MANIFEST_PATH, workers=None):
+    """
+    Comprimeer de gegeven bestanden in de procespool; ongewijzigde bestanden worden
+    overgeslagen. Retourneert {'files', 'compressed', 'variants': [paden van alle varianten]}.
+    """
+    known_hashes = load_manifest(manifest_path)
+    hashes = {}
+    compressed = 0
+    variants = []
+    
+    for file_path, digest, written, existing in map_pages(compress_file, paths, known_hashes, workers=workers):
+        hashes[file_path] = digest
+        compressed += 1 if written else 0
+        variants.extend(existing)
+    
+    save_manifest(hashes, manifest_path)
+    return {'files': len(hashes), 'compressed': compressed, 'variants': variants}
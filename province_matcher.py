@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gedeelde plaatsnaam-matcher voor de provincietoewijzing van kastelen.
+De plaatsnamen uit de provincietabellen worden één keer gecompileerd tot een
+Aho-Corasick automaat, zodat een bestandsnaam in één lineaire scan wordt gematcht.
+"""
+
+from collections import deque
+
+# Expliciete keuze voor plaatsnamen die in meerdere provincies voorkomen
+PLACE_PRIORITY = {
+    'voeren': 'limburg',
+    'meulebeke': 'west-vlaanderen',
+    'templeuve': 'henegouwen',
+}
+
+def build_place_automaton(provinces, priority=None):
+    """Compileer de plaatsnamen van {provincie: {'places': [...]}} tot een automaat"""
+    place_provinces = {}
+    for province_id, province_data in provinces.items():
+        for place in province_data['places']:
+            place_provinces.setdefault(place.lower(), []).append(province_id)
+    
+    # Trie opbouwen
+    goto = [{}]
+    output = [[]]
+    for place in place_provinces:
+        state = 0
+        for char in place:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                output.append([])
+            state = next_state
+        output[state].append(place)
+    
+    # Faallinks in breedte-eerst volgorde
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            output[next_state] = output[next_state] + output[fail[next_state]]
+    
+    return {
+        'goto': goto,
+        'fail': fail,
+        'output': output,
+        'place_provinces': place_provinces,
+        'provinces': provinces,
+        'priority': PLACE_PRIORITY if priority is None else priority,
+    }
+
+def find_places(automaton, text):
+    """Geef alle (start, einde, plaats) voorkomens in de tekst, in één scan"""
+    goto = automaton['goto']
+    fail = automaton['fail']
+    output = automaton['output']
+    
+    matches = []
+    state = 0
+    for i, char in enumerate(text):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        for place in output[state]:
+            matches.append((i + 1 - len(place), i + 1, place))
+    
+    return matches
+
+def resolve_province(automaton, place):
+    """Kies de provincie voor een plaats, rekening houdend met de prioriteitsregels"""
+    candidates = automaton['place_provinces'][place]
+    preferred = automaton['priority'].get(place)
+    
+    if preferred in candidates:
+        return preferred
+    
+    return candidates[0]
+
+def match_place(automaton, filename):
+    """
+    Zoek de beste plaatsnaam in een bestandsnaam.
+    Volgorde: volledige slug-segmenten gaan voor, daarna de langste match,
+    daarna de match die het verst naar achter staat (de locatie staat achteraan in de slug).
+    Retourneert {'province', 'name', 'place', 'start', 'end'} of None.
+    """
+    text = filename.lower()
+    best = None
+    best_key = None
+    
+    for start, end, place in find_places(automaton, text):
+        aligned = (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+        key = (aligned, end - start, start)
+        if best_key is None or key > best_key:
+            best_key = key
+            best = (start, end, place)
+    
+    if best is None:
+        return None
+    
+    start, end, place = best
+    province_id = resolve_province(automaton, place)
+    
+    return {
+        'province': province_id,
+        'name': automaton['provinces'][province_id].get('name', province_id),
+        'place': place,
+        'start': start,
+        'end': end,
+    }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Publiceer de site naar dist/, de map die de statische host serveert.
+De pagina's en de statische bestanden (js, assets, afbeeldingen) worden
+gekopieerd en de FAQ-bundel wordt geschreven (zie script_bundle.py). De
+kasteelafbeeldingen worden <picture>-elementen met de responsieve versies uit
+.build/derivatives (zie image_derivatives.py). De stylesheets worden gebundeld
+(zie css_bundle.py) en de pagina's linken naar de gehashte bundels, met de kritieke CSS van hun sjabloon inline (zie critical_css.py).
+Elk statisch bestand krijgt een kopie met hash en de pagina's verwijzen daarnaar,
+met cacheregels in _headers (asset_fingerprint.py). De pagina's worden
+geminificeerd (html_minify.py) en alle HTML, CSS en JS krijgt voorgecomprimeerde
+varianten (precompress.py). Enkel gewijzigde bestanden worden herschreven;
+bestanden die niet meer gepubliceerd worden, verdwijnen uit dist/.
+"""
+
+import os
+import shutil
+
+from page_discovery import discover_pages
+from css_bundle import build_stylesheets
+from critical_css import build_critical_css, page_template, inline_critical_css
+from html_minify import minify_html
+from precompress import COMPRESSIBLE_EXTENSIONS, available_encodings, precompress
+from asset_fingerprint import fingerprint_assets, rewrite_asset_references, write_headers
+from script_bundle import build_bundle
+from image_derivatives import DERIVATIVES_DIR, DERIVATIVES_URL_PATH
+from add_castle_images import add_responsive_images_to_content
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(SITE_ROOT, 'dist')
+
+# Mappen en losse bestanden die ongewijzigd gepubliceerd worden
+STATIC_DIRS = ('js', 'assets', 'chateaux_images')
+STATIC_FILES = ('CNAME',)
+
+# Gegenereerde mappen buiten de bron: (map, pad in dist)
+GENERATED_DIRS = ((DERIVATIVES_DIR, DERIVATIVES_URL_PATH),)
+
+def read_pages(site_root=SITE_ROOT):
+    """Alle HTML-pagina's van de site-root: bestandsnaam -> inhoud"""
+    pages = {}
+    for filenames in discover_pages(site_root).values():
+        for filename in filenames:
+            with open(os.path.join(site_root, filename), 'r', encoding='utf-8') as f:
+                pages[filename] = f.read()
+    return dict(sorted(pages.items()))
+
+def write_if_changed(path, data):
+    """Schrijf bytes weg als het bestand nog niet exact deze inhoud heeft"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+def copy_if_changed(source, target):
+    """
+    Kopieer een bestand als grootte of wijzigingstijd verschillen. De kopie vervangt
+    het doel atomair, zodat een hardlink ernaar (de kopie met hash) ongewijzigd blijft.
+    """
+    source_stat = os.stat(source)
+    try:
+        target_stat = os.stat(target)
+        if (target_stat.st_size, target_stat.st_mtime_ns) == (source_stat.st_size, source_stat.st_mtime_ns):
+            return False
+    except FileNotFoundError:
+        pass
+    
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = target + '.tmp'
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+    return True
+
+def sync_static(site_root=SITE_ROOT, dist_dir=DIST_DIR, generated_dirs=GENERATED_DIRS):
+    """
+    Kopieer de statische bestanden en de gegenereerde mappen (bv. de responsieve
+    afbeeldingen) naar dist; retourneert (gepubliceerde paden, aantal gekopieerd)
+    """
+    sources = [(os.path.join(site_root, name), name) for name in STATIC_FILES if os.path.isfile(os.path.join(site_root, name))]
+    directories = [(os.path.join(site_root, directory), directory) for directory in STATIC_DIRS]
+    for source_dir, target_dir in directories + list(generated_dirs):
+        for root, dirs, files in os.walk(source_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.tmp'):
+                    source = os.path.join(root, name)
+                    sources.append((source, os.path.join(target_dir, os.path.relpath(source, source_dir))))
+    
+    published = set()
+    copied = 0
+    for source, relative_path in sources:
+        target = os.path.join(dist_dir, relative_path)
+        if copy_if_changed(source, target):
+            copied += 1
+        published.add(target)
+    
+    return published, copied
+
+def prune(dist_dir, published):
+    """Verwijder bestanden uit dist die niet meer gepubliceerd worden; retourneert het aantal"""
+    removed = 0
+    for root, dirs, files in os.walk(dist_dir, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in published:
+                os.remove(path)
+                removed += 1
+        if root != dist_dir and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+def publish(site_root=SITE_ROOT, dist_dir=DIST_DIR):
+    """Bouw dist/ op; retourneert de statistieken per stap"""
+    published, copied = sync_static(site_root, dist_dir)
+    pages = read_pages(site_root)
+    
+    # De FAQ-bundel waarnaar de kasteelpagina's verwijzen (zie script_bundle.py)
+    published.add(build_bundle(os.path.join(dist_dir, 'js'), os.path.join(site_root, 'js')))
+    
+    # Stylesheets: één gezuiverde, geminificeerde bundel per bron-stylesheet
+    css_dir = os.path.join(dist_dir, 'css')
+    stylesheets = build_stylesheets(pages, css_dir, os.path.join(site_root, 'css'), os.path.join(site_root, 'js'))
+    bundles = {name: result['filename'] for name, result in stylesheets.items()}
+    published.update(os.path.join(css_dir, filename) for filename in bundles.values())
+    
+    # Vingerafdrukken: een kopie met hash van elk statisch bestand; de verwijzingen
+    # naar die bestanden en naar de bron-stylesheets worden in één doorgang herschreven
+    static_paths = sorted(os.path.relpath(path, dist_dir) for path in published)
+    mapping = fingerprint_assets(dist_dir, [path for path in static_paths if path not in STATIC_FILES])
+    mapping.update({f'css/{name}': f'css/{filename}' for name, filename in bundles.items()})
+    published.update(os.path.join(dist_dir, path) for path in mapping.values())
+    
+    # Responsieve afbeeldingen: de versies bestaan enkel in dist, dus ook de <picture>-markup
+    pages = {filename: add_responsive_images_to_content(content) for filename, content in pages.items()}
+    pages = {filename: rewrite_asset_references(content, mapping) for filename, content in pages.items()}
+    
+    # Kritieke CSS: één subset per sjabloon, inline in de <head>
+    critical = build_critical_css(pages, stylesheets)
+    
+    written = 0
+    html_bytes = [0, 0]
+    for filename, content in pages.items():
+        template = page_template(filename, content)
+        if template in critical:
+            content = inline_critical_css(content, critical[template])
+        html_bytes[0] += len(content.encode('utf-8'))
+        content = minify_html(content)
+        html_bytes[1] += len(content.encode('utf-8'))
+        target = os.path.join(dist_dir, filename)
+        if write_if_changed(target, content.encode('utf-8')):
+            written += 1
+        published.add(target)
+    
+    # Cacheregels voor de host: immutable voor alles met een hash, korte TTL voor de HTML
+    published.add(write_headers(dist_dir, set(mapping.values()), pages))
+    
+    # Voorgecomprimeerde varianten (.gz, .zst) van alle HTML, CSS en JS
+    compression = precompress(sorted(path for path in published if path.endswith(COMPRESSIBLE_EXTENSIONS)))
+    published.update(compression['variants'])
+    
+    return {
+        'pages': len(pages),
+        'pages_written': written,
+        'html_bytes': html_bytes,
+        'static_copied': copied,
+        'fingerprinted': len(set(mapping.values())),
+        'stylesheets': stylesheets,
+        'critical': critical,
+        'compression': compression,
+        'removed': prune(dist_dir, published),
+    }
+
+def main():
+    """Hoofdfunctie"""
+    print("=== SITE PUBLICEREN ===")
+    print(f"Doelmap: {DIST_DIR}")
+    
+    result = publish()
+    
+    print("\nStylesheets:")
+    for name, stats in result['stylesheets'].items():
+        print(f"  ✓ {name} -> css/{stats['filename']}: {stats['source_bytes']} -> {stats['bytes']} bytes, "
+              f"{stats['rules_before']} -> {stats['rules']} regels "
+              f"({stats['deduped_declarations']} dubbele declaraties, {stats['purged_selectors']} ongebruikte selectors, "
+              f"{stats['pages']} paginas)")
+    
+    print("\nKritieke CSS per sjabloon:")
+    for (kind, sheet), css in result['critical'].items():
+        print(f"  ✓ {kind} ({sheet}): {len(css.encode('utf-8'))} bytes inline")
+    
+    print(f"\nHTML geminificeerd: {result['html_bytes'][0]} -> {result['html_bytes'][1]} bytes")
+    
+    compression = result['compression']
+    print(f"\nVoorgecomprimeerd ({', '.join(available_encodings())}): {compression['compressed']} van {compression['files']} bestanden opnieuw, "
+          f"{len(compression['variants'])} varianten")
+    
+    print(f"\n=== EINDRESULTAAT ===")
+    print(f"Paginas: {result['pages']} ({result['pages_written']} weggeschreven)")
+    print(f"Statische bestanden gekopieerd: {result['static_copied']}")
+    print(f"Bestanden met vingerafdruk: {result['fingerprinted']}")
+    print(f"Verouderde bestanden verwijderd: {result['removed']}")
+
+if __name__ == "__main__":
+    main()
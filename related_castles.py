@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Aanbevelingen voor gerelateerde kastelen op basis van TF-IDF.
+Elke kandidaat (een kasteel met een beschrijving) wordt een genormaliseerde,
+ijle TF-IDF-vector over naam, beschrijving, introtekst, type en regio. De vectoren
+worden als omgekeerde index (term -> kandidaten met gewicht) bewaard, zodat de
+cosinusgelijkenis van een hele reeks kastelen in één doorgang over de index
+berekend wordt in plaats van kasteel per kandidaat.
+De top-k per kasteel komt in .build/related_castles.json, samen met een hash van
+zijn tekst; enkel kastelen waarvan de tekst (of de kandidatenlijst) gewijzigd is,
+worden opnieuw berekend.
+Met groups (sleutel -> groep, bv. de provincie) komen enkel kandidaten uit de
+groep van de query in aanmerking.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+RELATED_CACHE_PATH = os.path.join(SITE_ROOT, '.build', 'related_castles.json')
+
+# Verhogen als de weging of de tokenisatie verandert
+RELATED_VERSION = 2
+
+# Aantal gerelateerde kastelen per pagina
+RELATED_COUNT = 3
+
+# Woorden zonder onderscheidend vermogen (lidwoorden, voorzetsels, ...)
+STOPWORDS = frozenset('''
+de het een en van in op te met voor door aan als uit tot bij om naar over die dat dit deze
+is zijn was werd wordt heeft hebben of ook nog zich maakt tot er ze hun
+'''.split())
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# In-procescache: {'corpus': kandidatenhash, 'castles': {bestandsnaam: {'hash': termenhash, 'related': [bestandsnamen]}}}
+_RELATED_CACHE = None
+_RELATED_CACHE_DIRTY = False
+
+# Index van de laatst gebruikte kandidaten: (kandidatenhash, index)
+_INDEX = None
+
+def tokenize(text):
+    """Woorden van een tekst in kleine letters, zonder stopwoorden en losse letters of cijfers"""
+    return [
+        word for word in TOKEN_PATTERN.findall(text.lower())
+        if word not in STOPWORDS and len(word) > 1
+    ]
+
+def hash_terms(terms):
+    """Hash van een lijst termen, voor de cache"""
+    return hashlib.sha256('\n'.join(terms).encode('utf-8')).hexdigest()
+
+def hash_documents(documents, groups=None):
+    """Hash van alle kandidaten (sleutels, termen en groep)"""
+    digest = hashlib.sha256(str(RELATED_VERSION).encode('utf-8'))
+    for key in sorted(documents):
+        digest.update(key.encode('utf-8'))
+        digest.update(hash_terms(documents[key]).encode('utf-8'))
+        if groups is not None:
+            digest.update(str(groups.get(key)).encode('utf-8'))
+    return digest.hexdigest()
+
+def term_weights(terms, idf):
+    """Genormaliseerde TF-IDF-vector van een document (sublineaire tf: 1 + log tf)"""
+    vector = {
+        term: (1 + math.log(count)) * idf[term]
+        for term, count in Counter(terms).items()
+        if term in idf
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in vector.items()}
+
+def build_index(documents):
+    """
+    TF-IDF-index van de kandidaten: {'idf': term -> idf, 'postings': term -> [(sleutel, gewicht)]}.
+    idf = log((1 + n) / (1 + df)) + 1, zoals de gangbare gladde variant.
+    """
+    document_frequency = Counter()
+    for terms in documents.values():
+        document_frequency.update(set(terms))
+    
+    count = len(documents)
+    idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+    
+    postings = {}
+    for key in sorted(documents):
+        for term, weight in term_weights(documents[key], idf).items():
+            postings.setdefault(term, []).append((key, weight))
+    
+    return {'idf': idf, 'postings': postings}
+
+def get_index(documents):
+    """Index van de kandidaten, hergebruikt zolang de kandidaten gelijk blijven"""
+    global _INDEX
+    
+    corpus_hash = hash_documents(documents)
+    if _INDEX is None or _INDEX[0] != corpus_hash:
+        _INDEX = (corpus_hash, build_index(documents))
+    return _INDEX[1]
+
+def top_neighbours(queries, index, count=RELATED_COUNT, groups=None):
+    """
+    Top-k kandidaten per query (sleutel -> termen) in één doorgang over de index:
+    per term van de query worden de scores van alle kandidaten met die term opgeteld
+    (ijle matrixvermenigvuldiging). Een query is nooit zijn eigen buur; gelijke
+    scores worden op sleutel gesorteerd, zodat het resultaat deterministisch is.
+    Met groups telt een kandidaat enkel mee als hij in dezelfde groep zit als de
+    query; een query zonder groep krijgt dan geen kandidaten.
+    """
+    postings = index['postings']
+    result = {}
+    
+    for key, terms in queries.items():
+        group = groups.get(key) if groups is not None else None
+        if groups is not None and group is None:
+            result[key] = []
+            continue
+        
+        scores = Counter()
+        for term, weight in term_weights(terms, index['idf']).items():
+            for candidate, candidate_weight in postings.get(term, ()):
+                if groups is None or groups.get(candidate) == group:
+                    scores[candidate] += weight * candidate_weight
+        scores.pop(key, None)
+        
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        result[key] = [candidate for candidate, score in ranked[:count]]
+    
+    return result
+
+def load_related_cache(cache_path=RELATED_CACHE_PATH):
+    """Laad de cache van de aanbevelingen (één keer per proces)"""
+    global _RELATED_CACHE
+    
+    if _RELATED_CACHE is None:
+        _RELATED_CACHE = {'corpus': None, 'castles': {}}
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    _RELATED_CACHE = json.load(f)
+            except (OSError, ValueError):
+                pass
+    
+    return _RELATED_CACHE
+
+def save_related_cache(cache_path=RELATED_CACHE_PATH):
+    """Schrijf de cache weg als er iets veranderd is (atomair via een tijdelijk bestand)"""
+    global _RELATED_CACHE_DIRTY
+    
+    if _RELATED_CACHE is None or not _RELATED_CACHE_DIRTY:
+        return
+    
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_RELATED_CACHE, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+    _RELATED_CACHE_DIRTY = False
+
+def recommend(queries, documents, count=RELATED_COUNT, groups=None):
+    """
+    Gerelateerde kandidaten voor elke query (sleutel -> termen), met de cache:
+    enkel queries waarvan de termen of de kandidaten veranderd zijn worden berekend.
+    groups (sleutel -> groep, voor queries en kandidaten) beperkt de kandidaten tot
+    de groep van de query. Retourneert sleutel -> lijst sleutels van kandidaten
+    (minder dan count als de groep te weinig kandidaten heeft).
+    """
+    global _RELATED_CACHE_DIRTY
+    
+    cache = load_related_cache()
+    corpus_hash = hash_documents(documents, groups)
+    if cache['corpus'] != corpus_hash:
+        cache['corpus'] = corpus_hash
+        cache['castles'] = {}
+        _RELATED_CACHE_DIRTY = True
+    
+    hashes = {
+        key: hash_terms(terms if groups is None else terms + [f'groep:{groups.get(key)}'])
+        for key, terms in queries.items()
+    }
+    stale = {
+        key: terms for key, terms in queries.items()
+        if cache['castles'].get(key, {}).get('hash') != hashes[key]
+    }
+    
+    if stale:
+        for key, related in top_neighbours(stale, get_index(documents), count, groups).items():
+            cache['castles'][key] = {'hash': hashes[key], 'related': related}
+        _RELATED_CACHE_DIRTY = True
+    
+    return {key: cache['castles'][key]['related'][:count] for key in queries}
@@ -8,7 +8,8 @@ et restaurer le placeholder d'image à gauche avec les heures d'ouverture à dro
 
 import os
 import re
-import glob
+
+from page_discovery import find_castle_files
 
 def remove_images_and_restore_placeholder(file_path):
     """Supprimer les images et restaurer le placeholder"""
@@ -56,19 +57,7 @@ def main():
     print("=== SUPPRESSION DE TOUTES LES IMAGES ===")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Pages de châteaux trouvées: {len(castle_files)}")
     
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Eén gedeelde JavaScript-bundel voor de FAQ van de kasteelpagina's.
+De bronbestanden uit js/ worden samengevoegd tot js/site.<hash>.js; de hash van de
+inhoud zit in de naam, zodat de browser de bundel onbeperkt mag cachen en een
+nieuwe versie automatisch een nieuwe naam krijgt. De pagina's laden de bundel met
+defer, in plaats van telkens dezelfde inline <script> mee te sturen.
+De bundel staat naast zijn bronnen in js/ (en wordt mee ingecheckt), zodat de
+pagina's ook werken als de repository zelf geserveerd wordt (server.js); zodra een
+pagina naar de bundel verwijst, wordt hij daar geschreven. publish_site.py neemt
+hem mee naar dist/js/.
+booking.js hoort er bewust niet bij: enkel pagina's met een reserveringsformulier
+laden dat script, met een eigen <script>-tag.
+"""
+
+import os
+import re
+import glob
+import hashlib
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+JS_DIR = os.path.join(SITE_ROOT, 'js')
+
+# Bronbestanden van de bundel, in volgorde
+BUNDLE_SOURCES = ('faq.js',)
+BUNDLE_NAME = 'site'
+
+# Lengte van de hash in de bestandsnaam
+HASH_LENGTH = 10
+
+# <script>-tag van een (eerdere) versie van de bundel
+BUNDLE_TAG_PATTERN = re.compile(r'\n?<script src="\./js/' + BUNDLE_NAME + r'\.[0-9a-f]+\.js" defer></script>')
+
+# In-procescache: (map, stempel van de bronnen) -> (bestandsnaam, inhoud) van de bundel
+_BUNDLES = {}
+
+def source_stamp(js_dir=JS_DIR):
+    """Grootte en wijzigingstijd van de bronbestanden"""
+    stamp = []
+    for name in BUNDLE_SOURCES:
+        stat = os.stat(os.path.join(js_dir, name))
+        stamp.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(stamp)
+
+def read_bundle(js_dir=JS_DIR):
+    """Inhoud van de bundel: de bronnen achter elkaar, elk met zijn naam als commentaar"""
+    parts = []
+    for name in BUNDLE_SOURCES:
+        with open(os.path.join(js_dir, name), 'r', encoding='utf-8') as f:
+            parts.append(f"/* {name} */\n{f.read().rstrip()}\n")
+    return '\n'.join(parts)
+
+def get_bundle(js_dir=JS_DIR):
+    """Bestandsnaam (bv. 'site.0123456789.js') en inhoud van de bundel, zonder te schrijven"""
+    key = (js_dir, source_stamp(js_dir))
+    if key not in _BUNDLES:
+        bundle = read_bundle(js_dir)
+        digest = hashlib.sha256(bundle.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+        _BUNDLES[key] = (f'{BUNDLE_NAME}.{digest}.js', bundle)
+    return _BUNDLES[key]
+
+def bundle_path(js_dir=JS_DIR):
+    """Pad van de bundel relatief aan de site-root (bv. 'js/site.0123456789.js')"""
+    return f'js/{get_bundle(js_dir)[0]}'
+
+def build_bundle(output_dir, js_dir=JS_DIR):
+    """
+    Schrijf de bundel naar output_dir (de js/-map van de gepubliceerde site) als die
+    nog niet bestaat en ruim oudere versies op. Retourneert het volledige pad.
+    """
+    filename, bundle = get_bundle(js_dir)
+    output_path = os.path.join(output_dir, filename)
+    
+    if not os.path.exists(output_path):
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(bundle)
+        os.replace(tmp_path, output_path)
+    
+    for old_path in glob.glob(os.path.join(output_dir, f'{BUNDLE_NAME}.*.js')):
+        if os.path.basename(old_path) != filename:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+    
+    return output_path
+
+def bundle_script_tag(js_dir=JS_DIR):
+    """<script>-tag die de bundel uitgesteld (defer) laadt; de bundel zelf wordt in js_dir geschreven"""
+    build_bundle(js_dir, js_dir)
+    return f'<script src="./{bundle_path(js_dir)}" defer></script>'
+
+def main():
+    """Hoofdfunctie"""
+    print("=== JAVASCRIPT BUNDEL ===")
+    
+    filename, bundle = get_bundle()
+    
+    print(f"Bronnen: {', '.join(BUNDLE_SOURCES)}")
+    build_bundle(JS_DIR)
+    print(f"✓ js/{filename} ({len(bundle.encode('utf-8'))} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline die elke kasteelpagina één keer inleest, alle geregistreerde transformaties
+in volgorde op de inhoud in het geheugen toepast en de pagina hoogstens één keer wegschrijft.
+Vervangt het achter elkaar draaien van add_breadcrumbs.py, add_faq_sections.py, ...
+
+Een build-manifest (.build/pipeline_manifest.json) houdt per pagina de grootte,
+wijzigingstijd en inhoudshash bij, samen met de handtekening van de transformaties
+(versie + hash van de gegevens waarvan ze afhangen). Ongewijzigde pagina's worden
+bij een volgende run overgeslagen zonder ze te openen.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import add_breadcrumbs
+import add_castle_images
+import add_faq_sections
+import add_intro_links
+import add_opening_hours
+import add_related_castle_images
+import create_unique_intro_texts
+import geo_index
+import image_dimensions
+import instrumentation
+import page_cache
+import related_castles
+import update_addresses_comprehensive
+import update_related_castles_descriptions
+from page_executor import map_pages
+from page_discovery import find_castle_files
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(SITE_ROOT, 'chateaux_images')
+ASSET_IMAGES_DIR = os.path.join(SITE_ROOT, 'assets', 'img')
+MANIFEST_PATH = os.path.join(SITE_ROOT, '.build', 'pipeline_manifest.json')
+
+# Geregistreerde transformaties, in de volgorde waarin ze worden uitgevoerd
+TRANSFORMS = []
+
+def register_transform(name, version=1, depends_on=None):
+    """
+    Registreer een transformatie: functie(content, filename) -> nieuwe content.
+    Verhoog version bij een codewijziging; depends_on is een functie die de gegevens
+    teruggeeft waarvan de transformatie afhangt (tabellen, templates, ...). Ze wordt
+    bij elke run voor de handtekening opgeroepen en mag niets schrijven of bouwen.
+    """
+    def decorator(func):
+        TRANSFORMS.append({'name': name, 'func': func, 'version': version, 'depends_on': depends_on})
+        return func
+    return decorator
+
+@register_transform('intro_text', version=3, depends_on=lambda: create_unique_intro_texts.CASTLE_UNIQUE_INFO)
+def transform_intro_text(content, filename):
+    return create_unique_intro_texts.update_intro_content(content, filename)
+
+# Werkt op de intro van intro_text: hangt dus ook af van die teksten
+@register_transform('intro_links', version=2, depends_on=lambda: (
+    add_intro_links.PROVINCES_MAPPING,
+    create_unique_intro_texts.CASTLE_UNIQUE_INFO
+))
+def transform_intro_links(content, filename):
+    new_content, message = add_intro_links.add_intro_links_to_content(content, filename)
+    return new_content
+
+@register_transform('breadcrumb', depends_on=lambda: add_breadcrumbs.PROVINCES_MAPPING)
+def transform_breadcrumb(content, filename):
+    return add_breadcrumbs.add_breadcrumb_to_castle_content(content, filename)
+
+@register_transform('castle_image', depends_on=lambda: sorted(os.listdir(IMAGES_DIR)))
+def transform_castle_image(content, filename):
+    new_content, message = add_castle_images.add_castle_image_to_content(content, filename, IMAGES_DIR)
+    return new_content
+
+@register_transform('opening_hours', depends_on=lambda: add_opening_hours.OPENING_HOURS_DATABASE)
+def transform_opening_hours(content, filename):
+    return add_opening_hours.update_opening_hours_content(content, filename)
+
+@register_transform('address', version=2, depends_on=update_addresses_comprehensive.get_comprehensive_castle_addresses)
+def transform_address(content, filename):
+    new_content, message = update_addresses_comprehensive.update_address_content(content, filename)
+    return new_content
+
+@register_transform('related_castles', version=2, depends_on=lambda: (
+    update_related_castles_descriptions.CASTLES_DATABASE,
+    update_related_castles_descriptions.CANDIDATES,
+    update_related_castles_descriptions.REGIONS,
+    update_related_castles_descriptions.REGION_WEIGHT,
+    update_related_castles_descriptions.RELATED_MODE,
+    add_breadcrumbs.PROVINCES_MAPPING,
+    geo_index.load_gazetteer(),
+    create_unique_intro_texts.CASTLE_UNIQUE_INFO,
+    related_castles.RELATED_VERSION
+))
+def transform_related_castles(content, filename):
+    return update_related_castles_descriptions.update_related_castles_content(content, filename)
+
+@register_transform('related_images', depends_on=add_related_castle_images.create_image_mapping)
+def transform_related_images(content, filename):
+    new_content, message = add_related_castle_images.add_related_images_to_content(content)
+    return new_content
+
+@register_transform('plain_images')
+def transform_plain_images(content, filename):
+    return add_castle_images.remove_responsive_images_from_content(content)
+
+@register_transform('image_dimensions', depends_on=lambda: (
+    image_dimensions.list_images(IMAGES_DIR),
+    image_dimensions.list_images(ASSET_IMAGES_DIR)
+))
+def transform_image_dimensions(content, filename):
+    return image_dimensions.add_dimensions_to_content(content, SITE_ROOT)
+
+@register_transform('faq', depends_on=lambda: add_faq_sections.FAQ_DATABASE)
+def transform_faq(content, filename):
+    return add_faq_sections.add_faq_content(content, filename)
+
+@register_transform('faq_javascript', version=2, depends_on=add_faq_sections.add_faq_javascript)
+def transform_faq_javascript(content, filename):
+    return add_faq_sections.add_faq_javascript_to_content(content)
+
+def hash_data(data):
+    """Stabiele hash van tabellen, lijsten en strings"""
+    serialized = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def transform_signature(transform):
+    """Handtekening van een transformatie: naam, versie en hash van de afhankelijke gegevens"""
+    data = transform['depends_on']() if transform['depends_on'] else None
+    return f"{transform['name']}:{transform['version']}:{hash_data(data)}"
+
+def pipeline_signature(transforms=None):
+    """Gecombineerde handtekening van alle transformaties in volgorde"""
+    signatures = [transform_signature(t) for t in (TRANSFORMS if transforms is None else transforms)]
+    return hash_data(signatures)
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Lees het build-manifest; een ontbrekend of onleesbaar manifest is leeg"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'pages': {}}
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Schrijf het build-manifest atomisch weg"""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def hash_content(content):
+    """SHA-256 van de pagina-inhoud"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def page_entry(file_path, content, signature):
+    """Manifestregel voor een pagina na verwerking"""
+    stat = os.stat(file_path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hash_content(content),
+        'signature': signature
+    }
+
+def is_page_current(file_path, entry, signature):
+    """
+    Controleer of een pagina sinds de vorige run ongewijzigd is.
+    Gelijke grootte en wijzigingstijd volstaan; anders beslist de inhoudshash.
+    Retourneert (actueel, content of None als de pagina niet gelezen werd).
+    """
+    if not entry or entry.get('signature') != signature:
+        return False, None
+    
+    stat = os.stat(file_path)
+    if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+        return True, None
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    return hash_content(content) == entry['sha256'], content
+
+def run_transforms(content, filename, transforms=None):
+    """
+    Pas alle transformaties toe op de inhoud; retourneer (content, gewijzigde transformaties).
+    Zet een transformatie de inhoud terug naar die van vóór een eerdere wijziging
+    (intro_text zet de intro zonder links terug, intro_links voegt ze opnieuw toe),
+    dan heffen die wijzigingen elkaar op en tellen ze niet mee.
+    """
+    history = []  # (inhoud vóór de wijziging, naam) per transformatie die iets wijzigde
+    
+    for transform in (TRANSFORMS if transforms is None else transforms):
+        if instrumentation.is_enabled():
+            new_content = instrumentation.run_transform(transform, content, filename)
+        else:
+            new_content = transform['func'](content, filename)
+        
+        if new_content != content:
+            for i, (before, name) in enumerate(history):
+                if before == new_content:
+                    del history[i:]
+                    break
+            else:
+                history.append((content, transform['name']))
+            content = new_content
+    
+    return content, [name for before, name in history]
+
+def process_page(file_path, transforms=None, content=None):
+    """
+    Lees een pagina één keer, voer de transformaties uit en schrijf hoogstens één keer.
+    Een nieuwe regel van de paginacache gaat mee met het resultaat ('page_entry'): een
+    worker van de procespool werkt op een kopie van de cache van het hoofdproces.
+    """
+    filename = os.path.basename(file_path)
+    result = {'file': filename, 'changed': [], 'written': False, 'error': None, 'content': None, 'page_entry': None}
+    cached_entry = page_cache.get_entry(file_path)
+    
+    try:
+        if content is None:
+            # Via de paginacache: bekende sectieposities hoeven niet opnieuw geparst te worden
+            start = time.perf_counter()
+            content, page = page_cache.read_page(file_path)
+            if instrumentation.is_enabled():
+                instrumentation.record_read(content, time.perf_counter() - start)
+        
+        new_content, result['changed'] = run_transforms(content, filename, transforms)
+        
+        if new_content != content:
+            start = time.perf_counter()
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            if instrumentation.is_enabled():
+                instrumentation.record_write(new_content, time.perf_counter() - start)
+            result['written'] = True
+            page_cache.update_page(file_path, new_content)
+        
+        result['content'] = new_content
+    
+    except Exception as e:
+        result['error'] = str(e)
+    
+    entry = page_cache.get_entry(file_path)
+    if entry is not cached_entry:
+        result['page_entry'] = entry
+    
+    if instrumentation.is_enabled():
+        # Meetgegevens gaan mee met het resultaat, ook vanuit een worker van de procespool
+        instrumentation.record_page()
+        result['metrics'] = instrumentation.collect_metrics()
+    
+    return result
+
+def build_pages(castle_files, transforms=None, manifest_path=MANIFEST_PATH, workers=None):
+    """
+    Incrementele build: verwerk enkel de pagina's waarvan de inhoud of de
+    transformaties veranderd zijn, en werk het manifest bij.
+    Retourneert de lijst met resultaten van de verwerkte pagina's.
+    """
+    manifest = load_manifest(manifest_path)
+    signature = pipeline_signature(transforms)
+    pages = {}
+    stale_files = []
+    
+    for file_path in castle_files:
+        filename = os.path.basename(file_path)
+        entry = manifest['pages'].get(filename)
+        
+        current, content = is_page_current(file_path, entry, signature)
+        if current:
+            if content is not None:
+                # Enkel aangeraakt: nieuwe stat bewaren zodat de hash niet opnieuw nodig is
+                entry = page_entry(file_path, content, signature)
+            pages[filename] = entry
+        else:
+            stale_files.append(file_path)
+    
+    # Eigen transformatielijsten zijn niet picklebaar en blijven in dit proces
+    if transforms is None:
+        results = list(map_pages(process_page, stale_files, workers=workers))
+    else:
+        results = [process_page(file_path, transforms) for file_path in stale_files]
+    
+    for file_path, result in zip(stale_files, results):
+        if 'metrics' in result:
+            instrumentation.add_metrics(result.pop('metrics'))
+        if result['page_entry'] is not None:
+            page_cache.put_entry(file_path, result.pop('page_entry'))
+        if not result['error']:
+            pages[result['file']] = page_entry(file_path, result['content'], signature)
+    
+    manifest['pages'] = pages
+    save_manifest(manifest, manifest_path)
+    page_cache.save_page_cache()
+    
+    return results
+
+def main():
+    """Hoofdfunctie"""
+    print("=== PAGINA PIPELINE ===")
+    print(f"Transformaties: {', '.join(t['name'] for t in TRANSFORMS)}")
+    
+    castle_files = find_castle_files()
+    print(f"Gevonden kasteelbestanden: {len(castle_files)}")
+    
+    written_count = 0
+    error_count = 0
+    transform_counts = {t['name']: 0 for t in TRANSFORMS}
+    
+    # cProfile en tracemalloc zien enkel dit proces: dan zonder procespool
+    instrumentation.start_run()
+    
+    # Aanbevelingen en afmetingen van de afbeeldingen in één doorgang, vóór de workers starten
+    update_related_castles_descriptions.prepare_related_castles(castle_files)
+    image_dimensions.probe_directory(IMAGES_DIR)
+    image_dimensions.probe_directory(ASSET_IMAGES_DIR)
+    results = build_pages(castle_files, workers=1 if instrumentation.needs_serial() else None)
+    related_castles.save_related_cache()
+    
+    for result in results:
+        if result['error']:
+            print(f"  ✗ Fout bij {result['file']}: {result['error']}")
+            error_count += 1
+            continue
+        
+        for name in result['changed']:
+            transform_counts[name] += 1
+        
+        if result['written']:
+            written_count += 1
+            print(f"  ✓ {result['file']}: {', '.join(result['changed'])}")
+    
+    print(f"\n=== EINDRESULTAAT ===")
+    print(f"Totaal kasteelpaginas: {len(castle_files)}")
+    print(f"Ongewijzigd overgeslagen: {len(castle_files) - len(results)}")
+    print(f"Paginas verwerkt: {len(results)}")
+    print(f"Paginas weggeschreven: {written_count}")
+    print(f"Fouten: {error_count}")
+    for name, count in transform_counts.items():
+        print(f"  {name}: {count} paginas gewijzigd")
+    
+    report_path = instrumentation.finish_run({
+        'pages_total': len(castle_files),
+        'pages_skipped': len(castle_files) - len(results),
+        'pages_written': written_count,
+        'errors': error_count
+    })
+    if report_path:
+        print(f"Meetrapport: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+"""De scripts staan in de root van de repository; maak ze importeerbaar voor de tests."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+Vingerafdrukken van asset_fingerprint: de herschreven pagina's verwijzen naar
+precies dezelfde URL's als een attribuut-voor-attribuut nagerekende versie
+(absolute URL's en onbekende bestanden blijven staan), en de kopieën met hash
+worden correct aangemaakt.
+"""
+
+import glob
+import os
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+import asset_fingerprint
+from asset_fingerprint import (fingerprint_assets, fingerprint_name, is_fingerprinted,
+                               rewrite_asset_references, write_headers)
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIGEST = '0123456789abcdef'
+
+class UrlCollector(HTMLParser):
+    """Alle URL's in src, href, srcset en content, in volgorde"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls = []
+    
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == 'srcset':
+                self.urls.extend(part.split()[0] for part in value.split(',') if part.strip())
+            elif name in ('src', 'href', 'content'):
+                self.urls.append(value)
+
+def page_urls(content):
+    collector = UrlCollector()
+    collector.feed(content)
+    return collector.urls
+
+def expected_url(url, mapping):
+    """Brute kracht: de URL na het herschrijven"""
+    for prefix in ('./', '/', ''):
+        if url.startswith(prefix) and not url.startswith('//'):
+            path = url[len(prefix):]
+            break
+    cut = min([i for i in (path.find('?'), path.find('#')) if i >= 0] or [len(path)])
+    hashed_path = mapping.get(unquote(path[:cut]))
+    if hashed_path is None:
+        return url
+    return url[:len(url) - len(path)] + hashed_path + path[cut:]
+
+def site_mapping():
+    """Elk bestand in de vingerafdrukmappen van de bronboom, met een vaste hash"""
+    mapping = {}
+    for directory in asset_fingerprint.FINGERPRINT_DIRS:
+        for path in glob.glob(os.path.join(SITE_ROOT, directory, '**', '*'), recursive=True):
+            if os.path.isfile(path):
+                relative_path = os.path.relpath(path, SITE_ROOT).replace(os.sep, '/')
+                mapping[relative_path] = (relative_path if is_fingerprinted(relative_path)
+                                          else fingerprint_name(relative_path, DIGEST))
+    return mapping
+
+def test_fingerprint_name_and_detection():
+    hashed = fingerprint_name('chateaux_images/Braem kasteel.jpg', DIGEST)
+    assert hashed == 'chateaux_images/Braem kasteel.0123456789.jpg'
+    assert is_fingerprinted(hashed)
+    assert is_fingerprinted('js/site.92d5a3204c.js')
+    assert not is_fingerprinted('js/site.js')
+    assert not is_fingerprinted('chateaux_images/kasteel.2019.jpg')
+
+def test_rewrite_keeps_prefix_query_and_absolute_urls():
+    mapping = {'chateaux_images/a b.jpg': 'chateaux_images/a b.0123456789.jpg',
+               'js/menu.js': 'js/menu.0123456789.js'}
+    content = ('<img src="./chateaux_images/a%20b.jpg" srcset="/chateaux_images/a%20b.jpg 480w">'
+               '<script src="js/menu.js?v=2"></script>'
+               '<meta property="og:image" content="https://kastelen.be/chateaux_images/a%20b.jpg">'
+               '<img src="chateaux_images/ontbreekt.jpg">')
+    assert rewrite_asset_references(content, mapping) == (
+        '<img src="./chateaux_images/a b.0123456789.jpg" srcset="/chateaux_images/a b.0123456789.jpg 480w">'
+        '<script src="js/menu.0123456789.js?v=2"></script>'
+        '<meta property="og:image" content="https://kastelen.be/chateaux_images/a%20b.jpg">'
+        '<img src="chateaux_images/ontbreekt.jpg">'
+    )
+
+def test_rewrite_matches_brute_force_on_site():
+    mapping = site_mapping()
+    rewritten = 0
+    for path in sorted(glob.glob(os.path.join(SITE_ROOT, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        before = page_urls(content)
+        after = page_urls(rewrite_asset_references(content, mapping))
+        assert after == [expected_url(url, mapping) for url in before], path
+        rewritten += sum(1 for old, new in zip(before, after) if old != new)
+    assert rewritten > 0
+
+def test_fingerprint_assets_links_hashed_copies(tmp_path):
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'menu.js').write_text('menu()', encoding='utf-8')
+    (tmp_path / 'js' / 'site.0123456789.js').write_text('site()', encoding='utf-8')
+    
+    mapping = fingerprint_assets(str(tmp_path), ['js/menu.js', 'js/site.0123456789.js'])
+    digest = asset_fingerprint.file_digest(str(tmp_path / 'js' / 'menu.js'))
+    assert mapping == {'js/menu.js': f'js/menu.{digest[:10]}.js',
+                       'js/site.0123456789.js': 'js/site.0123456789.js'}
+    
+    hashed = tmp_path / mapping['js/menu.js']
+    assert hashed.read_text(encoding='utf-8') == 'menu()'
+    assert os.path.samefile(hashed, tmp_path / 'js' / 'menu.js')
+    assert fingerprint_assets(str(tmp_path), ['js/menu.js']) == {'js/menu.js': mapping['js/menu.js']}
+
+def test_write_headers(tmp_path):
+    headers_path = write_headers(str(tmp_path), {'js/menu.0123456789.js'}, ['index.html', 'antwerpen.html'])
+    with open(headers_path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    
+    assert lines[1:] == [
+        '/antwerpen.html', f'  Cache-Control: {asset_fingerprint.HTML_CACHE_CONTROL}',
+        '/', f'  Cache-Control: {asset_fingerprint.HTML_CACHE_CONTROL}',
+        '/index.html', f'  Cache-Control: {asset_fingerprint.HTML_CACHE_CONTROL}',
+        '/js/menu.0123456789.js', f'  Cache-Control: {asset_fingerprint.IMMUTABLE_CACHE_CONTROL}',
+    ]
+    assert not os.path.exists(headers_path + '.tmp')
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ontdubbelen, zuiveren en minificeren van css_bundle: na het ontdubbelen geeft de
+cascade voor elke selector nog dezelfde waarden (nagerekend op willekeurige en op
+de echte stylesheets), en het zuiveren houdt precies de selectors waarvan elke
+class en id gebruikt wordt.
+"""
+
+import glob
+import os
+import random
+
+import pytest
+
+import css_bundle
+from css_bundle import (collect_source, collect_used_names, dedupe_rules, parse_css,
+                        purge_rules, selector_names, serialize, walk_rules)
+
+STYLESHEETS = sorted(css_bundle.CSS_BLOCKS)
+
+def cascade(nodes):
+    """
+    Brute kracht: (context, selectors, eigenschap) -> winnende (waarde, important),
+    met !important boven gewone declaraties en anders de laatste in bronvolgorde.
+    """
+    result = {}
+    for context, rule in walk_rules(nodes):
+        for prop, value, important in rule['declarations']:
+            key = (context, rule['selectors'], prop)
+            if important or not result.get(key, (None, False))[1]:
+                result[key] = (value, important)
+    return result
+
+def random_stylesheet(rng, rules=60):
+    """Willekeurige CSS met weinig selectors en eigenschappen, dus veel overschrijvingen"""
+    selectors = ['.a', '.b', '#c', '.a .b', '.a,.b']
+    props = ['color', 'margin', 'padding', 'display']
+    values = ['0', '1px', 'red', 'none', 'blue']
+    parts = []
+    for _ in range(rules):
+        body = ';'.join(
+            f"{rng.choice(props)}:{rng.choice(values)}{' !important' if rng.random() < 0.2 else ''}"
+            for _ in range(rng.randint(1, 4))
+        )
+        rule = f'{rng.choice(selectors)}{{{body}}}'
+        if rng.random() < 0.3:
+            rule = f'@media (max-width: 768px){{{rule}}}'
+        parts.append(rule)
+    return '\n'.join(parts)
+
+def site_pages():
+    pages = {}
+    for path in glob.glob(os.path.join(css_bundle.SITE_ROOT, '*.html')):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[path] = f.read()
+    return pages
+
+def test_later_declaration_replaces_earlier():
+    nodes = parse_css('.a{color:red;margin:0}.b{color:green}.a{color:blue}')
+    assert dedupe_rules(nodes) == 1
+    assert serialize(nodes) == '.a{margin:0}.b{color:green}.a{color:blue}'
+
+def test_important_survives_later_normal_declaration():
+    nodes = parse_css('.a{color:red !important}.a{color:blue}.a{color:green !important}')
+    assert dedupe_rules(nodes) == 2
+    assert serialize(nodes) == '.a{}.a{}.a{color:green!important}'
+
+def test_exact_duplicate_in_one_rule_is_removed():
+    nodes = parse_css('.a{color:red;color:red}')
+    assert dedupe_rules(nodes) == 1
+    assert serialize(nodes) == '.a{color:red}'
+
+def test_other_context_or_selector_list_is_kept():
+    css = '.a{color:red}@media (max-width:768px){.a{color:blue}}.a,.b{color:green}'
+    nodes = parse_css(css)
+    assert dedupe_rules(nodes) == 0
+    assert serialize(nodes) == '.a{color:red}@media (max-width:768px){.a{color:blue}}.a,.b{color:green}'
+
+@pytest.mark.parametrize('seed', range(20))
+def test_dedupe_keeps_cascade_of_random_css(seed):
+    nodes = parse_css(random_stylesheet(random.Random(seed)))
+    before = cascade(nodes)
+    removed = dedupe_rules(nodes)
+    assert cascade(nodes) == before
+    assert removed > 0
+    assert dedupe_rules(nodes) == 0
+
+@pytest.mark.parametrize('name', STYLESHEETS)
+def test_dedupe_keeps_cascade_of_site_css(name):
+    nodes = parse_css(collect_source(name))
+    before = cascade(nodes)
+    dedupe_rules(nodes)
+    assert cascade(nodes) == before
+
+def test_selector_names_skip_attributes_and_arguments():
+    assert selector_names('.card > a#top:hover') == [('.', 'card'), ('#', 'top')]
+    assert selector_names('a[href$=".pdf"]') == []
+    assert selector_names('li:not(.active) .x') == [('.', 'x')]
+    assert selector_names('p:nth-child(2n+1)') == []
+
+def test_purge_drops_unused_selectors_and_empty_blocks():
+    nodes = parse_css('.a,.b{color:red}.c{color:blue}@media print{.c{display:none}}p{margin:0}')
+    nodes, purged = purge_rules(nodes, {'a'})
+    assert purged == 3
+    assert serialize(nodes) == '.a{color:red}p{margin:0}'
+
+def test_used_names_come_from_attributes_and_scripts(tmp_path):
+    (tmp_path / 'menu.js').write_text("el.classList.add('is-open');", encoding='utf-8')
+    html = '<div class="card  wide" id=\'top\'><script>x.className = "hidden fade-in";</script></div>'
+    used = collect_used_names([html], str(tmp_path))
+    assert {'card', 'wide', 'top', 'hidden', 'fade-in', 'is-open'} <= used
+    assert 'is-open' not in collect_used_names([html], None)
+
+@pytest.mark.parametrize('name', STYLESHEETS)
+def test_purge_matches_brute_force_on_site(name):
+    pages = site_pages()
+    used = collect_used_names([content for content in pages.values()
+                               if name in css_bundle.linked_stylesheets(content)])
+    nodes = parse_css(collect_source(name))
+    
+    expected = set()
+    unused = 0
+    for context, rule in walk_rules(nodes):
+        for selector in rule['selectors']:
+            if not all(n in used for kind, n in selector_names(selector)):
+                unused += 1
+            elif rule['declarations']:
+                expected.add((context, selector))
+    
+    purged_nodes, purged = purge_rules(nodes, used)
+    kept = {(context, selector) for context, rule in walk_rules(purged_nodes) for selector in rule['selectors']}
+    assert kept == expected
+    assert purged == unused
+
+@pytest.mark.parametrize('name', STYLESHEETS)
+def test_serialize_round_trips(name):
+    nodes = parse_css(collect_source(name))
+    css = serialize(nodes)
+    assert parse_css(css) == nodes
+    assert serialize(parse_css(css)) == css
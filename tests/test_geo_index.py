@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+De k-d-boom van geo_index tegenover brute kracht: de k dichtste punten (met
+gelijke afstanden opgelost op sleutel) en de punten binnen een straal.
+"""
+
+import math
+import random
+
+import pytest
+
+import geo_index
+from geo_index import build_kdtree, nearest, within
+from page_discovery import find_castle_files
+
+def random_points(count, seed, grid=None):
+    """Punten (x, y, sleutel) in een vak van 300 x 250 km; met grid op gehele km (veel gelijke afstanden)"""
+    rng = random.Random(seed)
+    points = []
+    for i in range(count):
+        x, y = rng.uniform(0, 300), rng.uniform(0, 250)
+        if grid:
+            x, y = float(round(x / grid)), float(round(y / grid))
+        points.append((x, y, f'p{i:05d}'))
+    return points
+
+def brute_nearest(points, x, y, count, exclude=()):
+    distances = sorted((math.hypot(px - x, py - y), key) for px, py, key in points if key not in exclude)
+    return distances[:count]
+
+def brute_within(points, x, y, radius):
+    return sorted((distance, key) for distance, key in ((math.hypot(px - x, py - y), key) for px, py, key in points) if distance <= radius)
+
+@pytest.mark.parametrize('grid', [None, 10])
+def test_nearest_matches_brute_force(grid):
+    points = random_points(20000, seed=1, grid=grid)
+    tree = build_kdtree(points)
+    rng = random.Random(2)
+    
+    for _ in range(50):
+        x, y = rng.uniform(-20, 320), rng.uniform(-20, 270)
+        count = rng.choice([1, 3, 10, 50])
+        assert nearest(tree, x, y, count) == brute_nearest(points, x, y, count)
+
+def test_nearest_excludes_keys():
+    points = random_points(2000, seed=3)
+    tree = build_kdtree(points)
+    
+    for px, py, key in points[:50]:
+        assert nearest(tree, px, py, 3, exclude={key}) == brute_nearest(points, px, py, 3, exclude={key})
+
+def test_nearest_edge_cases():
+    points = random_points(5, seed=4)
+    tree = build_kdtree(points)
+    
+    assert nearest(tree, 0, 0, 0) == []
+    assert nearest(tree, 0, 0, 10) == brute_nearest(points, 0, 0, 10)
+    assert nearest(None, 0, 0, 3) == []
+
+@pytest.mark.parametrize('grid', [None, 10])
+def test_within_matches_brute_force(grid):
+    points = random_points(20000, seed=5, grid=grid)
+    tree = build_kdtree(points)
+    rng = random.Random(6)
+    
+    for _ in range(50):
+        x, y = rng.uniform(-20, 320), rng.uniform(-20, 270)
+        radius = rng.choice([0, 5, 10, 30])
+        assert within(tree, x, y, radius) == brute_within(points, x, y, radius)
+
+def test_every_castle_page_is_located():
+    index = geo_index.build_castle_index(find_castle_files())
+    
+    assert index['unlocated'] == []
+    assert len(index['locations']) == len(find_castle_files())
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""
+Posities van de secties volgens de html.parser-locator: geneste elementen,
+tags in commentaar en scripts, niet-gesloten elementen en de pagina's van de site.
+"""
+
+import glob
+import os
+
+import pytest
+
+from html_sections import SECTIONS, parse_sections, section_inner_html
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASTLE_PAGES = sorted(
+    path for path in glob.glob(os.path.join(SITE_ROOT, '*.html'))
+    if os.path.basename(path).startswith(('kasteel-', 'chateau-'))
+)
+
+def inner(content, name):
+    section = parse_sections(content)[name]
+    return content[section['inner_start']:section['inner_end']]
+
+def test_nested_intro_is_complete():
+    content = '<main><div class="intro"><div class="lead">a</div><p>b</p></div></main>'
+    assert section_inner_html(content, 'intro') == '<div class="lead">a</div><p>b</p>'
+
+def test_tags_in_comments_and_scripts_are_ignored():
+    content = '<main><!-- <div class="intro"> --><script>var x = "<div>";</script><div class="intro">c</div></main>'
+    assert inner(content, 'intro') == 'c'
+
+def test_unclosed_element_ends_with_its_parent():
+    content = '<main><section class="faq"><div>d</section><footer>e</footer></main>'
+    sections = parse_sections(content)
+    assert inner(content, 'faq') == '<div>d'
+    assert content[sections['footer']['start']:sections['footer']['end']] == '<footer>e</footer>'
+
+def test_class_matching():
+    content = "<MAIN><ASIDE class='hours-card wide'>f</ASIDE><div class=\"intro-extra\">g</div></MAIN>"
+    sections = parse_sections(content)
+    assert inner(content, 'hours-card') == 'f'
+    assert 'intro' not in sections
+
+@pytest.mark.parametrize('path', CASTLE_PAGES, ids=os.path.basename)
+def test_castle_page_sections(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    for name, section in parse_sections(content).items():
+        tag, section_class = SECTIONS[name]
+        html = content[section['start']:section['end']]
+        assert html.lower().startswith(f'<{tag}'), name
+        assert html.lower().endswith(f'</{tag}>'), name
+        if section_class:
+            assert section_class in content[section['start']:section['inner_start']], name
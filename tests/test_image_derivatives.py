@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""Responsieve versies van de kasteelafbeeldingen en de bijhorende <picture>-markup."""
+
+import os
+
+import pytest
+
+import add_castle_images
+import image_derivatives
+from image_derivatives import SIZES_CARD, SIZES_DETAIL, WIDTH_BUCKETS
+
+FAKE_SRCSETS = {
+    'webp': './chateaux_images/derivatives/x-480.webp 480w',
+    'jpg': './chateaux_images/derivatives/x-480.jpg 480w',
+}
+
+def test_only_card_images_are_lazy(monkeypatch):
+    monkeypatch.setattr(image_derivatives, 'build_srcsets', lambda image_name: FAKE_SRCSETS)
+    
+    detail = image_derivatives.render_picture_html('x.jpg', 'Kasteel', sizes=SIZES_DETAIL)
+    card = image_derivatives.render_picture_html('x.jpg', 'Kasteel', sizes=SIZES_CARD)
+    
+    assert detail.startswith('<picture><source type="image/webp"')
+    assert 'loading=' not in detail
+    assert 'loading="lazy"' in card
+
+def test_source_pages_get_a_plain_img(monkeypatch):
+    monkeypatch.setattr(image_derivatives, 'build_srcsets', lambda image_name: FAKE_SRCSETS)
+    
+    html = image_derivatives.render_image_html('x.jpg', 'Kasteel', sizes=SIZES_CARD)
+    
+    assert html == '<img src="./chateaux_images/x.jpg" alt="Kasteel" class="castle-image">'
+
+def test_picture_markup_only_at_publish_time(monkeypatch):
+    monkeypatch.setattr(image_derivatives, 'build_srcsets', lambda image_name: FAKE_SRCSETS)
+    source = '<div class="card-media"><img src="./chateaux_images/x.jpg" alt="Kasteel" class="castle-image"></div>'
+    
+    published = add_castle_images.add_responsive_images_to_content(source)
+    
+    assert published.startswith('<div class="card-media"><picture>')
+    assert add_castle_images.remove_responsive_images_from_content(published) == source
+
+def test_derivatives_are_written_outside_the_sources():
+    assert not image_derivatives.DERIVATIVES_DIR.startswith(image_derivatives.SOURCE_DIR + os.sep)
+
+def test_generate_derivatives(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    
+    source_dir = tmp_path / 'chateaux_images'
+    output_dir = tmp_path / 'derivatives'
+    source_dir.mkdir()
+    source_path = str(source_dir / 'Kasteel_test.jpg')
+    Image.new('RGB', (1000, 600), (120, 90, 60)).save(source_path, 'JPEG')
+    
+    formats = image_derivatives.supported_formats()
+    widths = [width for width in WIDTH_BUCKETS if width <= 1000]
+    
+    created, message = image_derivatives.generate_derivatives(source_path, str(output_dir))
+    assert created == len(widths) * len(formats), message
+    
+    for width in widths:
+        for extension, pil_format, mime_type, options in formats:
+            path = output_dir / image_derivatives.derivative_name('Kasteel_test.jpg', width, extension)
+            with Image.open(path) as image:
+                assert image.size == (width, round(600 * width / 1000))
+    
+    assert image_derivatives.generate_derivatives(source_path, str(output_dir)) == (0, "Al up-to-date")
+    
+    srcsets = image_derivatives.build_srcsets('Kasteel_test.jpg', str(output_dir))
+    assert srcsets['jpg'] == ', '.join(
+        f'./chateaux_images/derivatives/Kasteel_test-{width}.jpg {width}w' for width in widths
+    )
+
+def test_small_images_are_not_scaled_up(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    
+    source_path = str(tmp_path / 'klein.png')
+    Image.new('RGB', (300, 200)).save(source_path, 'PNG')
+    
+    assert image_derivatives.generate_derivatives(source_path, str(tmp_path / 'derivatives')) == (0, "Kleiner dan de kleinste breedte")
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""image_downloader tegen een lokale HTTP-server: download, dedup, redirect, retry en 304."""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import image_downloader
+
+IMAGE = b'\xff\xd8\xff\xe0' + b'kasteel' * 100
+ETAG = '"v1"'
+LAST_MODIFIED = 'Sat, 17 Oct 2026 10:00:00 GMT'
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Kleine server met een afbeelding, een redirect en een pad dat eerst 503 geeft"""
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            count = server.requests[self.path]
+            server.conditional.append(self.headers.get('If-None-Match'))
+        
+        if self.path == '/redirect.jpg':
+            self.send_response(302)
+            self.send_header('Location', '/castle.jpg')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/flaky.jpg' and count == 1:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path in ('/castle.jpg', '/flaky.jpg'):
+            if self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+                self.send_header('ETag', ETAG)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('ETag', ETAG)
+            self.send_header('Last-Modified', LAST_MODIFIED)
+            self.send_header('Content-Length', str(len(IMAGE)))
+            self.end_headers()
+            self.wfile.write(IMAGE)
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    monkeypatch.setattr(image_downloader, 'DEFAULT_HOST_INTERVAL', 0)
+    monkeypatch.setattr(image_downloader, 'BACKOFF_SECONDS', 0)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = Counter()
+    server.conditional = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    yield server, f'http://127.0.0.1:{server.server_address[1]}'
+    
+    server.shutdown()
+    server.server_close()
+
+def test_download_dedup_redirect_and_revalidation(stub_server, tmp_path):
+    server, base_url = stub_server
+    cache_path = str(tmp_path / 'http_cache.json')
+    jobs = [
+        (f'{base_url}/castle.jpg', str(tmp_path / 'a.jpg')),
+        (f'{base_url}/castle.jpg', str(tmp_path / 'b.jpg')),
+        (f'{base_url}/redirect.jpg', str(tmp_path / 'c.jpg')),
+    ]
+    
+    results = image_downloader.download_many(jobs, workers=2, cache_path=cache_path)
+    
+    assert [success for success, message in results] == [True, True, True]
+    assert results[1][1] == "Gekopieerd van a.jpg"
+    for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+        assert (tmp_path / name).read_bytes() == IMAGE
+    
+    # Dezelfde url één keer opgehaald; de redirect leidt naar dezelfde afbeelding
+    assert server.requests['/redirect.jpg'] == 1
+    assert server.requests['/castle.jpg'] == 2
+    
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    assert cache[f'{base_url}/castle.jpg']['etag'] == ETAG
+    assert cache[f'{base_url}/castle.jpg']['last_modified'] == LAST_MODIFIED
+    
+    # Tweede run: revalidatie met If-None-Match, 304 en geen nieuwe download
+    server.conditional.clear()
+    results = image_downloader.download_many(jobs, workers=2, cache_path=cache_path)
+    
+    assert results[0] == (True, "Niet gewijzigd (cache)")
+    assert results[1] == (True, "Niet gewijzigd (cache)")
+    assert ETAG in server.conditional
+    assert (tmp_path / 'a.jpg').read_bytes() == IMAGE
+
+def test_retry_after_server_error(stub_server, tmp_path):
+    server, base_url = stub_server
+    dest_path = str(tmp_path / 'flaky.jpg')
+    
+    results = image_downloader.download_many(
+        [(f'{base_url}/flaky.jpg', dest_path)], cache_path=str(tmp_path / 'http_cache.json')
+    )
+    
+    assert results == [(True, f"Gedownload ({len(IMAGE)} bytes)")]
+    assert server.requests['/flaky.jpg'] == 2
+
+def test_missing_file_is_reported(stub_server, tmp_path):
+    server, base_url = stub_server
+    
+    results = image_downloader.download_many(
+        [(f'{base_url}/missing.jpg', str(tmp_path / 'missing.jpg'))], cache_path=str(tmp_path / 'http_cache.json')
+    )
+    
+    assert results == [(False, "HTTP 404")]
+    assert not (tmp_path / 'missing.jpg').exists()
+
+def test_pool_connections_are_closed(stub_server, tmp_path):
+    server, base_url = stub_server
+    before = set(image_downloader._THREAD_CONNECTIONS)
+    
+    image_downloader.download_many(
+        [(f'{base_url}/castle.jpg', str(tmp_path / 'a.jpg'))], cache_path=str(tmp_path / 'http_cache.json')
+    )
+    
+    assert set(image_downloader._THREAD_CONNECTIONS) == before
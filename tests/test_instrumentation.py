@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Opties van PIPELINE_INSTRUMENT en het meten van de gecompileerde patronen."""
+
+import re
+import types
+
+import pytest
+
+import instrumentation
+
+@pytest.fixture(autouse=True)
+def restore_configuration():
+    yield
+    instrumentation.configure(frozenset())
+    instrumentation.collect_metrics()
+
+def test_parse_options():
+    assert instrumentation.parse_options(None) == (frozenset(), [])
+    assert instrumentation.parse_options('0') == (frozenset(), [])
+    assert instrumentation.parse_options('1') == (frozenset({'metrics'}), [])
+    assert instrumentation.parse_options('cprofile, Tracemalloc') == (frozenset({'metrics', 'cprofile', 'tracemalloc'}), [])
+    assert instrumentation.parse_options('cprofile,bogus') == (frozenset({'metrics', 'cprofile'}), ['bogus'])
+    assert instrumentation.parse_options('bogus') == (frozenset(), ['bogus'])
+
+def test_bad_value_warns_instead_of_raising(monkeypatch, capsys):
+    monkeypatch.setenv(instrumentation.ENV_VAR, 'bogus')
+    instrumentation.configure_from_environment()
+    
+    assert not instrumentation.is_enabled()
+    assert 'bogus' in capsys.readouterr().err
+
+def test_module_patterns_are_timed_and_restored():
+    module = types.ModuleType('fake_site_module')
+    module.WORD_PATTERN = re.compile(r'\w+')
+    original = module.WORD_PATTERN
+    re_functions = {name: getattr(re, name) for name in instrumentation.PATTERN_METHODS}
+    
+    instrumentation.configure(frozenset({'metrics'}))
+    instrumentation.remove_regex_hooks()
+    instrumentation.install_regex_hooks([module])
+    
+    assert module.WORD_PATTERN.sub('x', 'a b') == 'x x'
+    assert [match.group(0) for match in module.WORD_PATTERN.finditer('a b')] == ['a', 'b']
+    assert module.WORD_PATTERN.pattern == r'\w+'
+    assert {name: getattr(re, name) for name in instrumentation.PATTERN_METHODS} == re_functions
+    assert instrumentation.collect_metrics()['regex'][r'\w+']['calls'] == 2
+    
+    instrumentation.remove_regex_hooks()
+    assert module.WORD_PATTERN is original
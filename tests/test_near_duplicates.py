@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+MinHash en LSH-banding van near_duplicates tegenover een brute-force vergelijking
+van alle paren, op de introteksten van de site en op een synthetisch corpus.
+"""
+
+import argparse
+import random
+
+import pytest
+
+import near_duplicates
+from near_duplicates import find_near_duplicates, get_shingles, minhash_signature, estimate_jaccard, get_permutations
+
+def exact_jaccard(shingles1, shingles2):
+    return len(shingles1 & shingles2) / len(shingles1 | shingles2)
+
+def brute_force_clusters(texts, threshold, similarity):
+    """Alle paren vergelijken; clusters zijn de samenhangende groepen van paren boven de drempel"""
+    keys = list(texts)
+    parents = {key: key for key in keys}
+    
+    def root(key):
+        while parents[key] != key:
+            key = parents[key]
+        return key
+    
+    paired = set()
+    for i, key1 in enumerate(keys):
+        for key2 in keys[i + 1:]:
+            if similarity(key1, key2) >= threshold:
+                parents[root(key2)] = root(key1)
+                paired.update((key1, key2))
+    
+    groups = {}
+    for key in paired:
+        groups.setdefault(root(key), []).append(key)
+    return sorted(sorted(group) for group in groups.values())
+
+def lsh_clusters(texts, threshold):
+    return sorted(cluster['members'] for cluster in find_near_duplicates(texts, threshold))
+
+def synthetic_corpus(seed=7):
+    """Drie sjablonen met elk twintig varianten (andere kasteelnaam) en vijftig unieke teksten"""
+    rng = random.Random(seed)
+    vocabulary = [f'woord{i}' for i in range(2000)]
+    texts = {}
+    
+    for template in range(3):
+        words = rng.choices(vocabulary, k=80)
+        for variant in range(20):
+            text = list(words)
+            text[5] = f'kasteel{template}x{variant}'
+            texts[f'sjabloon-{template}-{variant}'] = ' '.join(text)
+    
+    for unique in range(50):
+        texts[f'uniek-{unique}'] = ' '.join(rng.choices(vocabulary, k=80))
+    
+    return texts
+
+@pytest.fixture(scope='module')
+def site_texts():
+    from castle_catalog import open_catalog, get_all_castles
+    
+    conn = open_catalog()
+    try:
+        return near_duplicates.get_intro_texts(get_all_castles(conn))
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize('threshold', [0.5, 0.8, 0.9])
+def test_lsh_matches_brute_force_on_site(site_texts, threshold):
+    permutations = get_permutations()
+    signatures = {key: minhash_signature(get_shingles(text), permutations) for key, text in site_texts.items()}
+    
+    expected = brute_force_clusters(site_texts, threshold, lambda key1, key2: estimate_jaccard(signatures[key1], signatures[key2]))
+    
+    assert lsh_clusters(site_texts, threshold) == expected
+
+def test_lsh_matches_exact_jaccard_on_synthetic_corpus():
+    texts = synthetic_corpus()
+    shingles = {key: get_shingles(text) for key, text in texts.items()}
+    
+    expected = brute_force_clusters(texts, 0.8, lambda key1, key2: exact_jaccard(shingles[key1], shingles[key2]))
+    
+    assert [len(group) for group in expected] == [20, 20, 20]
+    assert lsh_clusters(texts, 0.8) == expected
+
+def test_estimate_is_close_to_exact_jaccard():
+    rng = random.Random(3)
+    permutations = get_permutations()
+    
+    for overlap in (0, 10, 40, 70, 100):
+        common = {rng.getrandbits(32) for _ in range(overlap)}
+        shingles1 = common | {rng.getrandbits(32) for _ in range(100 - overlap)}
+        shingles2 = common | {rng.getrandbits(32) for _ in range(100 - overlap)}
+        
+        estimate = estimate_jaccard(minhash_signature(shingles1, permutations), minhash_signature(shingles2, permutations))
+        assert abs(estimate - exact_jaccard(shingles1, shingles2)) < 0.2
+
+def test_identical_texts_form_one_cluster():
+    texts = {'a': 'een twee drie vier', 'b': 'een twee drie vier', 'c': 'iets heel anders hier'}
+    
+    clusters = find_near_duplicates(texts)
+    
+    assert [cluster['members'] for cluster in clusters] == [['a', 'b']]
+    assert clusters[0]['min_similarity'] == 1.0
+
+@pytest.mark.parametrize('threshold', [0.3, 0.5, 0.8, 0.9, 0.95])
+def test_lsh_inflection_point_is_below_threshold(threshold):
+    bands, rows = near_duplicates.lsh_parameters(threshold)
+    
+    assert bands * rows == near_duplicates.NUM_PERM
+    assert (1 / bands) ** (1 / rows) <= threshold
+
+@pytest.mark.parametrize('value', ['abc', 'nan', '0', '-0.5', '1.5'])
+def test_invalid_threshold_is_rejected(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        near_duplicates.threshold_argument(value)
+
+def test_valid_threshold():
+    assert near_duplicates.threshold_argument('0.85') == 0.85
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Gerelateerde kastelen: elke kaart verwijst naar een pagina die bestaat, zowel bij
+de aanbevelingen op tekst als bij de terugval op afstand.
+"""
+
+import os
+
+import pytest
+
+import update_related_castles_descriptions
+from page_discovery import find_castle_files
+
+CASTLE_FILES = find_castle_files()
+EXISTING = {os.path.basename(castle_file) for castle_file in CASTLE_FILES}
+
+# Staan in CASTLES_DATABASE, maar hebben geen pagina
+MISSING_PAGES = ('kasteel-van-modave-modave.html', 'kasteel-van-rivieren-te-ganshoren.html')
+
+def test_candidates_without_page_are_dropped():
+    for castle_file in MISSING_PAGES:
+        assert castle_file in update_related_castles_descriptions.CASTLES_DATABASE
+        assert castle_file not in update_related_castles_descriptions.CANDIDATES
+    assert update_related_castles_descriptions.existing_candidates(['/x/kasteel-van-modave-modave.html']) == ['kasteel-van-modave-modave.html']
+
+@pytest.mark.parametrize('mode', ['tekst', 'afstand'])
+def test_related_castles_exist(monkeypatch, mode):
+    monkeypatch.setattr(update_related_castles_descriptions, 'RELATED_MODE', mode)
+    
+    recommendations = update_related_castles_descriptions.prepare_related_castles(CASTLE_FILES)
+    
+    for filename, related in recommendations.items():
+        assert len(related) == 3, filename
+        for castle in related:
+            assert castle['file'] in EXISTING, (filename, castle['file'])
+            assert castle['file'] != filename
+
+def test_freyr_keeps_a_valid_card():
+    related = update_related_castles_descriptions.get_related_castles('kasteel-van-freyr-freyr.html')
+    assert 'kasteel-van-modave-modave.html' not in [castle['file'] for castle in related]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+"""De <script>-tag van de FAQ-bundel verwijst naar een bestand dat naast de bronnen bestaat."""
+
+import os
+
+import script_bundle
+
+def test_bundle_tag_points_to_existing_file(tmp_path):
+    (tmp_path / 'faq.js').write_text('console.log(1);\n', encoding='utf-8')
+    (tmp_path / 'site.0000000000.js').write_text('oud', encoding='utf-8')
+    
+    tag = script_bundle.bundle_script_tag(str(tmp_path))
+    
+    filename = script_bundle.get_bundle(str(tmp_path))[0]
+    assert tag == f'<script src="./js/{filename}" defer></script>'
+    assert sorted(os.listdir(tmp_path)) == ['faq.js', filename]
+
+def test_committed_bundle_is_current():
+    filename = script_bundle.get_bundle()[0]
+    assert os.path.exists(os.path.join(script_bundle.JS_DIR, filename))
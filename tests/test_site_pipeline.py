@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+"""Welke transformaties tellen als gewijzigd wanneer latere transformaties eerdere wijzigingen opheffen."""
+
+from site_pipeline import run_transforms
+
+def transform(name, func):
+    return {'name': name, 'func': func, 'version': 1, 'depends_on': None}
+
+STRIP = transform('strip', lambda content, filename: content.replace(' <a>link</a>', ''))
+LINK = transform('link', lambda content, filename: content if '<a>' in content else content + ' <a>link</a>')
+UPPER = transform('upper', lambda content, filename: content.upper())
+
+def test_cancelled_changes_do_not_count():
+    assert run_transforms('intro <a>link</a>', 'x.html', [STRIP, LINK]) == ('intro <a>link</a>', [])
+
+def test_real_changes_count():
+    assert run_transforms('intro', 'x.html', [STRIP, LINK]) == ('intro <a>link</a>', ['link'])
+    assert run_transforms('intro <a>link</a>', 'x.html', [STRIP, LINK, UPPER]) == ('INTRO <A>LINK</A>', ['upper'])
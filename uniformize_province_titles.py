@@ -9,6 +9,8 @@ import os
 import re
 import glob
 
+from page_cache import get_page, save_page_cache
+
 def clean_castle_title(title):
     """Nettoie et uniformise le titre d'un château"""
     title = title.strip()
@@ -46,16 +48,18 @@ def clean_castle_title(title):
 def update_province_castle_titles(file_path):
     """Met à jour les titres des châteaux dans une page province"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Trouve tous les titres de châteaux dans les blocs
-        title_pattern = r'<h3>([^<]+)</h3>'
-        matches = re.findall(title_pattern, content)
+        # Les titres viennent du cache des pages; le HTML n'est lu que s'il y a quelque chose à changer
+        matches = get_page(file_path)['h3']
         
         if not matches:
             return False, "Aucun titre trouvé"
         
+        if all(clean_castle_title(title) == title for title in matches):
+            return False, "Aucun changement nécessaire"
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
         updated_content = content
         changes_made = 0
         
@@ -115,6 +119,8 @@ def main():
         else:
             print(f"  ○ {province_name}: {message}")
     
+    save_page_cache()
+    
     print(f"\n=== RÉSULTAT FINAL ===")
     print(f"Pages provinces mises à jour: {total_updated}")
     print("Uniformisation des titres terminée!")
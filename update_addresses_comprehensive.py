@@ -7,7 +7,10 @@ Script pour mettre à jour les adresses réelles des châteaux dans la section p
 
 import os
 import re
-import glob
+
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import get_section, splice
 
 def get_comprehensive_castle_addresses():
     """Base de données étendue des adresses réelles des châteaux"""
@@ -103,44 +106,52 @@ def get_comprehensive_castle_addresses():
         'kasteel-duras-te-duras': 'Duras, 1653 Dworp'
     }
 
+def update_address_content(content, filename):
+    """Remplace "info volgt" par l'adresse réelle dans le contenu HTML d'une page château"""
+    addresses = get_comprehensive_castle_addresses()
+    slug = filename.replace('.html', '')
+    
+    # Vérifie si on a une adresse pour ce château
+    if slug not in addresses:
+        return content, "Adresse non disponible"
+    
+    real_address = addresses[slug]
+    
+    # Cherche "Adres volgt" ou "Info volgt" uniquement dans le bloc address-info,
+    # pour ne pas écraser les lignes Tel/Email du bloc contact
+    address_info = get_section(content, 'address-info')
+    if not address_info:
+        return content, "Section adresse non trouvée"
+    
+    address_pattern = re.compile(r'(<p>)([^<]*(?:Adres volgt|Info volgt|adres volgt|info volgt)[^<]*)(</p>)')
+    address_match = address_pattern.search(content, address_info['inner_start'], address_info['inner_end'])
+    
+    if not address_match:
+        return content, "Adresse déjà présente"
+    
+    current_address = address_match.group(2).strip()
+    
+    # Ne remplace que si c'est "info volgt" ou similaire
+    if 'info volgt' in current_address.lower() or 'adres volgt' in current_address.lower():
+        updated_content = splice(content, address_match.start(2), address_match.end(2), real_address)
+        return updated_content, f"Adresse mise à jour: {real_address}"
+    
+    return content, f"Adresse déjà présente: {current_address}"
+
 def update_castle_address(file_path):
     """Met à jour l'adresse d'une page château si elle existe dans la base de données"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        filename = os.path.basename(file_path).replace('.html', '')
-        addresses = get_comprehensive_castle_addresses()
-        
-        # Vérifie si on a une adresse pour ce château
-        if filename not in addresses:
-            return False, "Adresse non disponible"
-        
-        real_address = addresses[filename]
-        
-        # Cherche la section praktische info et remplace "Adres volgt" ou "Info volgt"
-        address_pattern = r'(<p>)([^<]*(?:Adres volgt|Info volgt|adres volgt|info volgt)[^<]*)(</p>)'
-        address_match = re.search(address_pattern, content)
-        
-        if not address_match:
-            return False, "Section adresse non trouvée"
+        new_content, message = update_address_content(content, os.path.basename(file_path))
         
-        current_address = address_match.group(2).strip()
-        
-        # Ne remplace que si c'est "info volgt" ou similaire
-        if 'info volgt' in current_address.lower() or 'adres volgt' in current_address.lower():
-            updated_content = re.sub(
-                address_pattern,
-                f'{address_match.group(1)}{real_address}{address_match.group(3)}',
-                content
-            )
-            
+        if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            
-            return True, f"Adresse mise à jour: {real_address}"
-        else:
-            return False, f"Adresse déjà présente: {current_address}"
+                f.write(new_content)
+            return True, message
+        
+        return False, message
         
     except Exception as e:
         return False, f"Erreur: {e}"
@@ -150,39 +161,25 @@ def main():
     print("=== MISE À JOUR DES ADRESSES RÉELLES ===")
     
     # Trouve tous les fichiers de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     addresses_db = get_comprehensive_castle_addresses()
     
     print(f"Trouvé {len(castle_files)} pages de châteaux")
     print(f"Base de données: {len(addresses_db)} adresses disponibles")
     
     success_count = 0
-    available_count = 0
     
-    for file_path in castle_files:
+    available_files = [f for f in castle_files if os.path.basename(f).replace('.html', '') in addresses_db]
+    available_count = len(available_files)
+    
+    for file_path, (success, message) in zip(available_files, map_pages(update_castle_address, available_files)):
         filename = os.path.basename(file_path).replace('.html', '')
         
-        if filename in addresses_db:
-            available_count += 1
-            success, message = update_castle_address(file_path)
-            
-            if success:
-                print(f"  ✓ {filename}: {message}")
-                success_count += 1
-            else:
-                print(f"  ○ {filename}: {message}")
+        if success:
+            print(f"  ✓ {filename}: {message}")
+            success_count += 1
+        else:
+            print(f"  ○ {filename}: {message}")
     
     print(f"\n=== RÉSULTAT FINAL ===")
     print(f"Adresses disponibles dans la base: {available_count}")
@@ -8,55 +8,25 @@ et ajouter du contenu descriptif avec liens
 
 import os
 import re
-import glob
 
-def normalize_name_for_image(name):
-    """Normalise un nom pour trouver l'image correspondante"""
-    name = name.lower()
-    name = re.sub(r'[_\-\s]+', '', name)
-    return name
+from image_index import COMMON_WORDS, get_image_index, find_containing, find_best_match
+from image_dimensions import dimension_attributes
+from page_cache import get_page, save_page_cache
+
+# Mots ignorés pour les pages provinces: en plus des mots communs, 'hof'
+PROVINCE_COMMON_WORDS = COMMON_WORDS | {'hof'}
 
 def find_castle_image(castle_name, images_dir):
     """Trouve l'image correspondante pour un château"""
-    # Normalise le nom du château
-    castle_normalized = normalize_name_for_image(castle_name)
-    
-    # Liste toutes les images disponibles
-    image_files = []
-    for ext in ['*.jpg', '*.jpeg', '*.png', '*.gif']:
-        image_files.extend(glob.glob(os.path.join(images_dir, ext)))
+    index = get_image_index(images_dir)
     
-    # Essaie de trouver une correspondance
-    best_match = None
-    best_score = 0
+    # Correspondance exacte
+    containing_match = find_containing(index, castle_name)
+    if containing_match:
+        return containing_match
     
-    for image_path in image_files:
-        image_name = os.path.basename(image_path)
-        image_normalized = normalize_name_for_image(os.path.splitext(image_name)[0])
-        
-        # Correspondance exacte
-        if castle_normalized in image_normalized or image_normalized in castle_normalized:
-            return image_name
-        
-        # Correspondance par mots-clés
-        castle_words = set(re.split(r'[_\-\s]+', castle_name.lower()))
-        image_words = set(re.split(r'[_\-\s]+', os.path.splitext(image_name)[0].lower()))
-        
-        # Enlève les mots très communs
-        common_words = {'kasteel', 'chateau', 'van', 'de', 'het', 'le', 'la', 'du', 'des', 'te', 'in', 'op', 'aan', 'hof'}
-        castle_words -= common_words
-        image_words -= common_words
-        
-        if castle_words and image_words:
-            intersection = castle_words & image_words
-            union = castle_words | image_words
-            score = len(intersection) / len(union) if union else 0
-            
-            if score > best_score and score > 0.4:
-                best_score = score
-                best_match = image_name
-    
-    return best_match
+    # Correspondance par mots-clés
+    return find_best_match(index, castle_name, PROVINCE_COMMON_WORDS, threshold=0.4)
 
 def add_province_content(province_name):
     """Génère le contenu descriptif pour une province"""
@@ -111,15 +81,15 @@ def add_province_content(province_name):
 def update_province_page(file_path, images_dir):
     """Met à jour une page province avec images et contenu"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extrait le nom de la province
-        province_match = re.search(r'<h1>Kastelen in ([^<]+)</h1>', content)
-        if not province_match:
+        # Le nom de la province et les cartes viennent du cache des pages
+        page = get_page(file_path)
+        if not (page['h1'] or '').startswith('Kastelen in '):
             return False, "Nom de province non trouvé"
         
-        province_name = province_match.group(1)
+        province_name = page['h1'][len('Kastelen in '):]
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
         
         # Ajoute le contenu descriptif
         province_content = add_province_content(province_name)
@@ -147,7 +117,7 @@ def update_province_page(file_path, images_dir):
             content = re.sub(stats_pattern, new_section, content, flags=re.DOTALL)
         
         # Remplace les placeholders d'images par de vraies images
-        castle_cards = re.findall(r'<a class="castle-card" href="([^"]+)"[^>]*>.*?<h3>([^<]+)</h3>', content, re.DOTALL)
+        castle_cards = page['cards']
         
         images_added = 0
         for castle_link, castle_name in castle_cards:
@@ -157,7 +127,7 @@ def update_province_page(file_path, images_dir):
             if castle_image:
                 # Remplace le gradient par l'image
                 old_pattern = f'(<a class="castle-card" href="{re.escape(castle_link)}"[^>]*>\\s*)<div class="castle-media gradient-[0-9]"></div>'
-                new_image = f'\\1<div class="castle-media"><img src="./chateaux_images/{castle_image}" alt="{castle_name}" class="castle-image"></div>'
+                new_image = f'\\1<div class="castle-media"><img src="./chateaux_images/{castle_image}" alt="{castle_name}" class="castle-image"{dimension_attributes(os.path.join(images_dir, castle_image))}></div>'
                 
                 new_content = re.sub(old_pattern, new_image, content)
                 if new_content != content:
@@ -173,9 +143,8 @@ def update_province_page(file_path, images_dir):
     except Exception as e:
         return False, f"Erreur: {e}"
 
-def add_province_css():
-    """Ajoute le CSS pour les pages provinces"""
-    css_code = '''
+# CSS des introductions des pages provinces (aussi enregistré dans css_bundle.py)
+PROVINCE_INTRO_CSS = '''
 /* Province pages */
 .province-intro {
   background: #f8fafc;
@@ -218,7 +187,9 @@ def add_province_css():
     align-items: center;
   }
 }'''
-    
+
+def add_province_css():
+    """Ajoute le CSS pour les pages provinces"""
     css_file = '/Users/marc/Desktop/kastelenbelgie/css/style.css'
     
     try:
@@ -227,7 +198,7 @@ def add_province_css():
         
         if '/* Province pages */' not in content:
             with open(css_file, 'a', encoding='utf-8') as f:
-                f.write(css_code)
+                f.write(PROVINCE_INTRO_CSS)
             return True
         
         return False
@@ -284,6 +255,8 @@ def main():
         else:
             print(f"  ✗ {filename}: {message}")
     
+    save_page_cache()
+    
     print(f"\n=== RÉSULTAT ===")
     print(f"Pages provinces traitées: {len(existing_files)}")
     print(f"Pages mises à jour avec succès: {success_count}")
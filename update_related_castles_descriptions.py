@@ -8,7 +8,15 @@ avec des textes plus détaillés (2+ phrases)
 
 import os
 import re
-import glob
+
+import geo_index
+import related_castles
+from add_breadcrumbs import PLACE_AUTOMATON
+from province_matcher import build_place_automaton, match_place
+from create_unique_intro_texts import create_unique_intro, extract_castle_name, get_castle_type
+from page_executor import map_pages
+from page_discovery import find_castle_files
+from html_sections import section_inner_html, replace_section_inner
 
 # Base de données étendue des châteaux avec descriptions détaillées
 CASTLES_DATABASE = {
@@ -131,136 +139,204 @@ CASTLES_DATABASE = {
     }
 }
 
-def get_castles_by_region(current_castle_file):
-    """Bepaal de regio van het huidige kasteel en retourneer gerelateerde kastelen"""
+# Regio-indeling op basis van plaatsnamen en provincies
+REGIONS = {
+    'antwerpen': ['edegem', 'mortsel', 'merksem', 'deurne', 'kontich', 'aartselaar', 'schoten', 'brasschaat', 'kapellen', 'zandhoven', 'lier', 'bonheiden', 'heist-op-den-berg', 'vorselaar', 'berlaar', 'laakdal', 'retie', 'westerlo'],
+    'oost_vlaanderen': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte'],
+    'west_vlaanderen': ['beernem', 'tillegem', 'sint-michiels', 'brugge', 'varsenare', 'boekhoute', 'sint-andries', 'ieper', 'elverdinge', 'diksmuide', 'torhout', 'izegem', 'waregem', 'deerlijk', 'kortrijk', 'meulebeke', 'spiere', 'templeuve'],
+    'limburg': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken'],
+    'vlaams_brabant': ['bouchout', 'meise', 'coloma', 'sint-pieters-leeuw', 'grimbergen', 'aarschot', 'elewijt', 'zaventem', 'overijse', 'dilbeek', 'ukkel', 'laken', 'brussel', 'ganshoren', 'strombeek-bever', 'dworp', 'oetingen'],
+    'namen': ['freyr', 'hastiere', 'spontin', 'yvoir', 'dinant', 'celles', 'falaen', 'natoye', 'sombreffe', 'haltinne', 'serinchamps'],
+    'luik': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren'],
+    'luxemburg': ['durbuy', 'la-roche-en-ardenne', 'mirwart', 'saint-hubert', 'longchamps', 'bertogne', 'bastogne', 'houffalize', 'tavigny', 'neufchateau', 'daverdisse', 'porcheresse', 'villers-devant-orval', 'orval', 'houyet', 'ciergnon'],
+    'henegouwen': ['seneffe', 'boussu', 'doornik', 'tournai', 'peruwelz', 'biez', 'attre', 'manage', 'houtaing', 'froyennes'],
+    'waals_brabant': ['rixensart', 'genval', 'ceroux-mousty', 'kasteelbrakel', 'braine-le-chateau', 'nijvel', 'geldenaken'],
+    'brussel': ['ganshoren', 'ukkel', 'laken', 'brussel']
+}
+
+# Aantal keer dat de regio meetelt in de termen van een kasteel: zwaarder dan een los woord
+REGION_WEIGHT = 3
+
+# Keuze van de gerelateerde kastelen: 'tekst' (meest gelijkende tekst, type en regio
+# binnen de provincie; zie related_castles.py) of 'afstand' (dichtstbijzijnde kastelen;
+# zie geo_index.py). In beide gevallen wordt aangevuld met de dichtstbijzijnde
+# kastelen, die uit dezelfde provincie eerst.
+RELATED_MODE = 'tekst'
+
+# Een kaart in de card-grid: link, naam en beschrijving (de card-media ertussen varieert)
+CARD_PATTERN = re.compile(
+    r'<a class="card" href="([^"]+)">.*?<h3>(.*?)</h3>\s*<p class="card-description">(.*?)</p>',
+    re.DOTALL
+)
+
+# Eén keer gecompileerde automaat over alle plaatsnamen van de regio's
+REGION_AUTOMATON = build_place_automaton(
+    {region: {'places': places} for region, places in REGIONS.items()},
+    priority={'voeren': 'limburg'}
+)
+
+def determine_region(filename):
+    """Bepaal de regio van een kasteel op basis van de bestandsnaam"""
+    match = match_place(REGION_AUTOMATON, filename)
     
-    # Regio-indeling op basis van plaatsnamen en provincies
-    regions = {
-        'antwerpen': ['edegem', 'mortsel', 'merksem', 'deurne', 'kontich', 'aartselaar', 'schoten', 'brasschaat', 'kapellen', 'zandhoven', 'lier', 'bonheiden', 'heist-op-den-berg', 'vorselaar', 'berlaar', 'laakdal', 'retie', 'westerlo'],
-        'oost_vlaanderen': ['beervelde', 'berlare', 'gavere', 'gent', 'gentbrugge', 'drongen', 'mariakerke', 'sint-denijs-westrem', 'destelbergen', 'lovendegem', 'vinderhoute', 'aalst', 'ninove', 'zottegem', 'kruishoutem', 'zulte'],
-        'west_vlaanderen': ['beernem', 'tillegem', 'sint-michiels', 'brugge', 'varsenare', 'boekhoute', 'sint-andries', 'ieper', 'elverdinge', 'diksmuide', 'torhout', 'izegem', 'waregem', 'deerlijk', 'kortrijk', 'meulebeke', 'spiere', 'templeuve'],
-        'limburg': ['bokrijk', 'genk', 'sint-pieters-voeren', 'voeren', 'rekem', 'lanaken', 'dilsen', 'bilzen', 'munsterbilzen', 'sint-truiden', 'borgloon', 'tongeren', 'hasselt', 'heusden-zolder', 'houthalen', 'achel', 'alken'],
-        'vlaams_brabant': ['bouchout', 'meise', 'coloma', 'sint-pieters-leeuw', 'grimbergen', 'aarschot', 'elewijt', 'zaventem', 'overijse', 'dilbeek', 'ukkel', 'laken', 'brussel', 'ganshoren', 'strombeek-bever', 'dworp', 'oetingen'],
-        'namen': ['freyr', 'hastiere', 'spontin', 'yvoir', 'dinant', 'celles', 'falaen', 'natoye', 'sombreffe', 'haltinne', 'serinchamps'],
-        'luik': ['hoei', 'huy', 'modave', 'awans', 'alleur', 'engis', 'hermalle-sous-huy', 'esneux', 'aywaille', 'stoumont', 'weismes', 'soumagne', 'blegny', 'voeren'],
-        'luxemburg': ['durbuy', 'la-roche-en-ardenne', 'mirwart', 'saint-hubert', 'longchamps', 'bertogne', 'bastogne', 'houffalize', 'tavigny', 'neufchateau', 'daverdisse', 'porcheresse', 'villers-devant-orval', 'orval', 'houyet', 'ciergnon'],
-        'henegouwen': ['seneffe', 'boussu', 'doornik', 'tournai', 'peruwelz', 'biez', 'attre', 'manage', 'houtaing', 'froyennes'],
-        'waals_brabant': ['rixensart', 'genval', 'ceroux-mousty', 'kasteelbrakel', 'braine-le-chateau', 'nijvel', 'geldenaken'],
-        'brussel': ['ganshoren', 'ukkel', 'laken', 'brussel']
-    }
+    if match:
+        return match['province']
     
-    # Bepaal regio van huidig kasteel
-    current_region = None
-    filename_lower = current_castle_file.lower()
+    return 'vlaams_brabant'  # default
+
+def determine_castle_province(filename):
+    """Provincie van een kasteel zoals in zijn breadcrumb, of None als de plaats onbekend is"""
+    match = match_place(PLACE_AUTOMATON, filename)
+    return match['province'] if match else None
+
+def castle_terms(filename, description=''):
+    """Termen van een kasteel voor de aanbevelingen: naam, beschrijving, introtekst, type en regio"""
+    text = ' '.join([extract_castle_name(filename), description, *create_unique_intro(filename)['paragraphs']])
     
-    for region, places in regions.items():
-        for place in places:
-            if place in filename_lower:
-                current_region = region
-                break
-        if current_region:
-            break
+    terms = related_castles.tokenize(text)
+    terms.append(f"type:{get_castle_type(filename)}")
+    terms.extend([f"regio:{determine_region(filename)}"] * REGION_WEIGHT)
+    return terms
+
+def existing_candidates(castle_files=None):
+    """De kastelen uit de database waarvan de pagina bestaat; naar de andere mag geen kaart verwijzen"""
+    if castle_files is None:
+        castle_files = find_castle_files()
+    existing = {os.path.basename(castle_file) for castle_file in castle_files}
+    return sorted(castle_file for castle_file in CASTLES_DATABASE if castle_file in existing)
+
+# De kandidaten voor de aanbevelingen
+CANDIDATES = existing_candidates()
+
+# Termen van elke kandidaat, één keer bepaald
+CANDIDATE_TERMS = {
+    castle_file: castle_terms(castle_file, CASTLES_DATABASE[castle_file]['description'])
+    for castle_file in CANDIDATES
+}
+
+# Provincie van elke kandidaat
+CANDIDATE_PROVINCES = {castle_file: determine_castle_province(castle_file) for castle_file in CANDIDATES}
+
+# k-d-boom over de kandidaten, bij het eerste gebruik opgebouwd
+_CANDIDATE_GEO_INDEX = None
+
+def get_nearby_castles(filenames, count=3):
+    """De dichtstbijzijnde kandidaten per pagina: bestandsnaam -> lijst bestandsnamen"""
+    global _CANDIDATE_GEO_INDEX
     
-    if not current_region:
-        current_region = 'vlaams_brabant'  # default
+    if _CANDIDATE_GEO_INDEX is None:
+        _CANDIDATE_GEO_INDEX = geo_index.build_castle_index(CANDIDATES)
     
-    # Vind kastelen in dezelfde regio
-    related_castles = []
-    for castle_file, castle_data in CASTLES_DATABASE.items():
-        if castle_file == current_castle_file:
-            continue
-            
-        castle_lower = castle_file.lower()
-        for place in regions[current_region]:
-            if place in castle_lower:
-                related_castles.append({
-                    'file': castle_file,
-                    'name': castle_data['name'],
-                    'description': castle_data['description']
-                })
-                break
+    return {
+        os.path.basename(filename): [
+            castle_file for distance, castle_file in geo_index.nearby_castles(_CANDIDATE_GEO_INDEX, filename, count)
+        ]
+        for filename in filenames
+    }
+
+def fill_with_nearby(recommendations, count=3):
+    """
+    Vul de aanbevelingen met minder dan count kastelen aan met de dichtstbijzijnde
+    kandidaten: eerst die uit dezelfde provincie, dan de rest, telkens op afstand.
+    """
+    short = [filename for filename, related in recommendations.items() if len(related) < count]
+    if not short:
+        return recommendations
     
-    # Als er niet genoeg kastelen in dezelfde regio zijn, voeg nabije regio's toe
-    if len(related_castles) < 3:
-        nearby_regions = {
-            'antwerpen': ['vlaams_brabant', 'oost_vlaanderen'],
-            'oost_vlaanderen': ['antwerpen', 'west_vlaanderen', 'vlaams_brabant'],
-            'west_vlaanderen': ['oost_vlaanderen'],
-            'limburg': ['vlaams_brabant', 'luik'],
-            'vlaams_brabant': ['antwerpen', 'oost_vlaanderen', 'limburg', 'waals_brabant'],
-            'namen': ['luik', 'luxemburg', 'henegouwen'],
-            'luik': ['namen', 'luxemburg', 'limburg'],
-            'luxemburg': ['namen', 'luik'],
-            'henegouwen': ['namen', 'waals_brabant'],
-            'waals_brabant': ['vlaams_brabant', 'henegouwen', 'namen'],
-            'brussel': ['vlaams_brabant', 'waals_brabant']
-        }
-        
-        for nearby_region in nearby_regions.get(current_region, []):
-            for castle_file, castle_data in CASTLES_DATABASE.items():
-                if castle_file == current_castle_file or len(related_castles) >= 6:
-                    continue
-                    
-                castle_lower = castle_file.lower()
-                for place in regions[nearby_region]:
-                    if place in castle_lower:
-                        related_castles.append({
-                            'file': castle_file,
-                            'name': castle_data['name'],
-                            'description': castle_data['description']
-                        })
-                        break
+    nearby = get_nearby_castles(short, len(CANDIDATES))
+    for filename in short:
+        province = determine_castle_province(filename)
+        ranked = sorted(nearby[filename], key=lambda castle_file: CANDIDATE_PROVINCES[castle_file] != province)
+        related = recommendations[filename]
+        related.extend(castle_file for castle_file in ranked if castle_file not in related)
+        recommendations[filename] = related[:count]
     
-    return related_castles[:3]  # Retourneer max 3 kastelen
+    return recommendations
 
-def update_related_castles_section(file_path):
-    """Update de related castles sectie met uitgebreidere beschrijvingen"""
-    try:
-        filename = os.path.basename(file_path)
-        related_castles = get_castles_by_region(filename)
-        
-        if len(related_castles) < 3:
-            # Vul aan met willekeurige kastelen als er niet genoeg zijn
-            import random
-            available_castles = [
-                {'file': 'kasteel-van-freyr-freyr.html', 'name': 'Kasteel van Freÿr', 'description': CASTLES_DATABASE['kasteel-van-freyr-freyr.html']['description']},
-                {'file': 'citadel-van-hoei-hoei.html', 'name': 'Citadel van Hoei', 'description': CASTLES_DATABASE['citadel-van-hoei-hoei.html']['description']},
-                {'file': 'kasteel-van-durbuy-durbuy.html', 'name': 'Kasteel van Durbuy', 'description': CASTLES_DATABASE['kasteel-van-durbuy-durbuy.html']['description']}
-            ]
-            
-            for castle in available_castles:
-                if castle['file'] != filename and len(related_castles) < 3:
-                    if not any(rc['file'] == castle['file'] for rc in related_castles):
-                        related_castles.append(castle)
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Bouw de nieuwe related castles HTML
-        cards_html = []
-        gradients = ['gradient-1', 'gradient-2', 'gradient-3']
+def prepare_related_castles(filenames):
+    """
+    Gerelateerde kastelen voor een reeks pagina's in één doorgang, volgens RELATED_MODE.
+    Retourneert bestandsnaam -> lijst kastelen (file, name, description).
+    """
+    if RELATED_MODE == 'afstand':
+        recommendations = {os.path.basename(filename): [] for filename in filenames}
+    else:
+        queries = {}
+        provinces = dict(CANDIDATE_PROVINCES)
+        for filename in filenames:
+            filename = os.path.basename(filename)
+            description = CASTLES_DATABASE.get(filename, {}).get('description', '')
+            queries[filename] = castle_terms(filename, description)
+            provinces[filename] = determine_castle_province(filename)
         
-        for i, castle in enumerate(related_castles[:3]):
-            card_html = f'''          <a class="card" href="{castle['file']}">
+        recommendations = {
+            filename: list(related)
+            for filename, related in related_castles.recommend(queries, CANDIDATE_TERMS, groups=provinces).items()
+        }
+    
+    recommendations = fill_with_nearby(recommendations)
+    
+    return {
+        filename: [
+            {
+                'file': castle_file,
+                'name': CASTLES_DATABASE[castle_file]['name'],
+                'description': CASTLES_DATABASE[castle_file]['description']
+            }
+            for castle_file in related
+        ]
+        for filename, related in recommendations.items()
+    }
+
+def get_related_castles(filename):
+    """Drie gerelateerde kastelen voor een pagina: meest gelijkende tekst of dichtstbijzijnde, volgens RELATED_MODE, binnen de provincie"""
+    return prepare_related_castles([filename])[os.path.basename(filename)]
+
+def create_related_cards_html(related_castles):
+    """HTML van de kaarten in de card-grid van de related castles"""
+    cards_html = []
+    gradients = ['gradient-1', 'gradient-2', 'gradient-3']
+    
+    for i, castle in enumerate(related_castles[:3]):
+        card_html = f'''          <a class="card" href="{castle['file']}">
             <div class="card-media {gradients[i]}"></div>
             <div class="card-body">
               <h3>{castle['name']}</h3>
               <p class="card-description">{castle['description']}</p>
             </div>
           </a>'''
-            cards_html.append(card_html)
-        
-        new_cards_section = '\n'.join(cards_html)
-        
-        # Vervang de bestaande cards
-        pattern = r'(<div class="card-grid three">)(.*?)(</div>\s*</div>\s*</section>)'
+        cards_html.append(card_html)
+    
+    return '\n'.join(cards_html)
+
+def update_related_castles_content(content, filename):
+    """
+    Vervang de related castles kaarten in de HTML-inhoud van een kasteelpagina.
+    Kaarten die al naar dezelfde kastelen verwijzen, met dezelfde naam en beschrijving,
+    blijven staan: zo ook hun afbeelding (add_related_castle_images, responsive versies).
+    """
+    related = get_related_castles(filename)
+    
+    cards_inner = section_inner_html(content, 'card-grid')
+    if cards_inner is not None:
+        current = CARD_PATTERN.findall(cards_inner)
+        if current == [(castle['file'], castle['name'], castle['description']) for castle in related[:3]]:
+            return content
+    
+    new_cards_section = create_related_cards_html(related)
+    
+    # Vervang de bestaande cards
+    return replace_section_inner(content, 'card-grid', f'\n{new_cards_section}\n        ')
+
+def update_related_castles_section(file_path):
+    """Update de related castles sectie met uitgebreidere beschrijvingen"""
+    try:
+        filename = os.path.basename(file_path)
         
-        def replace_cards(match):
-            opening = match.group(1)
-            closing = match.group(3)
-            return f'{opening}\n{new_cards_section}\n        {closing}'
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
         
-        new_content = re.sub(pattern, replace_cards, content, flags=re.DOTALL)
+        new_content = update_related_castles_content(content, filename)
         
         if new_content != content:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -278,22 +354,13 @@ def main():
     print("=== UPDATE RELATED CASTLES DESCRIPTIONS ===")
     
     # Vind alle kasteelbestanden
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Gevonden kasteelbestanden: {len(castle_files)}")
     
+    # Alle aanbevelingen in één doorgang; de workers erven de gevulde cache
+    prepare_related_castles(castle_files)
+    
     # Test eerst met een paar bestanden
     test_files = castle_files[:5]
     updated_count = 0
@@ -317,18 +384,17 @@ def main():
     # Ga door met alle bestanden
     print(f"\nDoorgaan met alle {len(castle_files)} bestanden...")
     
-    for file_path in castle_files:
-        filename = os.path.basename(file_path)
-        
-        # Skip de al behandelde testbestanden
-        if file_path in test_files:
-            continue
-            
-        if update_related_castles_section(file_path):
+    # Skip de al behandelde testbestanden
+    remaining_files = [f for f in castle_files if f not in test_files]
+    
+    for updated in map_pages(update_related_castles_section, remaining_files):
+        if updated:
             updated_count += 1
             if updated_count % 50 == 0:
                 print(f"  Voortgang: {updated_count} bestanden bijgewerkt...")
     
+    related_castles.save_related_cache()
+    
     print(f"\n=== EINDRESULTAAT ===")
     print(f"Totaal bestanden behandeld: {len(castle_files)}")
     print(f"Related castles bijgewerkt: {updated_count}")
@@ -8,15 +8,18 @@ et les assigner aux pages correspondantes
 
 import os
 import re
-import glob
 
-def update_html_with_image(file_path, image_filename, castle_name):
+from page_discovery import find_castle_files
+from image_index import get_image_index
+from image_dimensions import dimension_attributes
+
+def update_html_with_image(file_path, image_filename, castle_name, img_dir):
     """Mettre à jour le fichier HTML avec l'image existante"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        img_tag = f'<img src="assets/img/{image_filename}" alt="{castle_name}" loading="lazy" class="castle-main-image">'
+        img_tag = f'<img src="assets/img/{image_filename}" alt="{castle_name}"{dimension_attributes(os.path.join(img_dir, image_filename))} loading="lazy" class="castle-main-image">'
         
         # Chercher le placeholder d'image
         image_placeholder = '<!-- Image placeholder: will be replaced with actual castle image -->'
@@ -57,28 +60,14 @@ def main():
     # Répertoire des images
     img_dir = "/Users/marc/Desktop/kastelenbelgie/assets/img"
     
-    # Lister toutes les images disponibles
-    available_images = []
-    for img_file in os.listdir(img_dir):
-        if img_file.endswith('.jpg'):
-            available_images.append(img_file)
+    # Index des images disponibles
+    image_index = get_image_index(img_dir)
+    available_images = {image for image in image_index['images'] if image.endswith('.jpg')}
     
     print(f"Images disponibles: {len(available_images)}")
     
     # Trouver tous les fichiers HTML de châteaux
-    castle_files = []
-    patterns = [
-        "kasteel-*.html", "chateau-*.html", "citadel-*.html", "burcht-*.html",
-        "hof-*.html", "de-*.html", "het-*.html", "sint-*.html", "koninklijk-*.html",
-        "waterslot-*.html", "vrieselhof-*.html", "rentmeesterij-*.html",
-        "commanderij-*.html", "domein-*.html", "oud-*.html", "bisschoppenhof-*.html",
-        "braemkasteel-*.html", "burchtruine-*.html", "gaverkasteel-*.html"
-    ]
-    
-    for pattern in patterns:
-        castle_files.extend(glob.glob(f"/Users/marc/Desktop/kastelenbelgie/{pattern}"))
-    
-    castle_files = sorted(list(set(castle_files)))
+    castle_files = find_castle_files()
     
     print(f"Pages de châteaux trouvées: {len(castle_files)}")
     
@@ -96,7 +85,7 @@ def main():
             print(f"  Image trouvée: {expected_image}")
             
             # Mettre à jour le HTML
-            if update_html_with_image(file_path, expected_image, castle_name):
+            if update_html_with_image(file_path, expected_image, castle_name, img_dir):
                 print(f"  ✓ Succès: {filename}")
                 success_count += 1
             else: